@@ -137,3 +137,77 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [],
     'TEST_REQUEST_DEFAULT_FORMAT': 'json'
 }
+
+# Dynamic tables
+
+# Maximum number of compiled dynamic model classes kept in memory per worker
+TABLE_MODEL_REGISTRY_SIZE = 1024
+
+# Default and hard maximum number of rows returned by a single rows page
+TABLE_ROWS_PAGE_SIZE = 100
+TABLE_ROWS_MAX_PAGE_SIZE = 1000
+
+# Maximum number of rows accepted by a bulk insert request and rows per INSERT statement
+TABLE_BULK_MAX_ROWS = 10000
+TABLE_BULK_INSERT_BATCH_SIZE = 1000
+
+# Number of rows changed per transaction by the batched update and delete endpoints
+TABLE_ROWS_BATCH_SIZE = 1000
+
+# Commit concurrent single-row inserts into the same table together: a batch is flushed
+# once it has TABLE_GROUP_COMMIT_MAX_ROWS rows or after TABLE_GROUP_COMMIT_MAX_WAIT_MS
+TABLE_GROUP_COMMIT = os.environ.get('TABLE_GROUP_COMMIT', '') == '1'
+TABLE_GROUP_COMMIT_MAX_ROWS = 100
+TABLE_GROUP_COMMIT_MAX_WAIT_MS = 5
+
+# Number of validated rows sent per COPY statement by streaming uploads
+TABLE_COPY_CHUNK_SIZE = 10000
+
+# Approximate size of the file part loaded by one worker of the parallel import command
+TABLE_IMPORT_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Number of rows fetched per round trip by the streaming export
+TABLE_EXPORT_CHUNK_SIZE = 2000
+
+# Cache of encoded table rows pages. BACKEND is 'memory' (per-worker LRU bounded by
+# MAX_BYTES), 'django' (shared through the CACHE_ALIAS cache for TIMEOUT seconds) or None
+TABLE_ROWS_CACHE = {
+    'BACKEND': os.environ.get('TABLE_ROWS_CACHE_BACKEND', 'memory'),
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+# Online schema changes wait at most TABLE_ONLINE_LOCK_TIMEOUT_MS for a table lock and
+# retry up to TABLE_ONLINE_LOCK_ATTEMPTS times, backing off exponentially from
+# TABLE_ONLINE_LOCK_BACKOFF_MS. Retyped columns are backfilled TABLE_ROWS_BATCH_SIZE rows
+# at a time
+TABLE_ONLINE_LOCK_TIMEOUT_MS = 500
+TABLE_ONLINE_LOCK_ATTEMPTS = 10
+TABLE_ONLINE_LOCK_BACKOFF_MS = 100
+
+# Background table jobs: idle `run_table_jobs` workers poll the queue every
+# TABLE_JOB_POLL_INTERVAL seconds. Uploaded files wait for their import job in
+# TABLE_JOB_FILES_DIR, which must be shared by the web and job workers
+TABLE_JOB_POLL_INTERVAL = 1
+TABLE_JOB_FILES_DIR = os.environ.get('TABLE_JOB_FILES_DIR', str(BASE_DIR / 'job_files'))
+
+# Range partitioned tables get a partition per TABLE_PARTITION_RANGE_SIZE values of their
+# partition field, TABLE_PARTITIONS_AHEAD of them past the last id for tables partitioned
+# by id; idle job workers create missing ones every TABLE_PARTITION_MAINTENANCE_INTERVAL
+# seconds. Hash partitioned tables get TABLE_PARTITION_HASH_COUNT partitions
+TABLE_PARTITION_RANGE_SIZE = 1000000
+TABLE_PARTITIONS_AHEAD = 2
+TABLE_PARTITION_MAINTENANCE_INTERVAL = 60
+TABLE_PARTITION_HASH_COUNT = 8
+
+# Idle job workers purge rows expired by table retention rules every
+# TABLE_RETENTION_PURGE_INTERVAL seconds, deleting TABLE_ROWS_BATCH_SIZE rows at a time
+TABLE_RETENTION_PURGE_INTERVAL = 300
+
+# Maximum number of groups returned by a single aggregation
+TABLE_AGGREGATE_MAX_GROUPS = 1000
+
+# Listen for schema changes made by other workers (Postgres LISTEN/NOTIFY),
+# so schema-derived caches are dropped only when their table changes
+TABLE_SCHEMA_LISTENER = os.environ.get('TABLE_SCHEMA_LISTENER', '') == '1'
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Min, Sum
+from rest_framework import serializers
+
+from table.enums import AllowedFieldTypes
+from table.filters import get_filterable_fields
+
+AGGREGATES_QUERY_PARAM = 'aggregates'
+GROUP_BY_QUERY_PARAM = 'group_by'
+AGGREGATE_SEPARATOR = ':'
+
+NUMBER = AllowedFieldTypes.NUMBER.name
+
+# Aggregate function: (ORM aggregate, field types it can be applied to)
+AGGREGATE_FUNCTIONS = {
+    'count': (Count, None),
+    'sum': (Sum, {NUMBER}),
+    'avg': (Avg, {NUMBER}),
+    'min': (Min, {NUMBER}),
+    'max': (Max, {NUMBER}),
+}
+
+GROUP_BY_FIELD_TYPES = {
+    AllowedFieldTypes.STRING.name,
+    AllowedFieldTypes.BOOLEAN.name,
+}
+
+
+def split_list_param(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_aggregates(query_params, table_fields):
+    """
+    Compiles `?aggregates=count,sum:amount,avg:amount` into ORM aggregates keyed by result name.
+    A bare `count` counts rows, `count:<field>` counts non-null values.
+    """
+    filterable_fields = get_filterable_fields(table_fields)
+
+    aggregates, errors = {}, []
+    for item in split_list_param(query_params.get(AGGREGATES_QUERY_PARAM, 'count')):
+        function_name, _, field_name = item.partition(AGGREGATE_SEPARATOR)
+        if function_name not in AGGREGATE_FUNCTIONS:
+            errors.append("Unknown aggregate function {}.".format(function_name))
+            continue
+
+        aggregate, field_types = AGGREGATE_FUNCTIONS[function_name]
+        if not field_name:
+            if field_types is not None:
+                errors.append("Aggregate function {} requires a field.".format(function_name))
+                continue
+
+            aggregates[function_name] = aggregate('*')
+            continue
+
+        if field_name not in filterable_fields:
+            errors.append("Unknown field {}.".format(field_name))
+            continue
+
+        if field_types is not None and filterable_fields[field_name] not in field_types:
+            errors.append("Aggregate function {} is not supported by {} fields.".format(
+                function_name, filterable_fields[field_name]
+            ))
+            continue
+
+        aggregates["{}_{}".format(function_name, field_name)] = aggregate(field_name)
+
+    if errors:
+        raise serializers.ValidationError({AGGREGATES_QUERY_PARAM: errors})
+
+    return aggregates
+
+
+def parse_group_by(query_params, table_fields, aggregates):
+    group_by = split_list_param(query_params.get(GROUP_BY_QUERY_PARAM, ''))
+    filterable_fields = get_filterable_fields(table_fields)
+
+    errors = []
+    for field_name in group_by:
+        if filterable_fields.get(field_name) not in GROUP_BY_FIELD_TYPES:
+            errors.append("Field {} is not a STRING or BOOLEAN field.".format(field_name))
+        elif field_name in aggregates:
+            errors.append("Field {} clashes with an aggregate name.".format(field_name))
+
+    if errors:
+        raise serializers.ValidationError({GROUP_BY_QUERY_PARAM: errors})
+
+    return list(dict.fromkeys(group_by))
+
+
+def run_table_aggregation(model, aggregates, group_by, row_filter=None):
+    """Runs the aggregation as a single query; returns result rows and whether groups were cut off."""
+    table_rows = model.objects.all()
+    if row_filter:
+        table_rows = table_rows.filter(row_filter)
+
+    if not group_by:
+        return [table_rows.aggregate(**aggregates)], False
+
+    max_groups = getattr(settings, 'TABLE_AGGREGATE_MAX_GROUPS', 1000)
+    results = list(
+        table_rows.order_by().values(*group_by).annotate(**aggregates).order_by(*group_by)[:max_groups + 1]
+    )
+
+    return results[:max_groups], len(results) > max_groups
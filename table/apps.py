@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
 
 
 class TableConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'table'
+
+    def ready(self):
+        # Connects schema cache invalidation receivers
+        from table import cache, registry, validators  # noqa: F401
+
+        if getattr(settings, 'TABLE_SCHEMA_LISTENER', False):
+            from table.notifications import ensure_schema_change_listener
+            request_started.connect(
+                ensure_schema_change_listener,
+                dispatch_uid='table_schema_change_listener'
+            )
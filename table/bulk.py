@@ -0,0 +1,143 @@
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from table.rows import get_insert_batch_size, insert_table_rows
+from table.schema import bump_data_version
+from table.validators import get_row_validator
+
+ATOMIC_MODE = 'atomic'
+BEST_EFFORT_MODE = 'best_effort'
+BULK_MODES = (ATOMIC_MODE, BEST_EFFORT_MODE)
+
+
+class BulkInsertError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def validate_table_rows(table_object, table_fields, rows):
+    """Returns values of valid rows keyed by row index and errors of the invalid ones."""
+    row_validator = get_row_validator(table_object, table_fields)
+    field_names = row_validator.field_names
+
+    valid_rows, errors = {}, []
+    for index, row in enumerate(rows):
+        validated_data, row_errors = row_validator(row)
+        if row_errors:
+            errors.append({"index": index, "errors": row_errors})
+        else:
+            valid_rows[index] = [validated_data[field_name] for field_name in field_names]
+
+    return field_names, valid_rows, errors
+
+
+def insert_batch_best_effort(db_table, field_names, batch, table_row_ids, errors,
+                             insert_rows=insert_table_rows):
+    """Inserts the batch, falling back to row by row inserts to isolate failing rows."""
+    try:
+        with transaction.atomic():
+            ids = insert_rows(db_table, field_names, [values for _, values in batch])
+    except DatabaseError:
+        for index, values in batch:
+            try:
+                with transaction.atomic():
+                    table_row_ids[index] = insert_rows(db_table, field_names, [values])[0]
+            except DatabaseError as exc:
+                errors.append({"index": index, "errors": {"non_field_errors": [str(exc).strip()]}})
+        return
+
+    for (index, _), table_row_id in zip(batch, ids):
+        table_row_ids[index] = table_row_id
+
+
+def add_table_rows(table_object, model, table_fields, rows, mode=ATOMIC_MODE,
+                   insert_rows=insert_table_rows):
+    """
+    Validates all rows against the schema once and inserts them in multi-row batches
+    inside one transaction. Returns ids in input order (`None` for rejected rows) and errors.
+    In atomic mode any invalid row rejects the whole request with `BulkInsertError`.
+    `insert_rows` may be a `TableUpsert` to upsert the rows instead.
+    """
+    field_names, valid_rows, errors = validate_table_rows(table_object, table_fields, rows)
+    if errors and mode == ATOMIC_MODE:
+        raise BulkInsertError(errors)
+
+    batch_size = get_insert_batch_size(
+        field_names, getattr(settings, 'TABLE_BULK_INSERT_BATCH_SIZE', 1000)
+    )
+    valid_items = list(valid_rows.items())
+    table_row_ids = [None] * len(rows)
+
+    with transaction.atomic():
+        for start in range(0, len(valid_items), batch_size):
+            batch = valid_items[start:start + batch_size]
+            insert_batch_best_effort(
+                model._meta.db_table, field_names, batch, table_row_ids, errors, insert_rows
+            )
+
+            # Leaving the transaction with an exception rolls back the rows inserted so far
+            if errors and mode == ATOMIC_MODE:
+                raise BulkInsertError(errors)
+
+        if any(table_row_id is not None for table_row_id in table_row_ids):
+            bump_data_version(table_object)
+
+    errors.sort(key=lambda error: error["index"])
+    return table_row_ids, errors
+
+
+def iter_row_id_batches(model, row_filter, batch_size):
+    """Yields ids of the selected rows in id order, `batch_size` ids at a time."""
+    last_id = 0
+    while True:
+        ids = list(
+            model.objects.filter(row_filter, pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+
+        yield ids
+        if len(ids) < batch_size:
+            return
+
+        last_id = ids[-1]
+
+
+def apply_in_batches(table_object, model, row_filter, apply_batch, progress=None):
+    """
+    Applies `apply_batch` to querysets of the selected rows, one id ordered batch per
+    transaction, so row locks are held and changes are logged only a batch at a time.
+    `progress` is called with the number of changed rows after each batch.
+    Returns the number of changed rows and the number of batches.
+    """
+    batch_size = getattr(settings, 'TABLE_ROWS_BATCH_SIZE', 1000)
+
+    changed, batches = 0, 0
+    for ids in iter_row_id_batches(model, row_filter, batch_size):
+        with transaction.atomic():
+            # Rows changed since their ids were read must still match the selection
+            batch_changed = apply_batch(model.objects.filter(row_filter, pk__in=ids))
+            if batch_changed:
+                bump_data_version(table_object)
+
+        changed += batch_changed
+        batches += 1
+        if progress is not None:
+            progress(done=changed)
+
+    return changed, batches
+
+
+def update_rows_in_batches(table_object, model, row_filter, values):
+    return apply_in_batches(
+        table_object, model, row_filter, lambda queryset: queryset.update(**values)
+    )
+
+
+def delete_rows_in_batches(table_object, model, row_filter, progress=None):
+    return apply_in_batches(
+        table_object, model, row_filter, lambda queryset: queryset.delete()[0], progress
+    )
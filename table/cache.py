@@ -0,0 +1,154 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+
+from table.signals import table_schema_changed
+
+DEFAULT_ROWS_CACHE = {
+    'BACKEND': 'memory',
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 300,
+}
+
+
+class MemoryRowsCache:
+    """In-process LRU cache of encoded row pages, bounded by the total size of cached bodies."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self.size = 0
+        self._entries = OrderedDict()
+        self._table_keys = {}
+        self._lock = threading.Lock()
+
+    def get(self, table_id, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, table_id, key, value):
+        body = value[0]
+        if len(body) > self.max_entry_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+            self._entries[key] = (table_id, value)
+            self._table_keys.setdefault(table_id, set()).add(key)
+            self.size += len(body)
+
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_table(self, table_id):
+        with self._lock:
+            for key in list(self._table_keys.get(table_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._table_keys.clear()
+            self.size = 0
+
+    def _discard(self, key):
+        table_id, value = self._entries.pop(key)
+        self.size -= len(value[0])
+
+        table_keys = self._table_keys[table_id]
+        table_keys.discard(key)
+        if not table_keys:
+            del self._table_keys[table_id]
+
+
+class DjangoRowsCache:
+    """
+    Shares encoded row pages between workers through a Django cache backend.
+    Keys carry schema and data versions, so stale pages are never read and simply expire.
+    """
+
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, table_id, key):
+        return self.cache.get(key)
+
+    def set(self, table_id, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def invalidate_table(self, table_id):
+        pass
+
+    def clear(self):
+        pass
+
+
+def get_rows_cache_key(table_object, query_params):
+    query_string = '&'.join(sorted(
+        '{}={}'.format(key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+    ))
+
+    return 'table_rows:{}:{}:{}:{}'.format(
+        table_object.pk,
+        table_object.schema_version,
+        table_object.data_version,
+        hashlib.sha1(query_string.encode()).hexdigest()
+    )
+
+
+_rows_cache = None
+_rows_cache_settings = None
+
+
+def get_rows_cache():
+    """Returns the configured row pages cache, `None` if caching is disabled."""
+    global _rows_cache, _rows_cache_settings
+
+    cache_settings = getattr(settings, 'TABLE_ROWS_CACHE', DEFAULT_ROWS_CACHE)
+    if cache_settings is not _rows_cache_settings:
+        cache_settings_with_defaults = dict(DEFAULT_ROWS_CACHE, **(cache_settings or {}))
+        backend = cache_settings_with_defaults['BACKEND'] if cache_settings else None
+
+        if backend == 'memory':
+            _rows_cache = MemoryRowsCache(cache_settings_with_defaults['MAX_BYTES'])
+        elif backend == 'django':
+            _rows_cache = DjangoRowsCache(
+                cache_settings_with_defaults['CACHE_ALIAS'],
+                cache_settings_with_defaults['TIMEOUT']
+            )
+        else:
+            _rows_cache = None
+
+        _rows_cache_settings = cache_settings
+
+    return _rows_cache
+
+
+def invalidate_table_rows_cache(table_id):
+    rows_cache = get_rows_cache()
+    if rows_cache is not None:
+        rows_cache.invalidate_table(table_id)
+
+
+@receiver(table_schema_changed, dispatch_uid='rows_cache_invalidation')
+def invalidate_rows_cache_on_schema_change(sender, table_id, schema_version, **kwargs):
+    invalidate_table_rows_cache(table_id)
@@ -0,0 +1,59 @@
+import ujson
+from django.conf import settings
+from django.db import transaction
+
+from table.rows import JSON_DUMPS_OPTIONS, build_row_converter, get_row_field_names
+
+EXPORT_OUTPUTS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def iter_table_rows(model, table_fields, chunk_size=None, row_filter=None):
+    """
+    Yields lists of row dicts read through a named server-side cursor,
+    so only `chunk_size` rows are held in memory at a time.
+    """
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'TABLE_EXPORT_CHUNK_SIZE', 2000)
+
+    field_names = get_row_field_names(table_fields)
+    convert = build_row_converter(table_fields)
+    table_rows = model.objects.order_by('id').values_list(*field_names)
+    if row_filter:
+        table_rows = table_rows.filter(row_filter)
+
+    # Inside a transaction the cursor is declared WITHOUT HOLD and is not materialized on commit
+    with transaction.atomic():
+        chunk = []
+        for table_row in table_rows.iterator(chunk_size=chunk_size):
+            chunk.append(convert(table_row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def stream_ndjson(chunks):
+    for chunk in chunks:
+        yield ''.join(ujson.dumps(row, **JSON_DUMPS_OPTIONS) + '\n' for row in chunk).encode()
+
+
+def stream_json_array(chunks):
+    yield b'['
+    separator = ''
+    for chunk in chunks:
+        yield (separator + ','.join(ujson.dumps(row, **JSON_DUMPS_OPTIONS) for row in chunk)).encode()
+        separator = ','
+    yield b']'
+
+
+def stream_table_export(model, table_fields, output, row_filter=None):
+    chunks = iter_table_rows(model, table_fields, row_filter=row_filter)
+    if output == 'json':
+        return stream_json_array(chunks)
+
+    return stream_ndjson(chunks)
@@ -0,0 +1,147 @@
+from django.db.models import Q
+from rest_framework import serializers
+
+from table.enums import AllowedFieldTypes
+
+FIELDS_QUERY_PARAM = 'fields'
+FILTER_SEPARATOR = '__'
+IN_SEPARATOR = ','
+
+STRING = AllowedFieldTypes.STRING.name
+NUMBER = AllowedFieldTypes.NUMBER.name
+BOOLEAN = AllowedFieldTypes.BOOLEAN.name
+
+# Filter operator: (ORM lookup, field types it can be applied to)
+FILTER_OPERATORS = {
+    'eq': ('exact', {STRING, NUMBER, BOOLEAN}),
+    'ne': ('exact', {STRING, NUMBER, BOOLEAN}),
+    'lt': ('lt', {STRING, NUMBER}),
+    'gt': ('gt', {STRING, NUMBER}),
+    'in': ('in', {STRING, NUMBER, BOOLEAN}),
+    'is_null': ('isnull', {STRING, NUMBER, BOOLEAN}),
+    'prefix': ('startswith', {STRING}),
+}
+
+
+def get_filterable_fields(table_fields):
+    filterable_fields = {'id': NUMBER}
+    for field in table_fields:
+        filterable_fields[field['field_name']] = field['field_type']
+
+    return filterable_fields
+
+
+def parse_filter_value(field_type, value):
+    if isinstance(value, (list, dict)):
+        raise ValueError(value)
+
+    if field_type == NUMBER:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        return int(value)
+
+    if field_type == BOOLEAN:
+        if value in serializers.BooleanField.TRUE_VALUES:
+            return True
+        if value in serializers.BooleanField.FALSE_VALUES:
+            return False
+        raise ValueError(value)
+
+    return value
+
+
+def parse_field_projection(query_params, table_fields):
+    """Returns the schema fields requested with `?fields=a,b`, all of them if not provided."""
+    requested_fields = query_params.get(FIELDS_QUERY_PARAM)
+    if not requested_fields:
+        return table_fields
+
+    requested_field_names = set(
+        field_name.strip() for field_name in requested_fields.split(',') if field_name.strip()
+    )
+    requested_field_names.discard('id')
+
+    unknown_field_names = requested_field_names.difference(
+        field['field_name'] for field in table_fields
+    )
+    if unknown_field_names:
+        raise serializers.ValidationError({
+            FIELDS_QUERY_PARAM: ["Unknown fields: {}.".format(sorted(unknown_field_names))]
+        })
+
+    return [field for field in table_fields if field['field_name'] in requested_field_names]
+
+
+def parse_row_filters(params, table_fields):
+    """
+    Compiles `<field>__<operator>=<value>` parameters into a `Q` object, checking
+    every field and value against the table schema.
+    Parameters without an operator suffix are left to the caller.
+    """
+    filterable_fields = get_filterable_fields(table_fields)
+
+    row_filter, errors = Q(), {}
+    for key in params:
+        if FILTER_SEPARATOR not in key:
+            continue
+
+        field_name, operator = key.rsplit(FILTER_SEPARATOR, 1)
+        if operator not in FILTER_OPERATORS:
+            errors[key] = ["Unknown filter operator {}.".format(operator)]
+            continue
+
+        if field_name not in filterable_fields:
+            errors[key] = ["Unknown field {}.".format(field_name)]
+            continue
+
+        field_type = filterable_fields[field_name]
+        lookup, field_types = FILTER_OPERATORS[operator]
+        if field_type not in field_types:
+            errors[key] = ["Operator {} is not supported by {} fields.".format(operator, field_type)]
+            continue
+
+        values = params.getlist(key) if hasattr(params, 'getlist') else [params[key]]
+        for value in values:
+            try:
+                if operator == 'in':
+                    items = value if isinstance(value, list) else str(value).split(IN_SEPARATOR)
+                    value = [parse_filter_value(field_type, item) for item in items]
+                elif operator == 'is_null':
+                    value = parse_filter_value(BOOLEAN, value)
+                else:
+                    value = parse_filter_value(field_type, value)
+            except (ValueError, TypeError):
+                errors[key] = ["Invalid value {} for {} field.".format(value, field_type)]
+                break
+
+            condition = Q(**{"{}__{}".format(field_name, lookup): value})
+            row_filter &= ~condition if operator == 'ne' else condition
+
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    return row_filter
+
+
+def parse_rows_selection(table_fields, ids=None, where=None):
+    """
+    Returns a `Q` selecting rows by a list of ids and/or `<field>__<operator>` filters.
+    Every filter must have an operator, so a typo cannot widen the selection to all rows.
+    """
+    row_filter = Q()
+    if ids:
+        row_filter &= Q(pk__in=ids)
+
+    if where:
+        errors = {
+            key: ["Filter operator is missing."] for key in where if FILTER_SEPARATOR not in key
+        }
+        try:
+            row_filter &= parse_row_filters(where, table_fields)
+        except serializers.ValidationError as exc:
+            errors.update(exc.detail)
+
+        if errors:
+            raise serializers.ValidationError({'where': errors})
+
+    return row_filter
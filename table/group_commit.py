@@ -0,0 +1,143 @@
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from table.rows import insert_table_rows
+from table.schema import bump_data_version
+
+
+class PendingRow:
+    __slots__ = ('values', 'table_row_id', 'error')
+
+    def __init__(self, values):
+        self.values = values
+        self.table_row_id = None
+        self.error = None
+
+
+class PendingBatch:
+    __slots__ = ('rows', 'closed', 'flushed')
+
+    def __init__(self):
+        self.rows = []
+        self.closed = threading.Event()
+        self.flushed = threading.Event()
+
+
+class GroupCommitter:
+    """
+    Buffers concurrent single-row inserts into the same table and commits them together.
+    The first caller of a batch becomes its leader: it waits until the batch is full or
+    `TABLE_GROUP_COMMIT_MAX_WAIT_MS` has passed, then inserts all rows with one statement
+    in one transaction on its own connection. The other callers wait for their row ids.
+    Batches are collected per process, so each server worker batches its own requests.
+    """
+
+    def __init__(self):
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_rows(self):
+        return getattr(settings, 'TABLE_GROUP_COMMIT_MAX_ROWS', 100)
+
+    @property
+    def max_wait(self):
+        return getattr(settings, 'TABLE_GROUP_COMMIT_MAX_WAIT_MS', 5) / 1000
+
+    def insert(self, table_object, db_table, field_names, values):
+        """Returns the id of the inserted row or raises the database error of its insert."""
+        key = (table_object.pk, table_object.schema_version)
+        row = PendingRow(values)
+
+        with self._lock:
+            batch = self._batches.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batches[key] = PendingBatch()
+
+            batch.rows.append(row)
+            if len(batch.rows) >= self.max_rows:
+                self._close_batch(key, batch)
+
+        if is_leader:
+            batch.closed.wait(self.max_wait)
+            with self._lock:
+                self._close_batch(key, batch)
+
+            try:
+                self.flush(table_object, db_table, field_names, batch.rows)
+            finally:
+                batch.flushed.set()
+        else:
+            batch.flushed.wait()
+
+        if row.error is not None:
+            raise row.error
+
+        return row.table_row_id
+
+    def _close_batch(self, key, batch):
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        batch.closed.set()
+
+    def flush(self, table_object, db_table, field_names, rows):
+        """Inserts the rows in one commit; rows rejected by the database get their own error."""
+        try:
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        table_row_ids = insert_table_rows(
+                            db_table, field_names, [row.values for row in rows]
+                        )
+                    for row, table_row_id in zip(rows, table_row_ids):
+                        row.table_row_id = table_row_id
+                except DatabaseError:
+                    for row in rows:
+                        try:
+                            with transaction.atomic():
+                                row.table_row_id = insert_table_rows(
+                                    db_table, field_names, [row.values]
+                                )[0]
+                        except DatabaseError as exc:
+                            row.error = exc
+
+                if any(row.table_row_id is not None for row in rows):
+                    bump_data_version(table_object)
+        except Exception as exc:
+            # Nothing was committed
+            for row in rows:
+                row.table_row_id = None
+                row.error = exc
+
+
+group_committer = GroupCommitter()
+
+
+def insert_table_row(table_object, model, table_fields, validated_data, insert_rows=None):
+    """
+    Inserts one validated row and returns its id.
+    With `TABLE_GROUP_COMMIT` enabled the row is committed together with rows inserted
+    concurrently into the same table, unless the caller is already inside a transaction.
+    `insert_rows`, such as a `TableUpsert`, replaces the plain insert and the batching.
+    """
+    field_names = [field['field_name'] for field in table_fields]
+    values = [validated_data[field_name] for field_name in field_names]
+
+    if insert_rows is not None:
+        with transaction.atomic():
+            table_row_id = insert_rows(model._meta.db_table, field_names, [values])[0]
+            bump_data_version(table_object)
+
+        return table_row_id
+
+    if getattr(settings, 'TABLE_GROUP_COMMIT', False) and not connection.in_atomic_block:
+        return group_committer.insert(table_object, model._meta.db_table, field_names, values)
+
+    with transaction.atomic():
+        added_table_row = model.objects.create(**validated_data)
+        bump_data_version(table_object)
+
+    return added_table_row.pk
@@ -0,0 +1,61 @@
+import hashlib
+
+import ujson
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from table.group_commit import insert_table_row
+from table.models import RowIdempotencyKey
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def get_request_hash(validated_data):
+    return hashlib.sha256(ujson.dumps(validated_data, sort_keys=True).encode()).hexdigest()
+
+
+def get_replayed_row_id(idempotency_key, request_hash):
+    if idempotency_key.request_hash != request_hash:
+        raise serializers.ValidationError(
+            "Idempotency key {} is already used by a different row.".format(idempotency_key.key)
+        )
+
+    return idempotency_key.table_row_id
+
+
+def insert_table_row_once(table_object, model, table_fields, validated_data, key, insert_rows=None):
+    """
+    Inserts the row unless a request with the same idempotency key already did.
+    Returns the row id and whether the row was inserted by an earlier request.
+    The key is saved in the transaction of the row, so a concurrent retry waits for it
+    on the unique constraint and then gets the row of the first request.
+    """
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise serializers.ValidationError(
+            "Idempotency key must have at most {} characters.".format(MAX_IDEMPOTENCY_KEY_LENGTH)
+        )
+
+    request_hash = get_request_hash(validated_data)
+    idempotency_key = RowIdempotencyKey.objects.filter(table=table_object, key=key).first()
+    if idempotency_key is not None:
+        return get_replayed_row_id(idempotency_key, request_hash), True
+
+    try:
+        with transaction.atomic():
+            table_row_id = insert_table_row(
+                table_object, model, table_fields, validated_data, insert_rows
+            )
+            RowIdempotencyKey.objects.create(
+                table=table_object,
+                key=key,
+                request_hash=request_hash,
+                table_row_id=table_row_id
+            )
+    except IntegrityError:
+        idempotency_key = RowIdempotencyKey.objects.filter(table=table_object, key=key).first()
+        if idempotency_key is None:
+            raise
+
+        return get_replayed_row_id(idempotency_key, request_hash), True
+
+    return table_row_id, False
@@ -0,0 +1,306 @@
+from django.db import connection, transaction
+from django.db.backends.utils import truncate_name
+from django.db.models.sql.query import Query
+from django.db.utils import DatabaseError
+from rest_framework import serializers
+
+from table.filters import get_filterable_fields, parse_row_filters
+from table.models import TableName
+from table.partitions import get_partition_names
+
+
+def get_index_name(model, index_definition):
+    if index_definition.get('index_name'):
+        return index_definition['index_name']
+
+    return truncate_name(
+        "{}_{}_{}".format(
+            model._meta.db_table,
+            '_'.join(index_definition['fields']),
+            'uniq' if index_definition.get('unique') else 'idx'
+        ).lower(),
+        connection.ops.max_name_length()
+    )
+
+
+def validate_index_definition(table_fields, index_definition):
+    """Checks index fields and partial index condition against the table schema."""
+    filterable_fields = get_filterable_fields(table_fields)
+
+    unknown_fields = [
+        field_name for field_name in index_definition['fields']
+        if field_name not in filterable_fields
+    ]
+    if unknown_fields:
+        raise serializers.ValidationError({
+            'fields': ["Unknown fields: {}.".format(unknown_fields)]
+        })
+
+    try:
+        return parse_row_filters(index_definition.get('condition') or {}, table_fields)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({'condition': exc.detail})
+
+
+def get_index_condition_sql(model, row_filter):
+    query = Query(model=model, alias_cols=False)
+    where = query.build_where(row_filter)
+    sql, params = where.as_sql(query.get_compiler(connection=connection), connection)
+    return connection.ops.compose_sql(sql, params)
+
+
+def get_create_index_sql(
+    model,
+    table_fields,
+    index_definition,
+    concurrently=False,
+    if_not_exists=False,
+    db_table=None,
+    index_name=None,
+    only=False
+):
+    """
+    `db_table` and `index_name` build the same index on a copy of the table, under another name.
+    With `only` the index of a partitioned table is created without indexing its partitions.
+    """
+    quote_name = connection.ops.quote_name
+    row_filter = validate_index_definition(table_fields, index_definition)
+
+    sql = "CREATE {unique}INDEX {concurrently}{if_not_exists}{name} ON {only}{table} ({columns})".format(
+        unique='UNIQUE ' if index_definition.get('unique') else '',
+        concurrently='CONCURRENTLY ' if concurrently else '',
+        if_not_exists='IF NOT EXISTS ' if if_not_exists else '',
+        name=quote_name(index_name or get_index_name(model, index_definition)),
+        only='ONLY ' if only else '',
+        table=quote_name(db_table or model._meta.db_table),
+        columns=', '.join(quote_name(field_name) for field_name in index_definition['fields'])
+    )
+    if row_filter:
+        sql += " WHERE {}".format(get_index_condition_sql(model, row_filter))
+
+    return sql
+
+
+def get_drop_index_sql(index_name, concurrently=False):
+    return "DROP INDEX {concurrently}IF EXISTS {name}".format(
+        concurrently='CONCURRENTLY ' if concurrently else '',
+        name=connection.ops.quote_name(index_name)
+    )
+
+
+def get_partition_index_name(partition_name, index_name):
+    return truncate_name(
+        "{}_{}".format(partition_name, index_name), connection.ops.max_name_length()
+    )
+
+
+def create_index(cursor, table_object, model, table_fields, index_definition, concurrently=False,
+                 if_not_exists=False):
+    """
+    Partitioned tables can not be indexed concurrently at once: the index is created on the
+    table only and then built concurrently on every partition and attached to it.
+    """
+    if not (concurrently and table_object.partitioning):
+        cursor.execute(get_create_index_sql(
+            model, table_fields, index_definition, concurrently, if_not_exists
+        ))
+        return
+
+    index_name = get_index_name(model, index_definition)
+    cursor.execute("SELECT to_regclass(%s)", [connection.ops.quote_name(index_name)])
+    if if_not_exists and cursor.fetchone()[0] is not None:
+        return
+
+    cursor.execute(get_create_index_sql(
+        model, table_fields, index_definition, if_not_exists=if_not_exists, only=True
+    ))
+    for partition_name in get_partition_names(cursor, model._meta.db_table):
+        partition_index_name = get_partition_index_name(partition_name, index_name)
+        cursor.execute(get_create_index_sql(
+            model,
+            table_fields,
+            index_definition,
+            concurrently=True,
+            if_not_exists=True,
+            db_table=partition_name,
+            index_name=partition_index_name
+        ))
+        cursor.execute("ALTER INDEX {} ATTACH PARTITION {}".format(
+            connection.ops.quote_name(index_name), connection.ops.quote_name(partition_index_name)
+        ))
+
+
+def drop_index(cursor, table_object, index_name, concurrently=False):
+    """
+    Indexes of partitioned tables are dropped at once, together with the partition indexes
+    attached to them. Partition indexes left by a failed concurrent build are dropped too.
+    """
+    if not (concurrently and table_object.partitioning):
+        cursor.execute(get_drop_index_sql(index_name, concurrently))
+        return
+
+    cursor.execute("""
+        SELECT
+            c.relname
+        FROM
+            pg_index i
+        JOIN
+            pg_class c ON c.oid = i.indrelid
+        WHERE
+            i.indexrelid = to_regclass(%s);
+    """, [connection.ops.quote_name(index_name)])
+    row = cursor.fetchone()
+    partition_names = get_partition_names(cursor, row[0]) if row else []
+
+    cursor.execute(get_drop_index_sql(index_name))
+    for partition_name in partition_names:
+        cursor.execute(get_drop_index_sql(
+            get_partition_index_name(partition_name, index_name), concurrently
+        ))
+
+
+def is_invalid_table_index(cursor, model, index_name):
+    """Tells whether `index_name` is an index of the table which is not usable by queries."""
+    cursor.execute("""
+        SELECT
+            NOT indisvalid
+        FROM
+            pg_index
+        WHERE
+            indexrelid = to_regclass(%s)
+        AND
+            indrelid = to_regclass(%s);
+    """, [connection.ops.quote_name(index_name), connection.ops.quote_name(model._meta.db_table)])
+    row = cursor.fetchone()
+    return row is not None and row[0]
+
+
+def create_table_index(table_object, model, table_fields, index_definition):
+    """
+    Builds the index and records it in the table metadata.
+    Outside of a transaction the index is built concurrently, so writes are not blocked.
+    """
+    index_definition = {
+        'index_name': get_index_name(model, index_definition),
+        'fields': list(index_definition['fields']),
+        'unique': index_definition.get('unique', False),
+        'condition': index_definition.get('condition') or {},
+    }
+
+    if any(
+        index['index_name'] == index_definition['index_name'] for index in table_object.indexes
+    ):
+        raise serializers.ValidationError(
+            "Index {} is already exists.".format(index_definition['index_name'])
+        )
+
+    concurrently = not connection.in_atomic_block
+    validate_index_definition(table_fields, index_definition)
+
+    # Index names are shared by all tables of the schema
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT to_regclass(%s)", [connection.ops.quote_name(index_definition['index_name'])]
+        )
+        if cursor.fetchone()[0] is not None:
+            raise serializers.ValidationError(
+                "Index name {} is already used.".format(index_definition['index_name'])
+            )
+
+    try:
+        with connection.cursor() as cursor:
+            create_index(cursor, table_object, model, table_fields, index_definition, concurrently)
+    except DatabaseError as exc:
+        if concurrently:
+            # A failed concurrent build leaves an invalid index behind
+            with connection.cursor() as cursor:
+                if is_invalid_table_index(cursor, model, index_definition['index_name']):
+                    drop_index(cursor, table_object, index_definition['index_name'], concurrently)
+
+        raise serializers.ValidationError(
+            "Could not create index {}: {}".format(index_definition['index_name'], exc)
+        )
+
+    with transaction.atomic():
+        locked_table_object = TableName.objects.select_for_update().get(pk=table_object.pk)
+        locked_table_object.indexes = locked_table_object.indexes + [index_definition]
+        locked_table_object.save(update_fields=['indexes'])
+
+    table_object.indexes = locked_table_object.indexes
+    return index_definition
+
+
+def drop_table_index(table_object, index_name):
+    concurrently = not connection.in_atomic_block
+    with connection.cursor() as cursor:
+        drop_index(cursor, table_object, index_name, concurrently)
+
+    with transaction.atomic():
+        locked_table_object = TableName.objects.select_for_update().get(pk=table_object.pk)
+        locked_table_object.indexes = [
+            index for index in locked_table_object.indexes if index['index_name'] != index_name
+        ]
+        locked_table_object.save(update_fields=['indexes'])
+
+    table_object.indexes = locked_table_object.indexes
+
+
+def get_table_indexes(table_object):
+    """Returns recorded indexes together with their validity and size from the catalog."""
+    index_names = [index['index_name'] for index in table_object.indexes]
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                c.relname,
+                i.indisvalid,
+                pg_relation_size(c.oid)
+            FROM
+                pg_class c
+            JOIN
+                pg_index i ON i.indexrelid = c.oid
+            WHERE
+                c.relname = ANY(%s);
+        """, [index_names])
+        catalog = {name: (is_valid, size) for name, is_valid, size in cursor.fetchall()}
+
+    return [
+        dict(
+            index,
+            is_valid=catalog.get(index['index_name'], (False, 0))[0],
+            size_bytes=catalog.get(index['index_name'], (False, 0))[1],
+        )
+        for index in table_object.indexes
+    ]
+
+
+def sync_table_indexes(table_object, model, table_fields, concurrently=False):
+    """
+    Keeps recorded indexes consistent with a changed schema: indexes on removed
+    fields are forgotten, the rest are re-created if a column change dropped them.
+    Must run inside the schema change transaction, or after it without a transaction
+    to re-create the indexes `concurrently`.
+    """
+    kept_indexes = []
+    with connection.cursor() as cursor:
+        for index_definition in table_object.indexes:
+            try:
+                validate_index_definition(table_fields, index_definition)
+            except serializers.ValidationError:
+                drop_index(cursor, table_object, index_definition['index_name'], concurrently)
+                continue
+
+            create_index(
+                cursor,
+                table_object,
+                model,
+                table_fields,
+                index_definition,
+                concurrently,
+                if_not_exists=True
+            )
+            kept_indexes.append(index_definition)
+
+    if kept_indexes != table_object.indexes:
+        TableName.objects.filter(pk=table_object.pk).update(indexes=kept_indexes)
+        table_object.indexes = kept_indexes
@@ -0,0 +1,175 @@
+import codecs
+import csv
+import io
+import time
+
+import ujson
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from table.bulk import insert_batch_best_effort
+from table.rows import get_insert_batch_size
+from table.schema import bump_data_version
+from table.validators import get_row_validator
+
+CSV_INPUT = 'csv'
+NDJSON_INPUT = 'ndjson'
+INPUT_CONTENT_TYPES = {
+    'text/csv': CSV_INPUT,
+    'application/x-ndjson': NDJSON_INPUT,
+    'application/jsonl': NDJSON_INPUT,
+}
+MAX_REPORTED_ERRORS = 100
+
+
+class InvalidLine:
+    def __init__(self, message):
+        self.message = message
+
+
+def iter_csv_rows(lines):
+    """Yields `(line_number, row)` pairs of a CSV document with a header line."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(lines):
+    """Yields `(line_number, row)` pairs of a newline delimited JSON document."""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield line_number, ujson.loads(line)
+        except ValueError as exc:
+            yield line_number, InvalidLine("Invalid JSON: {}.".format(exc))
+
+
+def iter_input_rows(byte_lines, input_format):
+    lines = codecs.iterdecode(byte_lines, 'utf-8')
+    if input_format == CSV_INPUT:
+        return iter_csv_rows(lines)
+
+    return iter_ndjson_rows(lines)
+
+
+def copy_table_rows(db_table, field_names, rows_values):
+    """Loads rows with `COPY ... FROM STDIN`, streaming them as CSV from memory."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows_values)
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    # copy_expert() is passed straight to psycopg2, so its errors are not wrapped by Django
+    with connection.cursor() as cursor, connection.wrap_database_errors:
+        cursor.copy_expert(
+            "COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)".format(
+                table=quote_name(db_table),
+                columns=', '.join(quote_name(field_name) for field_name in field_names)
+            ),
+            buffer
+        )
+
+
+def load_chunk(db_table, field_names, chunk, report, table_object=None):
+    """
+    Copies one chunk of validated rows in its own transaction.
+    If the database rejects the chunk, its rows are inserted in multi-row batches, and the
+    batches holding failing rows one row at a time, to skip the failing ones.
+    The data version of `table_object`, when given, is bumped together with the loaded rows.
+    """
+    errors = []
+    try:
+        with transaction.atomic():
+            copy_table_rows(db_table, field_names, [values for _, values in chunk])
+            if table_object is not None:
+                bump_data_version(table_object)
+        loaded = len(chunk)
+    except DatabaseError:
+        # Multi-row inserts are bound by the query parameter limit, unlike COPY
+        batch_size = get_insert_batch_size(
+            field_names, getattr(settings, 'TABLE_BULK_INSERT_BATCH_SIZE', 1000)
+        )
+        table_row_ids = {}
+        with transaction.atomic():
+            for start in range(0, len(chunk), batch_size):
+                insert_batch_best_effort(
+                    db_table, field_names, chunk[start:start + batch_size], table_row_ids, errors
+                )
+            if table_row_ids and table_object is not None:
+                bump_data_version(table_object)
+        loaded = len(table_row_ids)
+
+    report['rows_loaded'] += loaded
+    for error in errors:
+        add_rejected_row(report, error['index'], error['errors'])
+
+
+def create_ingest_report():
+    return {
+        "rows_loaded": 0,
+        "rows_rejected": 0,
+        "errors": [],
+    }
+
+
+def add_rejected_row(report, line_number, errors):
+    report['rows_rejected'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append({"line": line_number, "errors": errors})
+
+
+def set_ingest_throughput(report, started):
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["rows_loaded"] / elapsed) if elapsed else 0
+
+
+def load_input_rows(db_table, row_validator, input_rows, report, chunk_size, table_object=None):
+    """Validates `(line_number, row)` pairs and copies the valid rows in chunks of `chunk_size`."""
+    field_names = row_validator.field_names
+
+    chunk = []
+    for line_number, row in input_rows:
+        if isinstance(row, InvalidLine):
+            add_rejected_row(report, line_number, {"non_field_errors": [row.message]})
+            continue
+
+        validated_data, row_errors = row_validator(row)
+        if row_errors:
+            add_rejected_row(report, line_number, row_errors)
+            continue
+
+        chunk.append((line_number, [validated_data[field_name] for field_name in field_names]))
+        if len(chunk) >= chunk_size:
+            load_chunk(db_table, field_names, chunk, report, table_object)
+            chunk = []
+
+    if chunk:
+        load_chunk(db_table, field_names, chunk, report, table_object)
+
+    return report
+
+
+def get_copy_chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, 'TABLE_COPY_CHUNK_SIZE', 10000)
+
+
+def ingest_table_rows(table_object, model, table_fields, byte_lines, input_format, chunk_size=None):
+    """
+    Streams CSV or NDJSON lines into the table in validated chunks without holding
+    the whole document in memory. Returns loaded/rejected counts and throughput.
+    """
+    started = time.perf_counter()
+    report = load_input_rows(
+        model._meta.db_table,
+        get_row_validator(table_object, table_fields),
+        iter_input_rows(byte_lines, input_format),
+        create_ingest_report(),
+        get_copy_chunk_size(chunk_size),
+        table_object
+    )
+    set_ingest_throughput(report, started)
+
+    return report
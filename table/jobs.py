@@ -0,0 +1,249 @@
+import functools
+import logging
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+
+from table.indexes import create_table_index
+from table.locks import schema_change_lock
+from table.models import TableJob
+from table.online_schema_changes import apply_table_schema_change_online
+from table.parallel_ingest import import_table_file
+from table.registry import get_table_model
+from table.retention import purge_table_rows
+from table.schema import get_table_schema
+from table.schema_changes import apply_table_schema_change
+
+logger = logging.getLogger(__name__)
+
+# First key of the advisory lock a worker holds while it runs a job
+JOB_LOCK_CLASS = 7302
+BACKGROUND_QUERY_PARAM = 'background'
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def enqueue_table_job(table_object, kind, params):
+    return TableJob.objects.create(table=table_object, kind=kind, params=params)
+
+
+def parse_background_param(query_params):
+    try:
+        return serializers.BooleanField().to_internal_value(
+            query_params.get(BACKGROUND_QUERY_PARAM, False)
+        )
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({BACKGROUND_QUERY_PARAM: exc.detail})
+
+
+def save_job_input(input_stream, input_format):
+    """
+    Saves an uploaded file for an import job. `TABLE_JOB_FILES_DIR` must be shared with
+    the job workers; the file is removed once the job ran.
+    """
+    files_dir = getattr(settings, 'TABLE_JOB_FILES_DIR', tempfile.gettempdir())
+    os.makedirs(files_dir, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(
+        'wb', dir=files_dir, suffix='.{}'.format(input_format), delete=False
+    ) as input_file:
+        if input_stream is not None:
+            shutil.copyfileobj(input_stream, input_file)
+
+    return input_file.name
+
+
+def remove_job_input(job):
+    """Removes the file uploaded for the job, if it was saved by `save_job_input`."""
+    if job.params.get('remove_input'):
+        try:
+            os.remove(job.params['path'])
+        except FileNotFoundError:
+            pass
+
+
+def report_job_progress(job, **progress):
+    """Stores the progress of the running job and stops it once its cancellation is requested."""
+    TableJob.objects.filter(pk=job.pk).update(progress=progress)
+    job.progress = progress
+
+    if TableJob.objects.filter(pk=job.pk, cancel_requested=True).exists():
+        raise JobCancelled
+
+
+def cancel_job(job):
+    """
+    Cancels a queued job right away, a running one stops at its next progress report.
+    No worker runs a cancelled queued job, so its uploaded file is removed here.
+    """
+    if TableJob.objects.filter(pk=job.pk, status=TableJob.QUEUED).update(
+        status=TableJob.CANCELLED, finished_at=timezone.now()
+    ):
+        job.refresh_from_db()
+        remove_job_input(job)
+        return job
+
+    TableJob.objects.filter(pk=job.pk, status=TableJob.RUNNING).update(cancel_requested=True)
+    job.refresh_from_db()
+    if job.status != TableJob.RUNNING:
+        raise exceptions.ValidationError("Job {} is already finished.".format(job.pk))
+
+    return job
+
+
+def get_job_table(job):
+    table_object = job.table
+    table_fields = get_table_schema(table_object)
+    if not table_fields:
+        raise exceptions.NotFound(detail='Table not found.')
+
+    return (
+        table_object,
+        get_table_model(table_object, table_fields, table_object.schema_version),
+        table_fields
+    )
+
+
+def run_schema_change_job(job, progress):
+    table_object, _, _ = get_job_table(job)
+    new_table_fields = job.params['new_table_fields']
+
+    if job.params.get('online'):
+        apply_table_schema_change_online(table_object, new_table_fields, progress=progress)
+    else:
+        apply_table_schema_change(table_object, new_table_fields)
+
+    return {
+        "table_name": table_object.table_name,
+        "table_fields": new_table_fields
+    }
+
+
+def run_create_index_job(job, progress):
+    table_object, model, table_fields = get_job_table(job)
+    return create_table_index(table_object, model, table_fields, job.params)
+
+
+def run_import_rows_job(job, progress):
+    try:
+        table_object, model, table_fields = get_job_table(job)
+        return import_table_file(
+            table_object,
+            model,
+            table_fields,
+            job.params['path'],
+            job.params['input_format'],
+            workers=job.params.get('workers'),
+            chunk_size=job.params.get('chunk_size'),
+            staging=job.params.get('staging', False),
+            progress=progress
+        )
+    finally:
+        # Files uploaded for the job are not needed once it ran
+        remove_job_input(job)
+
+
+def run_purge_rows_job(job, progress):
+    table_object, model, table_fields = get_job_table(job)
+    with schema_change_lock(table_object):
+        return purge_table_rows(table_object, model, table_fields, progress=progress)
+
+
+JOB_HANDLERS = {
+    TableJob.SCHEMA_CHANGE: run_schema_change_job,
+    TableJob.CREATE_INDEX: run_create_index_job,
+    TableJob.IMPORT_ROWS: run_import_rows_job,
+    TableJob.PURGE_ROWS: run_purge_rows_job,
+}
+
+
+def finish_table_job(job, status, result=None, error=None):
+    job.status, job.result, job.error, job.finished_at = status, result, error, timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+
+
+def run_table_job(job):
+    """Runs the claimed job and records its outcome; errors of the operation fail only the job."""
+    handler = JOB_HANDLERS[job.kind]
+    try:
+        result = handler(job, functools.partial(report_job_progress, job))
+    except JobCancelled:
+        finish_table_job(job, TableJob.CANCELLED)
+    except exceptions.APIException as exc:
+        finish_table_job(job, TableJob.FAILED, error=exc.detail)
+    except Exception as exc:
+        logger.exception("Table job %s failed.", job.pk)
+        finish_table_job(job, TableJob.FAILED, error=str(exc))
+    else:
+        finish_table_job(job, TableJob.SUCCEEDED, result=result)
+
+
+def claim_table_job(lock_connection):
+    """
+    Marks the oldest queued job as running. Other workers skip the locked job row instead of
+    waiting for it. The job stays advisory locked on `lock_connection` until it is released,
+    so a job left running by a stopped worker can be told apart from a running one.
+    """
+    with transaction.atomic():
+        job = TableJob.objects.select_for_update(skip_locked=True).filter(
+            status=TableJob.QUEUED
+        ).order_by('id').first()
+        if job is None:
+            return None
+
+        with lock_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s, %s)", [JOB_LOCK_CLASS, job.pk])
+
+        job.status, job.started_at = TableJob.RUNNING, timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+
+    return job
+
+
+def release_table_job(lock_connection, job):
+    with lock_connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [JOB_LOCK_CLASS, job.pk])
+
+
+def fail_abandoned_table_jobs(lock_connection):
+    """Fails running jobs whose worker stopped. Must not be called while the worker runs a job."""
+    abandoned_job_ids = []
+    for job_id in TableJob.objects.filter(status=TableJob.RUNNING).values_list('pk', flat=True):
+        with lock_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [JOB_LOCK_CLASS, job_id])
+            if not cursor.fetchone()[0]:
+                continue
+
+            try:
+                # The worker finishes the job before releasing it, so only abandoned jobs match
+                if TableJob.objects.filter(pk=job_id, status=TableJob.RUNNING).update(
+                    status=TableJob.FAILED,
+                    error="Worker stopped before the job finished.",
+                    finished_at=timezone.now()
+                ):
+                    abandoned_job_ids.append(job_id)
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [JOB_LOCK_CLASS, job_id])
+
+    return abandoned_job_ids
+
+
+def run_next_table_job(lock_connection):
+    """Claims and runs the oldest queued job. Returns it, or None if the queue is empty."""
+    job = claim_table_job(lock_connection)
+    if job is None:
+        return None
+
+    try:
+        run_table_job(job)
+    finally:
+        release_table_job(lock_connection, job)
+
+    return job
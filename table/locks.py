@@ -0,0 +1,88 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from rest_framework import serializers
+
+LOCK_NOT_AVAILABLE = '55P03'
+# First key of the advisory lock taken while the schema or the partitions of a table change
+SCHEMA_CHANGE_LOCK_CLASS = 7301
+MAX_LOCK_RETRY_BACKOFF = 5
+
+logger = logging.getLogger(__name__)
+
+
+def is_lock_timeout(exc):
+    return getattr(exc.__cause__, 'pgcode', None) == LOCK_NOT_AVAILABLE
+
+
+def run_with_lock_retries(apply):
+    """
+    Runs `apply(cursor)` in a transaction waiting at most `TABLE_ONLINE_LOCK_TIMEOUT_MS`
+    for its locks, retried with exponential backoff on lock timeouts. A DDL statement
+    queued for its lock blocks every later query on the table, so giving up quickly
+    behind a long read and trying again keeps the traffic flowing.
+    """
+    attempts = getattr(settings, 'TABLE_ONLINE_LOCK_ATTEMPTS', 10)
+    lock_timeout = getattr(settings, 'TABLE_ONLINE_LOCK_TIMEOUT_MS', 500)
+    backoff = getattr(settings, 'TABLE_ONLINE_LOCK_BACKOFF_MS', 100) / 1000
+
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT set_config('lock_timeout', %s, true)", ['{}ms'.format(lock_timeout)]
+                    )
+                    return apply(cursor)
+        except OperationalError as exc:
+            if not is_lock_timeout(exc) or attempt == attempts - 1:
+                raise
+
+        time.sleep(min(backoff * 2 ** attempt, MAX_LOCK_RETRY_BACKOFF) * random.uniform(0.5, 1))
+
+
+@contextmanager
+def schema_change_lock(table_object):
+    """
+    Makes sure only one online schema change, partition update or retention purge of the table
+    runs at a time.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_try_advisory_lock(%s, %s)", [SCHEMA_CHANGE_LOCK_CLASS, table_object.pk]
+        )
+        if not cursor.fetchone()[0]:
+            raise serializers.ValidationError(
+                "Schema of table {} is already being changed.".format(table_object.table_name)
+            )
+
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_unlock(%s, %s)", [SCHEMA_CHANGE_LOCK_CLASS, table_object.pk]
+            )
+
+
+def run_on_unlocked_tables(table_objects, apply):
+    """
+    Calls `apply(table_object)` on every table under its schema change lock and returns
+    the results keyed by table name. Periodic maintenance must not wait for a schema change,
+    so tables whose schema is being changed, or which `apply` rejects, are skipped and
+    reached again by the next run.
+    """
+    results = {}
+    for table_object in table_objects:
+        try:
+            with schema_change_lock(table_object):
+                table_object.refresh_from_db()
+                results[table_object.table_name] = apply(table_object)
+        except serializers.ValidationError as exc:
+            logger.warning("Skipped table %s: %s", table_object.table_name, exc)
+
+    return results
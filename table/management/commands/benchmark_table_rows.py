@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from table.models import TableName
+from table.registry import get_table_model, model_registry
+from table.rows import encode_table_rows, fetch_table_rows, get_row_field_names
+from table.schema import save_table_schema
+
+
+class Command(BaseCommand):
+    help = "Compares rows/sec of the serializer based and the values_list based table rows reads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        table_fields = [
+            {'field_name': 'title', 'field_type': 'STRING'},
+            {'field_name': 'amount', 'field_type': 'NUMBER'},
+            {'field_name': 'active', 'field_type': 'BOOLEAN'},
+        ]
+        tableObject = TableName.objects.create(table_name='benchmark_rows')
+        save_table_schema(tableObject, table_fields)
+        model = get_table_model(tableObject, table_fields, tableObject.schema_version)
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(model)
+
+        try:
+            model.objects.bulk_create([
+                model(title='row {}'.format(index), amount=index, active=index % 2 == 0)
+                for index in range(options['rows'])
+            ], batch_size=5000)
+
+            for name, read in (
+                ('serializer', lambda: self.read_with_serializer(model)),
+                ('values_list', lambda: self.read_with_values_list(model, table_fields)),
+            ):
+                elapsed = min(self.measure(read) for _ in range(options['repeat']))
+                self.stdout.write("{:<12} {:>12.0f} rows/sec".format(
+                    name, options['rows'] / elapsed
+                ))
+        finally:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.delete_model(model)
+            model_registry.invalidate(tableObject.pk)
+            tableObject.delete()
+
+    def measure(self, read):
+        started = time.perf_counter()
+        read()
+        return time.perf_counter() - started
+
+    def read_with_serializer(self, model):
+        class ModelSerializer(serializers.ModelSerializer):
+            class Meta:
+                fields = '__all__'
+
+        ModelSerializer.Meta.model = model
+
+        return JSONRenderer().render([
+            ModelSerializer(table_row).data for table_row in model.objects.order_by('id')
+        ])
+
+    def read_with_values_list(self, model, table_fields):
+        return encode_table_rows(
+            table_fields,
+            fetch_table_rows(model, get_row_field_names(table_fields))
+        )
@@ -0,0 +1,90 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from table.ingest import CSV_INPUT, NDJSON_INPUT
+from table.jobs import enqueue_table_job
+from table.models import TableJob, TableName
+from table.parallel_ingest import import_table_file
+from table.registry import get_table_model
+from table.schema import get_table_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads a large CSV (with header line) or NDJSON file into a dynamic table "
+        "with a pool of worker processes, each copying its own part of the file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('table_id', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--input', choices=(CSV_INPUT, NDJSON_INPUT))
+        parser.add_argument(
+            '--workers', type=int, help="Number of worker processes, all CPU cores by default."
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, help="Approximate size in bytes of the file part of one worker task."
+        )
+        parser.add_argument(
+            '--staging',
+            action='store_true',
+            help=(
+                "Load into a staging table and swap it in place of the table once the whole "
+                "file is loaded. The table rows are replaced by the file rows."
+            )
+        )
+        parser.add_argument(
+            '--background',
+            action='store_true',
+            help="Queue the import for the run_table_jobs workers instead of running it here."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tableObject = TableName.objects.get(pk=options['table_id'])
+        except TableName.DoesNotExist:
+            raise CommandError("Table name not found.")
+
+        table_fields = get_table_schema(tableObject)
+        if not table_fields:
+            raise CommandError("Table not found.")
+
+        input_format = options['input'] or (
+            CSV_INPUT if options['path'].lower().endswith('.csv') else NDJSON_INPUT
+        )
+        if options['background']:
+            job = enqueue_table_job(tableObject, TableJob.IMPORT_ROWS, {
+                "path": os.path.abspath(options['path']),
+                "input_format": input_format,
+                "workers": options['workers'],
+                "chunk_size": options['chunk_size'],
+                "staging": options['staging']
+            })
+            self.stdout.write("Queued job {}.".format(job.pk))
+            return
+
+        model = get_table_model(tableObject, table_fields, tableObject.schema_version)
+
+        try:
+            report = import_table_file(
+                tableObject,
+                model,
+                table_fields,
+                options['path'],
+                input_format,
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                staging=options['staging']
+            )
+        except serializers.ValidationError as exc:
+            raise CommandError(exc.detail)
+
+        for error in report['errors']:
+            self.stderr.write("line {}: {}".format(error['line'], error['errors']))
+
+        self.stdout.write(
+            "Loaded {rows_loaded} rows, rejected {rows_rejected} rows "
+            "in {elapsed_seconds}s ({rows_per_second} rows/sec).".format(**report)
+        )
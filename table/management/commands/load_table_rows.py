@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from table.ingest import CSV_INPUT, NDJSON_INPUT, ingest_table_rows
+from table.models import TableName
+from table.registry import get_table_model
+from table.schema import get_table_schema
+
+
+class Command(BaseCommand):
+    help = "Streams a CSV (with header line) or NDJSON file into a dynamic table with COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument('table_id', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--input', choices=(CSV_INPUT, NDJSON_INPUT))
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        try:
+            tableObject = TableName.objects.get(pk=options['table_id'])
+        except TableName.DoesNotExist:
+            raise CommandError("Table name not found.")
+
+        table_fields = get_table_schema(tableObject)
+        if not table_fields:
+            raise CommandError("Table not found.")
+
+        input_format = options['input'] or (
+            CSV_INPUT if options['path'].lower().endswith('.csv') else NDJSON_INPUT
+        )
+        model = get_table_model(tableObject, table_fields, tableObject.schema_version)
+
+        with open(options['path'], 'rb') as input_file:
+            report = ingest_table_rows(
+                tableObject,
+                model,
+                table_fields,
+                input_file,
+                input_format,
+                chunk_size=options['chunk_size']
+            )
+
+        for error in report['errors']:
+            self.stderr.write("line {}: {}".format(error['line'], error['errors']))
+
+        self.stdout.write(
+            "Loaded {rows_loaded} rows, rejected {rows_rejected} rows "
+            "in {elapsed_seconds}s ({rows_per_second} rows/sec).".format(**report)
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from table.partitions import maintain_table_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates missing partitions of range partitioned tables, for rows which went to "
+        "their default partition and ahead of the last id. Idle `run_table_jobs` workers "
+        "run it periodically as well."
+    )
+
+    def handle(self, *args, **options):
+        created_partitions = maintain_table_partitions()
+
+        for table_name, partition_names in created_partitions.items():
+            for partition_name in partition_names:
+                self.stdout.write("Created partition {} of {}.".format(partition_name, table_name))
+
+        self.stdout.write("Created {} partitions.".format(
+            sum(len(partition_names) for partition_names in created_partitions.values())
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from table.retention import enforce_table_retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Purges rows expired by the retention rules of every table, dropping whole range "
+        "partitions where possible. Idle `run_table_jobs` workers run it periodically as well."
+    )
+
+    def handle(self, *args, **options):
+        purged_tables = enforce_table_retention()
+
+        for table_name, purge in purged_tables.items():
+            self.stdout.write(
+                "Purged {} rows and {} partitions of {}.".format(
+                    purge['rows_deleted'], len(purge['partitions_dropped']), table_name
+                )
+            )
@@ -0,0 +1,86 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from table.jobs import fail_abandoned_table_jobs, run_next_table_job
+from table.partitions import maintain_table_partitions
+from table.retention import enforce_table_retention
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued background table jobs one at a time. Start as many workers as "
+        "needed, each claims the oldest job no other worker is running. Idle workers "
+        "also create missing partitions of range partitioned tables and purge rows "
+        "expired by retention rules."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true', help="Exit once the queue is empty."
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            help="Seconds to wait for new jobs when the queue is empty."
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval'] or getattr(settings, 'TABLE_JOB_POLL_INTERVAL', 1)
+        maintenance_interval = getattr(settings, 'TABLE_PARTITION_MAINTENANCE_INTERVAL', 60)
+        retention_interval = getattr(settings, 'TABLE_RETENTION_PURGE_INTERVAL', 300)
+        maintained_at, purged_at = None, None
+
+        # Holds the advisory locks of claimed jobs, it must outlive the job connections
+        lock_connection = connections.create_connection('default')
+        try:
+            while True:
+                for job_id in fail_abandoned_table_jobs(lock_connection):
+                    self.stderr.write("Job {} was left running by a stopped worker.".format(job_id))
+
+                job = run_next_table_job(lock_connection)
+                if job is not None:
+                    self.stdout.write("Job {} ({}) {}.".format(job.pk, job.kind, job.status))
+                    close_old_connections()
+                    continue
+
+                if options['once']:
+                    break
+
+                if maintained_at is None or time.monotonic() - maintained_at >= maintenance_interval:
+                    self.run_maintenance(self.maintain_partitions)
+                    maintained_at = time.monotonic()
+
+                if purged_at is None or time.monotonic() - purged_at >= retention_interval:
+                    self.run_maintenance(self.enforce_retention)
+                    purged_at = time.monotonic()
+
+                time.sleep(poll_interval)
+        finally:
+            lock_connection.close()
+
+    def run_maintenance(self, maintain):
+        try:
+            maintain()
+        except Exception:
+            # Maintenance is retried by the next run, the worker keeps running jobs
+            logger.exception("Table maintenance failed.")
+
+    def maintain_partitions(self):
+        for table_name, partition_names in maintain_table_partitions().items():
+            for partition_name in partition_names:
+                self.stdout.write("Created partition {} of {}.".format(partition_name, table_name))
+
+    def enforce_retention(self):
+        for table_name, purge in enforce_table_retention().items():
+            if purge['rows_deleted'] or purge['partitions_dropped']:
+                self.stdout.write(
+                    "Purged {} rows and {} partitions of {}.".format(
+                        purge['rows_deleted'], len(purge['partitions_dropped']), table_name
+                    )
+                )
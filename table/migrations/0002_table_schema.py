@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablename',
+            name='schema_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tablename',
+            name='table_fields',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0002_table_schema'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablename',
+            name='indexes',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0003_table_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablename',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
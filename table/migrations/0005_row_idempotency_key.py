@@ -0,0 +1,29 @@
+# Generated by Django 4.2.2 on 2026-10-18 08:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0004_table_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RowIdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('table_row_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('table', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to='table.tablename')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='rowidempotencykey',
+            constraint=models.UniqueConstraint(fields=('table', 'key'), name='table_row_idempotency_key_uniq'),
+        ),
+    ]
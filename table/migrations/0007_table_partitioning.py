@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0006_table_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablename',
+            name='partitioning',
+            field=models.JSONField(default=dict),
+        ),
+    ]
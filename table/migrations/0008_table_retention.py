@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('table', '0007_table_partitioning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tablename',
+            name='retention',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='tablejob',
+            name='kind',
+            field=models.CharField(choices=[('schema_change', 'Schema change'), ('create_index', 'Create index'), ('import_rows', 'Import rows'), ('purge_rows', 'Purge rows')], max_length=32),
+        ),
+    ]
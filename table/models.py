@@ -3,3 +3,69 @@ from django.db import models
 
 class TableName(models.Model):
     table_name = models.CharField(max_length=255, unique=True)
+    table_fields = models.JSONField(default=list)
+    schema_version = models.PositiveIntegerField(default=0)
+    data_version = models.PositiveBigIntegerField(default=0)
+    indexes = models.JSONField(default=list)
+    partitioning = models.JSONField(default=dict)
+    retention = models.JSONField(default=dict)
+
+
+class RowIdempotencyKey(models.Model):
+    """Remembers the row added by a request with an `Idempotency-Key` header."""
+    table = models.ForeignKey(TableName, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    table_row_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['table', 'key'], name='table_row_idempotency_key_uniq'),
+        ]
+
+
+class TableJob(models.Model):
+    """Long-running table operation queued for the `run_table_jobs` worker command."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    STATUSES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+        (CANCELLED, 'Cancelled'),
+    ]
+
+    SCHEMA_CHANGE = 'schema_change'
+    CREATE_INDEX = 'create_index'
+    IMPORT_ROWS = 'import_rows'
+    PURGE_ROWS = 'purge_rows'
+    KINDS = [
+        (SCHEMA_CHANGE, 'Schema change'),
+        (CREATE_INDEX, 'Create index'),
+        (IMPORT_ROWS, 'Import rows'),
+        (PURGE_ROWS, 'Purge rows'),
+    ]
+
+    table = models.ForeignKey(TableName, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=32, choices=KINDS)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=STATUSES, default=QUEUED)
+    progress = models.JSONField(default=dict)
+    result = models.JSONField(null=True)
+    error = models.JSONField(null=True)
+    cancel_requested = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['id'], condition=models.Q(status='queued'), name='table_job_queued_idx'
+            ),
+        ]
@@ -0,0 +1,130 @@
+import logging
+import select
+import threading
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+from table.signals import table_schema_changed
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CHANGES_CHANNEL = 'table_schema_changes'
+
+
+def publish_schema_change(table_id, schema_version):
+    """
+    Notifies every worker about the new schema version of the table.
+    Postgres delivers the notification only when the surrounding transaction commits.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s);",
+            [SCHEMA_CHANGES_CHANNEL, "{}:{}".format(table_id, schema_version)]
+        )
+
+    # The current process must not depend on its own listener to drop stale entries
+    transaction.on_commit(lambda: table_schema_changed.send(
+        sender=None,
+        table_id=table_id,
+        schema_version=schema_version
+    ))
+
+
+def parse_schema_change(payload):
+    table_id, schema_version = payload.split(':')
+    return int(table_id), int(schema_version)
+
+
+class SchemaChangeListener(threading.Thread):
+    """
+    Listens for schema change notifications on a dedicated database connection
+    and re-sends them as `table_schema_changed` signals inside the worker.
+    """
+
+    def __init__(self, using='default', poll_timeout=5.0, reconnect_delay=1.0):
+        super().__init__(name='table-schema-change-listener', daemon=True)
+        self.using = using
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.listening = threading.Event()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Schema change listener lost its database connection.")
+                self.listening.clear()
+                self._stopped.wait(self.reconnect_delay)
+
+    def _listen(self):
+        wrapper = connections[self.using]
+        db_connection = wrapper.Database.connect(**wrapper.get_connection_params())
+        try:
+            db_connection.autocommit = True
+            with db_connection.cursor() as cursor:
+                cursor.execute("LISTEN {};".format(SCHEMA_CHANGES_CHANNEL))
+            self.listening.set()
+
+            while not self._stopped.is_set():
+                if select.select([db_connection], [], [], self.poll_timeout) == ([], [], []):
+                    continue
+
+                db_connection.poll()
+                while db_connection.notifies:
+                    self._dispatch(db_connection.notifies.pop(0).payload)
+        finally:
+            self.listening.clear()
+            db_connection.close()
+
+    def _dispatch(self, payload):
+        try:
+            table_id, schema_version = parse_schema_change(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed schema change notification %r.", payload)
+            return
+
+        table_schema_changed.send(
+            sender=self.__class__,
+            table_id=table_id,
+            schema_version=schema_version
+        )
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def start_schema_change_listener():
+    """Starts the per-process listener once; returns the running instance."""
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return _listener
+
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = SchemaChangeListener(
+                poll_timeout=getattr(settings, 'TABLE_SCHEMA_LISTENER_POLL_TIMEOUT', 5.0)
+            )
+            _listener.start()
+
+    return _listener
+
+
+def stop_schema_change_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.join()
+            _listener = None
+
+
+def ensure_schema_change_listener(**kwargs):
+    # Started lazily from requests, so forked workers get their own listener thread
+    start_schema_change_listener()
@@ -0,0 +1,321 @@
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.backends.utils import truncate_name
+from rest_framework import serializers
+
+from table.indexes import sync_table_indexes
+from table.locks import is_lock_timeout, run_with_lock_retries, schema_change_lock
+from table.partitions import validate_partition_field_kept
+from table.registry import get_table_model
+from table.schema import save_table_schema
+from table.schema_changes import (
+    ACCESS_EXCLUSIVE,
+    BACKFILL,
+    ROW_EXCLUSIVE,
+    SCAN,
+    SHARE_ROW_EXCLUSIVE,
+    SHARE_UPDATE_EXCLUSIVE,
+    diff_table_schema,
+    get_add_column_clauses,
+    get_locked_table_schema,
+    get_retype_expression,
+    get_schema_change_step,
+    normalize_table_fields,
+)
+from table.utils import create_field
+
+logger = logging.getLogger(__name__)
+
+
+class OnlineSchemaChange:
+    """
+    Changes the schema of a large table without blocking its reads and writes for long.
+
+    Every step that needs a table lock is metadata-only and runs with a short lock
+    timeout and retries. Retyped fields get shadow columns of the new type, which a
+    trigger keeps up to date while existing rows are backfilled in id range batches.
+    NOT NULL shadow columns are guarded by a `NOT VALID` check constraint validated
+    without blocking writes, so the final swap does not have to scan the table.
+    """
+
+    def __init__(self, table_object, model, old_table_fields, new_table_fields, progress=None):
+        self.table_object = table_object
+        self.model = model
+        self.progress = progress
+        self.new_table_fields = normalize_table_fields(new_table_fields)
+        self.schema_diff = diff_table_schema(old_table_fields, self.new_table_fields)
+        validate_partition_field_kept(table_object, self.schema_diff)
+
+        self.schema_editor = connection.schema_editor()
+        self.quote_name = self.schema_editor.quote_name
+        self.db_table = model._meta.db_table
+        self.table = self.quote_name(self.db_table)
+        self.trigger_name = truncate_name(
+            "{}_schema_change".format(self.db_table), connection.ops.max_name_length()
+        )
+
+    def get_shadow_column(self, field_name):
+        return truncate_name("{}__shadow".format(field_name), connection.ops.max_name_length())
+
+    def get_check_name(self, field_name):
+        return truncate_name(
+            "{}_{}_not_null".format(self.db_table, field_name), connection.ops.max_name_length()
+        )
+
+    def iter_retyped_fields(self):
+        """Yields `(old_field, new_field, model_field, shadow_column)` of every retyped field."""
+        for old_field, new_field in self.schema_diff['retyped']:
+            model_field = create_field(new_field['field_name'], new_field['field_type'])
+            yield (
+                old_field,
+                new_field,
+                model_field,
+                self.get_shadow_column(new_field['field_name'])
+            )
+
+    def get_add_shadow_columns_steps(self):
+        quote_name = self.quote_name
+
+        clauses, assignments = [], []
+        for old_field, new_field, model_field, shadow_column in self.iter_retyped_fields():
+            clauses.append("ADD COLUMN {} {} NULL".format(
+                quote_name(shadow_column), model_field.db_type(connection)
+            ))
+            if not model_field.null:
+                clauses.append("ADD CONSTRAINT {} CHECK ({} IS NOT NULL) NOT VALID".format(
+                    quote_name(self.get_check_name(new_field['field_name'])),
+                    quote_name(shadow_column)
+                ))
+
+            assignments.append("NEW.{} := {};".format(
+                quote_name(shadow_column),
+                get_retype_expression(
+                    old_field, new_field, "NEW.{}".format(quote_name(new_field['field_name']))
+                )
+            ))
+
+        return [
+            get_schema_change_step(
+                "ALTER TABLE {} {}".format(self.table, ', '.join(clauses)), ACCESS_EXCLUSIVE
+            ),
+            get_schema_change_step(
+                "CREATE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ "
+                "BEGIN {assignments} RETURN NEW; END $$".format(
+                    name=quote_name(self.trigger_name), assignments=' '.join(assignments)
+                ),
+                None
+            ),
+            get_schema_change_step(
+                "CREATE TRIGGER {name} BEFORE INSERT OR UPDATE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION {name}()".format(
+                    name=quote_name(self.trigger_name), table=self.table
+                ),
+                SHARE_ROW_EXCLUSIVE
+            ),
+        ]
+
+    def get_backfill_step(self):
+        """Returns the update of one id range, its bounds are the `%s` parameters."""
+        quote_name = self.quote_name
+        assignments = ', '.join(
+            "{} = {}".format(
+                quote_name(shadow_column),
+                get_retype_expression(old_field, new_field, quote_name(new_field['field_name']))
+            )
+            for old_field, new_field, _, shadow_column in self.iter_retyped_fields()
+        )
+
+        return get_schema_change_step(
+            "UPDATE {} SET {} WHERE id >= %s AND id < %s".format(self.table, assignments),
+            ROW_EXCLUSIVE,
+            BACKFILL
+        )
+
+    def get_validate_not_null_checks_steps(self):
+        return [
+            get_schema_change_step(
+                "ALTER TABLE {} VALIDATE CONSTRAINT {}".format(
+                    self.table, self.quote_name(self.get_check_name(new_field['field_name']))
+                ),
+                SHARE_UPDATE_EXCLUSIVE,
+                SCAN
+            )
+            for _, new_field, model_field, _ in self.iter_retyped_fields()
+            if not model_field.null
+        ]
+
+    def get_swap_steps(self):
+        quote_name = self.quote_name
+        retyped_fields = list(self.iter_retyped_fields())
+
+        steps = []
+        if retyped_fields:
+            steps.append(get_schema_change_step("DROP TRIGGER {} ON {}".format(
+                quote_name(self.trigger_name), self.table
+            ), ACCESS_EXCLUSIVE))
+            steps.append(get_schema_change_step(
+                "DROP FUNCTION {}()".format(quote_name(self.trigger_name)), None
+            ))
+
+        clauses, final_clauses = [], []
+        for field in self.schema_diff['removed']:
+            clauses.append("DROP COLUMN {}".format(quote_name(field['field_name'])))
+
+        for _, new_field, _, _ in retyped_fields:
+            clauses.append("DROP COLUMN {}".format(quote_name(new_field['field_name'])))
+
+        for field in self.schema_diff['added']:
+            add_clause, default_clause = get_add_column_clauses(self.schema_editor, field)
+            clauses.append(add_clause)
+            if default_clause:
+                final_clauses.append(default_clause)
+
+        if clauses:
+            steps.append(get_schema_change_step(
+                "ALTER TABLE {} {}".format(self.table, ', '.join(clauses)), ACCESS_EXCLUSIVE
+            ))
+
+        for _, new_field, model_field, shadow_column in retyped_fields:
+            steps.append(get_schema_change_step(
+                "ALTER TABLE {} RENAME COLUMN {} TO {}".format(
+                    self.table, quote_name(shadow_column), quote_name(new_field['field_name'])
+                ),
+                ACCESS_EXCLUSIVE
+            ))
+            if not model_field.null:
+                # The validated check constraint lets Postgres skip the table scan
+                final_clauses.append("ALTER COLUMN {} SET NOT NULL".format(
+                    quote_name(new_field['field_name'])
+                ))
+                final_clauses.append("DROP CONSTRAINT {}".format(
+                    quote_name(self.get_check_name(new_field['field_name']))
+                ))
+
+        if final_clauses:
+            steps.append(get_schema_change_step(
+                "ALTER TABLE {} {}".format(self.table, ', '.join(final_clauses)), ACCESS_EXCLUSIVE
+            ))
+
+        return steps
+
+    def get_steps(self):
+        """Returns every step of the change in the order it runs, except index rebuilds."""
+        steps = []
+        if self.schema_diff['retyped']:
+            steps.extend(self.get_add_shadow_columns_steps())
+            steps.append(self.get_backfill_step())
+            steps.extend(self.get_validate_not_null_checks_steps())
+
+        return steps + self.get_swap_steps()
+
+    def add_shadow_columns(self, cursor):
+        for step in self.get_add_shadow_columns_steps():
+            cursor.execute(step['sql'])
+
+    def drop_shadow_columns(self, cursor):
+        quote_name = self.quote_name
+        cursor.execute("DROP TRIGGER IF EXISTS {} ON {}".format(
+            quote_name(self.trigger_name), self.table
+        ))
+        cursor.execute("DROP FUNCTION IF EXISTS {}()".format(quote_name(self.trigger_name)))
+        cursor.execute("ALTER TABLE {} {}".format(self.table, ', '.join(
+            "DROP COLUMN IF EXISTS {}".format(quote_name(shadow_column))
+            for _, _, _, shadow_column in self.iter_retyped_fields()
+        )))
+
+    def backfill_shadow_columns(self):
+        """
+        Fills shadow columns of existing rows, one id range per transaction.
+        `progress(done=, total=)` is called after every range with the number of ids covered.
+        """
+        batch_size = getattr(settings, 'TABLE_ROWS_BATCH_SIZE', 1000)
+        backfill_sql = self.get_backfill_step()['sql']
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT min(id), max(id) FROM {}".format(self.table))
+            min_id, max_id = cursor.fetchone()
+
+        if min_id is None:
+            return
+
+        for start in range(min_id, max_id + 1, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(backfill_sql, [start, start + batch_size])
+
+            if self.progress is not None:
+                self.progress(
+                    done=min(start + batch_size, max_id + 1) - min_id, total=max_id + 1 - min_id
+                )
+
+    def validate_not_null_checks(self, cursor):
+        for step in self.get_validate_not_null_checks_steps():
+            cursor.execute(step['sql'])
+
+    def swap(self, cursor):
+        """Applies the remaining metadata-only changes and stores the new schema at once."""
+        for step in self.get_swap_steps():
+            cursor.execute(step['sql'])
+
+        save_table_schema(self.table_object, self.new_table_fields)
+
+    def run(self):
+        has_shadow_columns = False
+
+        try:
+            if self.schema_diff['retyped']:
+                run_with_lock_retries(self.add_shadow_columns)
+                has_shadow_columns = True
+                self.backfill_shadow_columns()
+                run_with_lock_retries(self.validate_not_null_checks)
+
+            run_with_lock_retries(self.swap)
+        except Exception as exc:
+            if has_shadow_columns:
+                try:
+                    run_with_lock_retries(self.drop_shadow_columns)
+                except DatabaseError:
+                    # The error which stopped the change is the one reported
+                    logger.exception(
+                        "Could not remove shadow columns of table %s.", self.table_object.table_name
+                    )
+
+            if not isinstance(exc, DatabaseError):
+                raise
+
+            if is_lock_timeout(exc):
+                raise serializers.ValidationError(
+                    "Table {} is busy, its structure was not changed.".format(
+                        self.table_object.table_name
+                    )
+                ) from exc
+
+            raise serializers.ValidationError(
+                "Could not change table structure: {}".format(str(exc).strip())
+            ) from exc
+
+        sync_table_indexes(
+            self.table_object,
+            get_table_model(
+                self.table_object, self.table_object.table_fields, self.table_object.schema_version
+            ),
+            self.table_object.table_fields,
+            concurrently=not connection.in_atomic_block
+        )
+
+
+def apply_table_schema_change_online(table_object, new_table_fields, progress=None):
+    """
+    Changes the table to `new_table_fields` in short steps which keep the table available.
+    Indexes dropped together with retyped columns are re-built concurrently at the end.
+    `progress` is called during the backfill of retyped fields.
+    """
+    with schema_change_lock(table_object):
+        model, old_table_fields = get_locked_table_schema(table_object)
+        if normalize_table_fields(new_table_fields) == normalize_table_fields(old_table_fields):
+            return
+
+        OnlineSchemaChange(
+            table_object, model, old_table_fields, new_table_fields, progress
+        ).run()
@@ -0,0 +1,65 @@
+import base64
+import binascii
+
+from django.conf import settings
+from rest_framework import serializers
+
+AFTER_QUERY_PARAM = 'after'
+LIMIT_QUERY_PARAM = 'limit'
+
+
+def encode_cursor(row_id):
+    return base64.urlsafe_b64encode(str(row_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        row_id = int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        row_id = -1
+
+    if row_id < 0:
+        raise serializers.ValidationError({AFTER_QUERY_PARAM: ["Invalid cursor."]})
+
+    return row_id
+
+
+def get_page_params(query_params):
+    """Returns the id rows should follow and the page size requested by the client."""
+    max_page_size = getattr(settings, 'TABLE_ROWS_MAX_PAGE_SIZE', 1000)
+
+    after = query_params.get(AFTER_QUERY_PARAM)
+    after = decode_cursor(after) if after else None
+
+    limit = query_params.get(LIMIT_QUERY_PARAM)
+    if not limit:
+        return after, min(getattr(settings, 'TABLE_ROWS_PAGE_SIZE', 100), max_page_size)
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+
+    if limit < 1:
+        raise serializers.ValidationError({
+            LIMIT_QUERY_PARAM: ["Limit must be a positive integer."]
+        })
+
+    return after, min(limit, max_page_size)
+
+
+def get_page_headers(request, next_row_id):
+    """Builds headers pointing to the next page, if there is one."""
+    if next_row_id is None:
+        return {}
+
+    cursor = encode_cursor(next_row_id)
+    query_params = request.query_params.copy()
+    query_params[AFTER_QUERY_PARAM] = cursor
+
+    return {
+        'X-Next-Cursor': cursor,
+        'Link': '<{}>; rel="next"'.format(
+            request.build_absolute_uri('?' + query_params.urlencode())
+        ),
+    }
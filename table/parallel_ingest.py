@@ -0,0 +1,194 @@
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+from table.ingest import (
+    CSV_INPUT,
+    MAX_REPORTED_ERRORS,
+    create_ingest_report,
+    get_copy_chunk_size,
+    iter_input_rows,
+    load_input_rows,
+    set_ingest_throughput,
+)
+from table.staging import create_staging_table, drop_staging_table, swap_staging_table
+from table.validators import compile_row_validator
+
+
+def split_input_file(input_file, chunk_size, start=0):
+    """Returns `(start, end)` byte ranges of about `chunk_size` bytes, each ending on a line boundary."""
+    size = os.fstat(input_file.fileno()).st_size
+
+    byte_ranges = []
+    while start < size:
+        end = start + chunk_size
+        if end < size:
+            input_file.seek(end - 1)
+            input_file.readline()
+            end = input_file.tell()
+        else:
+            end = size
+
+        byte_ranges.append((start, end))
+        start = end
+
+    return byte_ranges
+
+
+def iter_file_range(path, start, end):
+    with open(path, 'rb') as input_file:
+        input_file.seek(start)
+        while start < end:
+            line = input_file.readline()
+            if not line:
+                break
+
+            start += len(line)
+            yield line
+
+
+def ingest_file_range(table_object, table_fields, db_table, path, byte_range, input_format, header,
+                      chunk_size, track_data_version):
+    """
+    Loads one byte range of the input file; runs in a worker process on its own connection.
+    Line numbers of the returned report are relative to the start of the range.
+    """
+    lines_read = 0
+
+    def iter_range_lines():
+        nonlocal lines_read
+        for line in iter_file_range(path, *byte_range):
+            lines_read += 1
+            yield line
+
+    byte_lines = iter_range_lines()
+    if header is not None:
+        byte_lines = itertools.chain([header], byte_lines)
+
+    report = load_input_rows(
+        db_table,
+        compile_row_validator(table_fields),
+        iter_input_rows(byte_lines, input_format),
+        create_ingest_report(),
+        chunk_size,
+        table_object if track_data_version else None
+    )
+    if header is not None:
+        for error in report['errors']:
+            error['line'] -= 1
+
+    report['lines_read'] = lines_read
+    return report
+
+
+def merge_range_reports(range_reports, first_line_number):
+    """Sums reports of consecutive byte ranges, turning relative line numbers into file ones."""
+    report = create_ingest_report()
+
+    line_offset = first_line_number - 1
+    for range_report in range_reports:
+        report['rows_loaded'] += range_report['rows_loaded']
+        report['rows_rejected'] += range_report['rows_rejected']
+        for error in range_report['errors']:
+            if len(report['errors']) < MAX_REPORTED_ERRORS:
+                report['errors'].append(dict(error, line=error['line'] + line_offset))
+
+        line_offset += range_report['lines_read']
+
+    return report
+
+
+def run_range_tasks(tasks, workers, progress=None):
+    """
+    Runs the range tasks and returns their reports in order. `progress(done=, total=)` is
+    called in this process whenever a task finishes; an error it raises stops the import.
+    """
+    def report_progress(done):
+        if progress is not None:
+            progress(done=done, total=len(tasks))
+
+    if workers == 1 or len(tasks) <= 1:
+        range_reports = []
+        for task in tasks:
+            range_reports.append(ingest_file_range(*task))
+            report_progress(len(range_reports))
+
+        return range_reports
+
+    # Forked workers open their own connections instead of sharing the parent's one
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=multiprocessing.get_context('fork')
+    ) as executor:
+        futures = [executor.submit(ingest_file_range, *task) for task in tasks]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                report_progress(done)
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+        return [future.result() for future in futures]
+
+
+def import_table_file(table_object, model, table_fields, path, input_format, workers=None,
+                      chunk_size=None, staging=False, progress=None):
+    """
+    Loads a large CSV or NDJSON file with a pool of worker processes, each validating and
+    copying line aligned byte ranges of the file. Quoted CSV values must not span lines.
+    `progress` is called with the number of loaded byte ranges, see `run_range_tasks`.
+
+    Without `staging` every loaded chunk is committed to the table right away. With it rows
+    are loaded into a staging table which replaces the table only once the whole file is in;
+    partitioned tables can not be replaced that way.
+    """
+    if staging and table_object.partitioning:
+        raise serializers.ValidationError(
+            "Staging imports are not supported for partitioned tables."
+        )
+
+    started = time.perf_counter()
+    workers = workers or os.cpu_count()
+    chunk_size = chunk_size or getattr(settings, 'TABLE_IMPORT_CHUNK_BYTES', 64 * 1024 * 1024)
+
+    with open(path, 'rb') as input_file:
+        header = input_file.readline() if input_format == CSV_INPUT else None
+        byte_ranges = split_input_file(input_file, chunk_size, start=input_file.tell())
+
+    db_table = create_staging_table(model) if staging else model._meta.db_table
+    tasks = [
+        (
+            table_object,
+            table_fields,
+            db_table,
+            path,
+            byte_range,
+            input_format,
+            header,
+            get_copy_chunk_size(),
+            not staging
+        )
+        for byte_range in byte_ranges
+    ]
+
+    try:
+        range_reports = run_range_tasks(tasks, workers, progress)
+        if staging:
+            swap_staging_table(table_object, model, table_fields, db_table)
+    except BaseException:
+        if staging:
+            drop_staging_table(db_table)
+        raise
+
+    report = merge_range_reports(range_reports, 2 if header is not None else 1)
+    set_ingest_throughput(report, started)
+
+    return report
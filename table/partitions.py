@@ -0,0 +1,263 @@
+import functools
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.utils import truncate_name
+from rest_framework import serializers
+
+from table.locks import run_on_unlocked_tables, run_with_lock_retries
+from table.models import TableName
+from table.registry import get_table_model
+from table.schema import bump_data_version, get_table_schema
+
+RANGE = 'range'
+HASH = 'hash'
+PARTITION_METHODS = (RANGE, HASH)
+DEFAULT_PARTITION_SUFFIX = 'default'
+RANGE_BOUND_PATTERN = re.compile(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)")
+
+
+def get_partition_name(db_table, suffix):
+    return truncate_name("{}_{}".format(db_table, suffix), connection.ops.max_name_length())
+
+
+def get_range_partition_suffix(bucket):
+    # Buckets below zero hold negative values of a number partition field
+    return 'p{}'.format(bucket) if bucket >= 0 else 'm{}'.format(-bucket)
+
+
+def get_range_bounds(partitioning, bucket):
+    return bucket * partitioning['interval'], (bucket + 1) * partitioning['interval']
+
+
+def get_partition_names(cursor, db_table):
+    cursor.execute("""
+        SELECT
+            c.relname
+        FROM
+            pg_inherits i
+        JOIN
+            pg_class c ON c.oid = i.inhrelid
+        WHERE
+            i.inhparent = to_regclass(%s);
+    """, [connection.ops.quote_name(db_table)])
+    return [row[0] for row in cursor.fetchall()]
+
+
+def create_partitioned_table(model, partitioning):
+    """
+    Creates the table partitioned by `partitioning['field']` together with its hash
+    partitions, or with the default partition catching rows of missing range partitions.
+    Postgres requires unique indexes to contain the partition field, so the id is the
+    primary key only when the table is partitioned by id and is just indexed otherwise.
+    """
+    schema_editor = connection.schema_editor()
+    quote_name = schema_editor.quote_name
+    db_table = model._meta.db_table
+    table = quote_name(db_table)
+    partition_field = partitioning['field']
+
+    columns = []
+    for field in model._meta.local_fields:
+        if field.primary_key:
+            columns.append("{} {} GENERATED BY DEFAULT AS IDENTITY NOT NULL".format(
+                quote_name(field.column), field.db_type(connection)
+            ))
+        else:
+            definition, _ = schema_editor.column_sql(model, field)
+            columns.append("{} {}".format(quote_name(field.column), definition))
+
+    if partition_field == 'id':
+        columns.append("PRIMARY KEY ({})".format(quote_name('id')))
+
+    statements = ["CREATE TABLE {} ({}) PARTITION BY {} ({})".format(
+        table, ', '.join(columns), partitioning['method'].upper(), quote_name(partition_field)
+    )]
+    if partition_field != 'id':
+        statements.append("CREATE INDEX {} ON {} ({})".format(
+            quote_name(get_partition_name(db_table, 'id_idx')), table, quote_name('id')
+        ))
+
+    if partitioning['method'] == HASH:
+        for remainder in range(partitioning['partitions']):
+            statements.append(
+                "CREATE TABLE {} PARTITION OF {} FOR VALUES WITH (MODULUS {}, REMAINDER {})".format(
+                    quote_name(get_partition_name(db_table, 'h{}'.format(remainder))),
+                    table,
+                    partitioning['partitions'],
+                    remainder
+                )
+            )
+    else:
+        statements.append("CREATE TABLE {} PARTITION OF {} DEFAULT".format(
+            quote_name(get_partition_name(db_table, DEFAULT_PARTITION_SUFFIX)), table
+        ))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def create_range_partition(cursor, model, partitioning, bucket):
+    """
+    Creates the range partition of one bucket. Rows of the bucket which went to the default
+    partition are moved into it before it is attached, Postgres refuses it otherwise.
+    Attaching locks only the default partition, the table stays readable and writable.
+    """
+    quote_name = connection.ops.quote_name
+    db_table = model._meta.db_table
+    table = quote_name(db_table)
+    partition = quote_name(get_partition_name(db_table, get_range_partition_suffix(bucket)))
+    column = quote_name(partitioning['field'])
+    columns = ', '.join(quote_name(field.column) for field in model._meta.local_fields)
+    lower, upper = get_range_bounds(partitioning, bucket)
+
+    cursor.execute("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS)".format(partition, table))
+    cursor.execute(
+        "WITH moved AS ("
+        "DELETE FROM {default} WHERE {column} >= %s AND {column} < %s RETURNING {columns}"
+        ") INSERT INTO {partition} ({columns}) SELECT {columns} FROM moved".format(
+            default=quote_name(get_partition_name(db_table, DEFAULT_PARTITION_SUFFIX)),
+            column=column,
+            columns=columns,
+            partition=partition
+        ),
+        [lower, upper]
+    )
+    cursor.execute(
+        "ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)".format(table, partition),
+        [lower, upper]
+    )
+
+
+def get_missing_range_buckets(cursor, table_object, model):
+    quote_name = connection.ops.quote_name
+    db_table = model._meta.db_table
+    partitioning = table_object.partitioning
+    column = quote_name(partitioning['field'])
+
+    cursor.execute(
+        "SELECT DISTINCT floor({column}::numeric / %s)::bigint FROM {default} "
+        "WHERE {column} IS NOT NULL".format(
+            column=column,
+            default=quote_name(get_partition_name(db_table, DEFAULT_PARTITION_SUFFIX))
+        ),
+        [partitioning['interval']]
+    )
+    buckets = set(row[0] for row in cursor.fetchall())
+
+    if partitioning['field'] == 'id':
+        cursor.execute("SELECT coalesce(max(id), 0) FROM {}".format(quote_name(db_table)))
+        last_bucket = cursor.fetchone()[0] // partitioning['interval']
+        buckets.update(range(
+            last_bucket, last_bucket + getattr(settings, 'TABLE_PARTITIONS_AHEAD', 2) + 1
+        ))
+
+    existing_partitions = set(get_partition_names(cursor, db_table))
+    return sorted(
+        bucket for bucket in buckets
+        if get_partition_name(db_table, get_range_partition_suffix(bucket)) not in existing_partitions
+    )
+
+
+def ensure_table_partitions(table_object, model):
+    """
+    Creates range partitions for rows which went to the default partition and, for tables
+    partitioned by id, `TABLE_PARTITIONS_AHEAD` partitions past the last id, so rows keep
+    going to their own partitions as the table grows. Returns names of created partitions.
+    """
+    if table_object.partitioning.get('method') != RANGE:
+        return []
+
+    with connection.cursor() as cursor:
+        buckets = get_missing_range_buckets(cursor, table_object, model)
+
+    for bucket in buckets:
+        run_with_lock_retries(functools.partial(
+            create_range_partition, model=model, partitioning=table_object.partitioning,
+            bucket=bucket
+        ))
+
+    return [
+        get_partition_name(model._meta.db_table, get_range_partition_suffix(bucket))
+        for bucket in buckets
+    ]
+
+
+def maintain_table_partitions():
+    """Ensures partitions of every range partitioned table whose schema is not being changed."""
+    return run_on_unlocked_tables(
+        TableName.objects.filter(partitioning__method=RANGE).order_by('id'),
+        lambda table_object: ensure_table_partitions(
+            table_object,
+            get_table_model(
+                table_object, get_table_schema(table_object), table_object.schema_version
+            )
+        )
+    )
+
+
+def get_table_partitions(model):
+    """Returns partitions of the table with their bounds and size, range partitions in order."""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                c.relname,
+                pg_get_expr(c.relpartbound, c.oid),
+                CASE WHEN c.reltuples >= 0 THEN c.reltuples ELSE coalesce(s.n_live_tup, 0) END,
+                pg_total_relation_size(c.oid)
+            FROM
+                pg_inherits i
+            JOIN
+                pg_class c ON c.oid = i.inhrelid
+            LEFT JOIN
+                pg_stat_user_tables s ON s.relid = c.oid
+            WHERE
+                i.inhparent = to_regclass(%s)
+            ORDER BY
+                c.relname;
+        """, [connection.ops.quote_name(model._meta.db_table)])
+        result = cursor.fetchall()
+
+    partitions = []
+    for partition_name, bound, row_count_estimate, total_size in result:
+        range_bound = RANGE_BOUND_PATTERN.search(bound)
+        partitions.append({
+            "partition_name": partition_name,
+            "bound": bound,
+            "lower_bound": int(range_bound.group(1)) if range_bound else None,
+            "upper_bound": int(range_bound.group(2)) if range_bound else None,
+            "row_count_estimate": int(row_count_estimate),
+            "total_size_bytes": total_size,
+        })
+
+    return sorted(partitions, key=lambda partition: (
+        partition['lower_bound'] is None, partition['lower_bound'] or 0
+    ))
+
+
+def drop_table_partition(table_object, partition):
+    """Drops all rows of a range partition at once, without deleting them one by one."""
+    if partition['lower_bound'] is None:
+        raise serializers.ValidationError(
+            "Only range partitions can be dropped, {} is not one.".format(
+                partition['partition_name']
+            )
+        )
+
+    run_with_lock_retries(lambda cursor: cursor.execute(
+        "DROP TABLE {}".format(connection.ops.quote_name(partition['partition_name']))
+    ))
+    bump_data_version(table_object)
+
+
+def validate_partition_field_kept(table_object, schema_diff):
+    partition_field = table_object.partitioning.get('field')
+    changed_field_names = [field['field_name'] for field in schema_diff['removed']] + [
+        new_field['field_name'] for _, new_field in schema_diff['retyped']
+    ]
+    if partition_field in changed_field_names:
+        raise serializers.ValidationError(
+            "Partition field {} can not be removed or retyped.".format(partition_field)
+        )
@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.dispatch import receiver
+
+from table import models as table_models
+from table.signals import table_schema_changed
+from table.utils import create_model
+
+
+class VersionedRegistry:
+    """
+    Size bounded LRU registry that keeps one schema-derived object per table id
+    together with the schema version it was built for.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, version, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+            if entry is not None:
+                self._discard(key)
+
+            value = build()
+            self._entries[key] = (version, value)
+
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+            return value
+
+    def invalidate(self, key, version=None):
+        """Drops cached entry of the key unless it is already built for `version` or a newer one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+
+            if version is not None and isinstance(entry[0], int) and entry[0] >= version:
+                return
+
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key):
+        version, value = self._entries.pop(key)
+        self.on_evict(key, value)
+
+    def on_evict(self, key, value):
+        pass
+
+
+class ModelRegistry(VersionedRegistry):
+    """Keeps compiled dynamic model classes and unregisters evicted ones from the app registry."""
+
+    def on_evict(self, key, value):
+        unregister_dynamic_model(value._meta.model_name, model=value)
+
+
+def unregister_dynamic_model(model_name, model=None):
+    """Removes dynamic model class from the app registry, leaving the app's own models untouched."""
+    app_models = apps.all_models['table']
+    registered_model = app_models.get(model_name)
+    if registered_model is None or (model is not None and registered_model is not model):
+        return
+
+    if getattr(table_models, registered_model.__name__, None) is registered_model:
+        return
+
+    # apps.clear_cache() would expire the cached _meta of every registered model,
+    # while the evicted model has no relations to other models
+    del app_models[model_name]
+    apps.get_models.cache_clear()
+    registered_model._meta._expire_cache()
+
+
+def schema_fingerprint(table_fields):
+    return tuple(
+        (field['field_name'], field['field_type']) for field in table_fields
+    )
+
+
+model_registry = ModelRegistry(
+    getattr(settings, 'TABLE_MODEL_REGISTRY_SIZE', 1024)
+)
+
+
+def get_table_model(table_object, table_fields, schema_version=None):
+    """
+    Returns dynamic model class of the table, building it only when
+    the table schema has changed since the last call.
+    """
+    if schema_version is None:
+        schema_version = schema_fingerprint(table_fields)
+
+    def build():
+        # Classes built outside of the registry would trigger re-registration warnings
+        unregister_dynamic_model(table_object.table_name.lower())
+
+        return create_model(
+            table_object.table_name,
+            fields=table_fields,
+            app_label='table',
+            module='table.models'
+        )
+
+    return model_registry.get(table_object.pk, schema_version, build)
+
+
+@receiver(table_schema_changed, dispatch_uid='model_registry_invalidation')
+def invalidate_table_model(sender, table_id, schema_version, **kwargs):
+    model_registry.invalidate(table_id, schema_version)
@@ -0,0 +1,96 @@
+import time
+
+from django.db.models import Q
+from rest_framework import serializers
+
+from table.bulk import delete_rows_in_batches
+from table.locks import run_on_unlocked_tables
+from table.models import TableName
+from table.partitions import RANGE, drop_table_partition, get_table_partitions
+from table.registry import get_table_model
+from table.schema import get_table_schema
+
+
+def validate_retention_rule(table_fields, retention):
+    """Age based retention needs a number field holding Unix timestamps in seconds."""
+    if 'max_age_seconds' not in retention:
+        return
+
+    if not any(
+        field['field_name'] == retention['field'] and field['field_type'] == 'NUMBER'
+        for field in table_fields
+    ):
+        raise serializers.ValidationError(
+            "Retention field {} must be a number field.".format(retention['field'])
+        )
+
+
+def get_expired_bounds(table_object, model, table_fields):
+    """
+    Returns `(field, bound)` pairs of the retention rules: rows whose field is below the bound
+    are expired. Rows past `max_rows` are told apart by their id, which grows with every row.
+    """
+    retention = table_object.retention
+    validate_retention_rule(table_fields, retention)
+
+    expired_bounds = []
+    if 'max_rows' in retention:
+        oldest_kept_id = model.objects.order_by('-pk').values_list('pk', flat=True)[
+            retention['max_rows'] - 1:retention['max_rows']
+        ].first()
+        if oldest_kept_id is not None:
+            expired_bounds.append(('id', oldest_kept_id))
+
+    if 'max_age_seconds' in retention:
+        expired_bounds.append(
+            (retention['field'], int(time.time()) - retention['max_age_seconds'])
+        )
+
+    return expired_bounds
+
+
+def purge_table_rows(table_object, model, table_fields, progress=None):
+    """
+    Removes rows expired by the retention rules of the table. Tables range partitioned on the
+    field of a rule drop whole partitions once all their rows expired, rows of the partition
+    holding the bound are kept until it expires. Other tables delete expired rows in id
+    ordered batches, so no single statement holds locks on or logs every expired row.
+    `progress` is called with the number of deleted rows after each batch.
+    """
+    partitioning = table_object.partitioning
+    rows_deleted, dropped_partitions = 0, []
+
+    def report_progress(done):
+        if progress is not None:
+            progress(done=rows_deleted + done)
+
+    for field_name, bound in get_expired_bounds(table_object, model, table_fields):
+        if partitioning.get('method') == RANGE and partitioning['field'] == field_name:
+            for partition in get_table_partitions(model):
+                if partition['upper_bound'] is not None and partition['upper_bound'] <= bound:
+                    drop_table_partition(table_object, partition)
+                    dropped_partitions.append(partition['partition_name'])
+            continue
+
+        deleted, _ = delete_rows_in_batches(
+            table_object, model, Q(**{'{}__lt'.format(field_name): bound}), report_progress
+        )
+        rows_deleted += deleted
+
+    return {
+        "rows_deleted": rows_deleted,
+        "partitions_dropped": dropped_partitions,
+    }
+
+
+def purge_expired_rows(table_object):
+    table_fields = get_table_schema(table_object)
+    model = get_table_model(table_object, table_fields, table_object.schema_version)
+    return purge_table_rows(table_object, model, table_fields)
+
+
+def enforce_table_retention():
+    """Purges expired rows of every table with retention rules whose schema is not being changed."""
+    return run_on_unlocked_tables(
+        TableName.objects.exclude(retention={}).order_by('id'), purge_expired_rows
+    )
@@ -0,0 +1,96 @@
+import ujson
+from django.db import connection
+
+from table.enums import AllowedFieldTypes
+
+JSON_DUMPS_OPTIONS = {
+    'ensure_ascii': False,
+    'escape_forward_slashes': False,
+}
+
+FIELD_CONVERTERS = {
+    AllowedFieldTypes.STRING.name: str,
+    AllowedFieldTypes.NUMBER.name: int,
+    AllowedFieldTypes.BOOLEAN.name: bool,
+}
+
+
+def get_row_field_names(table_fields):
+    """Column order of serialized rows: the primary key followed by the table schema fields."""
+    return ['id'] + [field['field_name'] for field in table_fields]
+
+
+def fetch_table_rows(model, field_names, after=None, limit=None, row_filter=None):
+    """Fetches row tuples straight from the cursor, skipping model instantiation."""
+    table_rows = model.objects.order_by('id').values_list(*field_names)
+    if row_filter:
+        table_rows = table_rows.filter(row_filter)
+    if after is not None:
+        table_rows = table_rows.filter(id__gt=after)
+    if limit is not None:
+        table_rows = table_rows[:limit]
+
+    return list(table_rows)
+
+
+def build_row_converter(table_fields):
+    """
+    Returns a function turning a row tuple into a dict.
+    The driver already returns native types, so only columns it may return
+    as something else (e.g. Decimal for NUMBER) are converted.
+    """
+    field_names = get_row_field_names(table_fields)
+    converters = [
+        (index + 1, FIELD_CONVERTERS[field['field_type']])
+        for index, field in enumerate(table_fields)
+        if field['field_type'] == AllowedFieldTypes.NUMBER.name
+    ]
+
+    if not converters:
+        return lambda table_row: dict(zip(field_names, table_row))
+
+    def convert(table_row):
+        table_row = list(table_row)
+        for index, converter in converters:
+            value = table_row[index]
+            if value is not None and type(value) is not int:
+                table_row[index] = converter(value)
+        return dict(zip(field_names, table_row))
+
+    return convert
+
+
+def encode_table_rows(table_fields, table_rows):
+    convert = build_row_converter(table_fields)
+    return ujson.dumps(
+        [convert(table_row) for table_row in table_rows],
+        **JSON_DUMPS_OPTIONS
+    ).encode()
+
+
+# Postgres accepts at most 65535 bind parameters per statement
+MAX_QUERY_PARAMS = 65535
+
+
+def get_insert_batch_size(field_names, batch_size):
+    return max(1, min(batch_size, MAX_QUERY_PARAMS // max(1, len(field_names))))
+
+
+def insert_table_rows(db_table, field_names, rows_values):
+    """
+    Inserts rows with one multi-row `INSERT ... VALUES` statement and returns their ids
+    in the order of `rows_values`. Callers are responsible for batching and transactions.
+    """
+    quote_name = connection.ops.quote_name
+    row_placeholder = '({})'.format(', '.join(['%s'] * len(field_names)))
+
+    sql = "INSERT INTO {table} ({columns}) VALUES {values} RETURNING {pk}".format(
+        table=quote_name(db_table),
+        columns=', '.join(quote_name(field_name) for field_name in field_names),
+        values=', '.join([row_placeholder] * len(rows_values)),
+        pk=quote_name('id')
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for row_values in rows_values for value in row_values])
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,154 @@
+import functools
+import threading
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.http import parse_etags
+
+from table.cache import invalidate_table_rows_cache
+from table.enums import AllowedFieldTypes
+from table.models import TableName
+from table.notifications import publish_schema_change
+from table.utils import get_table_fields
+
+CATALOG_FIELD_TYPES = {
+    'character varying': AllowedFieldTypes.STRING.name,
+    'bigint': AllowedFieldTypes.NUMBER.name,
+    'integer': AllowedFieldTypes.NUMBER.name,
+    'boolean': AllowedFieldTypes.BOOLEAN.name,
+}
+
+
+def normalize_field_type(field_type):
+    if field_type in CATALOG_FIELD_TYPES:
+        return CATALOG_FIELD_TYPES[field_type]
+
+    return field_type.upper()
+
+
+def get_table_schema(table_object):
+    """
+    Returns the stored field list of the table.
+    Tables created before the schema was persisted are backfilled from the catalog once.
+    """
+    if table_object.table_fields:
+        return table_object.table_fields
+
+    result = get_table_fields(table_object.table_name)
+
+    table_fields = []
+    for field_name, field_type in result:
+        if field_name == 'id':
+            continue
+
+        table_fields.append({
+            "field_name": field_name,
+            "field_type": normalize_field_type(field_type)
+        })
+
+    if table_fields:
+        save_table_schema(table_object, table_fields)
+
+    return table_fields
+
+
+def save_table_schema(table_object, table_fields):
+    """Stores the new field list of the table and bumps its schema version."""
+    table_fields = [
+        {
+            "field_name": field['field_name'],
+            "field_type": normalize_field_type(field['field_type'])
+        }
+        for field in table_fields
+    ]
+
+    TableName.objects.filter(pk=table_object.pk).update(
+        table_fields=table_fields,
+        schema_version=F('schema_version') + 1,
+        data_version=F('data_version') + 1
+    )
+    table_object.refresh_from_db(fields=['table_fields', 'schema_version', 'data_version'])
+
+    publish_schema_change(table_object.pk, table_object.schema_version)
+
+
+# Per thread and connection, the tables bumped by the open transaction with the `xmin`
+# row version their bump wrote to the TableName row
+bumped_row_versions = threading.local()
+
+
+def get_bumped_row_versions():
+    versions = getattr(bumped_row_versions, connection.alias, None)
+    if versions is None:
+        versions = {}
+        setattr(bumped_row_versions, connection.alias, versions)
+
+    return versions
+
+
+def finish_data_version_bump(table_id):
+    get_bumped_row_versions().pop(table_id, None)
+    invalidate_table_rows_cache(table_id)
+
+
+def is_data_version_bumped(table_object):
+    """
+    Tells whether the data version of the table was already bumped in the current
+    transaction. A bump remembers the row version it wrote until the transaction commits or
+    the version is read. Rolling the bump back brings back another row version, so the table
+    is bumped again.
+    """
+    row_version = get_bumped_row_versions().get(table_object.pk)
+    if row_version is None or not connection.in_atomic_block:
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT xmin::text FROM {} WHERE id = %s".format(TableName._meta.db_table),
+            [table_object.pk]
+        )
+        row = cursor.fetchone()
+
+    return row is not None and row[0] == row_version
+
+
+def bump_data_version(table_object):
+    """
+    Marks table rows as changed, so cached representations of them become stale.
+    The version is bumped once per transaction, so writes of one transaction lock the
+    table row only once.
+    """
+    if is_data_version_bumped(table_object):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE {} SET data_version = data_version + 1 WHERE id = %s RETURNING xmin::text"
+            .format(TableName._meta.db_table),
+            [table_object.pk]
+        )
+        row = cursor.fetchone()
+
+    if row is not None and connection.in_atomic_block:
+        get_bumped_row_versions()[table_object.pk] = row[0]
+    transaction.on_commit(functools.partial(finish_data_version_bump, table_object.pk))
+
+
+def get_table_etag(table_object):
+    """
+    Returns the ETag of the table rows. Once its data version is handed out, the next write
+    of the transaction has to bump it again, or the rows it reads back would look unchanged.
+    """
+    get_bumped_row_versions().pop(table_object.pk, None)
+    return '"{}-{}-{}"'.format(
+        table_object.pk, table_object.schema_version, table_object.data_version
+    )
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag in etags or 'W/' + etag in etags
@@ -0,0 +1,240 @@
+from django.db import DatabaseError, connection, transaction
+from rest_framework import serializers
+
+from table.enums import AllowedFieldTypes
+from table.filters import FILTER_SEPARATOR
+from table.indexes import get_drop_index_sql, sync_table_indexes
+from table.locks import schema_change_lock
+from table.partitions import validate_partition_field_kept
+from table.registry import get_table_model
+from table.schema import get_table_schema, normalize_field_type, save_table_schema
+from table.utils import create_field
+
+STRING = AllowedFieldTypes.STRING.name
+NUMBER = AllowedFieldTypes.NUMBER.name
+BOOLEAN = AllowedFieldTypes.BOOLEAN.name
+
+# Table locks taken by schema change steps
+ROW_EXCLUSIVE = 'ROW EXCLUSIVE'
+SHARE_UPDATE_EXCLUSIVE = 'SHARE UPDATE EXCLUSIVE'
+SHARE = 'SHARE'
+SHARE_ROW_EXCLUSIVE = 'SHARE ROW EXCLUSIVE'
+ACCESS_EXCLUSIVE = 'ACCESS EXCLUSIVE'
+
+# What a schema change step does to the existing rows
+METADATA = 'metadata'
+SCAN = 'scan'
+REWRITE = 'rewrite'
+BACKFILL = 'backfill'
+INDEX_BUILD = 'index_build'
+
+# Text stored for missing numbers retyped to STRING, which is NOT NULL and must not be blank
+NULL_NUMBER_STRING = 'null'
+
+# Conversions of existing values when a field changes its type. Values which can not
+# be converted become NULL for NUMBER fields, while STRING and BOOLEAN fields are NOT NULL.
+RETYPE_USING = {
+    (STRING, NUMBER): (
+        "CASE WHEN {column} ~ '^\\s*[-+]?\\d+\\s*$' THEN "
+        "CASE WHEN {column}::numeric BETWEEN -2147483648 AND 2147483647 THEN {column}::integer END "
+        "END"
+    ),
+    (STRING, BOOLEAN): "lower(trim({column})) IN ('true', 't', 'yes', 'y', 'on', '1')",
+    (NUMBER, STRING): "COALESCE({{column}}::varchar, '{}')".format(NULL_NUMBER_STRING),
+    (NUMBER, BOOLEAN): "COALESCE({column} <> 0, false)",
+    (BOOLEAN, STRING): "{column}::varchar",
+    (BOOLEAN, NUMBER): "{column}::integer",
+}
+
+
+def normalize_table_fields(table_fields):
+    return [
+        {
+            "field_name": field['field_name'],
+            "field_type": normalize_field_type(field['field_type'])
+        }
+        for field in table_fields
+    ]
+
+
+def diff_table_schema(old_table_fields, new_table_fields):
+    """
+    Compares two field lists by field name. Returns `added`, `removed` and `unchanged`
+    fields and `retyped` `(old_field, new_field)` pairs.
+    """
+    old_fields = {field['field_name']: field for field in normalize_table_fields(old_table_fields)}
+    new_fields = {field['field_name']: field for field in normalize_table_fields(new_table_fields)}
+
+    schema_diff = {
+        "added": [],
+        "removed": [field for name, field in old_fields.items() if name not in new_fields],
+        "retyped": [],
+        "unchanged": [],
+    }
+    for name, field in new_fields.items():
+        if name not in old_fields:
+            schema_diff["added"].append(field)
+        elif old_fields[name]['field_type'] != field['field_type']:
+            schema_diff["retyped"].append((old_fields[name], field))
+        else:
+            schema_diff["unchanged"].append(field)
+
+    return schema_diff
+
+
+def get_index_field_names(index_definition):
+    """Returns fields used by the index columns and by its partial index condition."""
+    return set(index_definition['fields']).union(
+        key.rsplit(FILTER_SEPARATOR, 1)[0] for key in index_definition.get('condition') or {}
+    )
+
+
+def get_add_column_clauses(schema_editor, field):
+    """
+    Returns the `ADD COLUMN` clause of the field and, for NOT NULL fields, the clause
+    dropping the default which fills existing rows. Both are metadata-only changes.
+    """
+    quote_name = schema_editor.quote_name
+    column = quote_name(field['field_name'])
+    model_field = create_field(field['field_name'], field['field_type'])
+    if model_field.null:
+        return "ADD COLUMN {} {} NULL".format(column, model_field.db_type(connection)), None
+
+    return (
+        "ADD COLUMN {} {} DEFAULT {} NOT NULL".format(
+            column,
+            model_field.db_type(connection),
+            schema_editor.quote_value(schema_editor.effective_default(model_field))
+        ),
+        "ALTER COLUMN {} DROP DEFAULT".format(column)
+    )
+
+
+def get_retype_expression(old_field, new_field, column):
+    return RETYPE_USING[(old_field['field_type'], new_field['field_type'])].format(column=column)
+
+
+def get_schema_change_step(sql, lock, effect=METADATA):
+    """Describes one statement of a schema change: the table `lock` it takes and its `effect`."""
+    return {"sql": sql, "lock": lock, "effect": effect}
+
+
+def get_rebuilt_indexes(table_object, schema_diff):
+    """Returns recorded indexes which are lost when their retyped fields are converted."""
+    retyped_field_names = set(new_field['field_name'] for _, new_field in schema_diff['retyped'])
+    return [
+        index_definition for index_definition in table_object.indexes
+        if get_index_field_names(index_definition) & retyped_field_names
+    ]
+
+
+def get_schema_change_steps(table_object, model, schema_diff):
+    """
+    Returns the DDL applying the schema diff: one `ALTER TABLE` with every column change,
+    followed by one removing the defaults used to fill new NOT NULL columns, which
+    Postgres does not allow in the same statement.
+    Indexes using retyped fields are dropped first, `sync_table_indexes` re-creates them.
+    """
+    validate_partition_field_kept(table_object, schema_diff)
+
+    schema_editor = connection.schema_editor()
+    quote_name = schema_editor.quote_name
+    table = quote_name(model._meta.db_table)
+
+    steps = []
+    for index_definition in get_rebuilt_indexes(table_object, schema_diff):
+        steps.append(get_schema_change_step(
+            get_drop_index_sql(index_definition['index_name']), ACCESS_EXCLUSIVE
+        ))
+
+    clauses, default_clauses = [], []
+    for field in schema_diff['removed']:
+        clauses.append("DROP COLUMN {}".format(quote_name(field['field_name'])))
+
+    for field in schema_diff['added']:
+        add_clause, default_clause = get_add_column_clauses(schema_editor, field)
+        clauses.append(add_clause)
+        if default_clause:
+            default_clauses.append(default_clause)
+
+    for old_field, new_field in schema_diff['retyped']:
+        column = quote_name(new_field['field_name'])
+        model_field = create_field(new_field['field_name'], new_field['field_type'])
+        clauses.append("ALTER COLUMN {} TYPE {} USING {}".format(
+            column,
+            model_field.db_type(connection),
+            get_retype_expression(old_field, new_field, column)
+        ))
+        clauses.append("ALTER COLUMN {} {} NOT NULL".format(
+            column, 'DROP' if model_field.null else 'SET'
+        ))
+
+    if clauses:
+        # Converting values writes a new copy of the table and all its indexes
+        steps.append(get_schema_change_step(
+            "ALTER TABLE {} {}".format(table, ', '.join(clauses)),
+            ACCESS_EXCLUSIVE,
+            REWRITE if schema_diff['retyped'] else METADATA
+        ))
+    if default_clauses:
+        steps.append(get_schema_change_step(
+            "ALTER TABLE {} {}".format(table, ', '.join(default_clauses)), ACCESS_EXCLUSIVE
+        ))
+
+    return steps
+
+
+def get_schema_change_statements(table_object, model, schema_diff):
+    return [step['sql'] for step in get_schema_change_steps(table_object, model, schema_diff)]
+
+
+def get_locked_table_schema(table_object):
+    """
+    Re-reads the schema of the table once its schema change lock is taken, so the change is
+    diffed against the schema left by the previous change rather than a stale copy.
+    Returns the model and the field list.
+    """
+    table_object.refresh_from_db()
+    table_fields = get_table_schema(table_object)
+    return get_table_model(table_object, table_fields, table_object.schema_version), table_fields
+
+
+def apply_table_schema_change(table_object, new_table_fields):
+    """
+    Changes the table to `new_table_fields` within one transaction and stores the new schema.
+    Returns the executed statements. Nothing is changed if the field list stays the same.
+    Runs under the schema change lock, so it never overlaps an online schema change,
+    a partition update or a retention purge of the table.
+    """
+    new_table_fields = normalize_table_fields(new_table_fields)
+
+    with schema_change_lock(table_object):
+        model, old_table_fields = get_locked_table_schema(table_object)
+        if new_table_fields == normalize_table_fields(old_table_fields):
+            return []
+
+        statements = get_schema_change_statements(
+            table_object, model, diff_table_schema(old_table_fields, new_table_fields)
+        )
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    try:
+                        cursor.execute(statement)
+                    except DatabaseError as exc:
+                        raise serializers.ValidationError(
+                            "Could not change table structure: {}".format(str(exc).strip())
+                        )
+
+            save_table_schema(table_object, new_table_fields)
+
+            sync_table_indexes(
+                table_object,
+                get_table_model(
+                    table_object, table_object.table_fields, table_object.schema_version
+                ),
+                table_object.table_fields
+            )
+
+    return statements
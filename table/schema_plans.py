@@ -0,0 +1,106 @@
+import math
+
+from django.conf import settings
+
+from table.indexes import get_create_index_sql
+from table.online_schema_changes import OnlineSchemaChange
+from table.schema_changes import (
+    ACCESS_EXCLUSIVE,
+    BACKFILL,
+    INDEX_BUILD,
+    REWRITE,
+    ROW_EXCLUSIVE,
+    SCAN,
+    SHARE,
+    SHARE_ROW_EXCLUSIVE,
+    SHARE_UPDATE_EXCLUSIVE,
+    diff_table_schema,
+    get_rebuilt_indexes,
+    get_schema_change_step,
+    get_schema_change_steps,
+    normalize_table_fields,
+)
+from table.stats import collect_table_stats
+
+# Table locks from the weakest to the strongest, None when a step locks no table
+LOCK_LEVELS = [
+    None,
+    ROW_EXCLUSIVE,
+    SHARE_UPDATE_EXCLUSIVE,
+    SHARE,
+    SHARE_ROW_EXCLUSIVE,
+    ACCESS_EXCLUSIVE,
+]
+
+
+def get_index_rebuild_steps(table_object, model, new_table_fields, schema_diff, concurrently):
+    return [
+        get_schema_change_step(
+            get_create_index_sql(
+                model, new_table_fields, index_definition, concurrently, if_not_exists=True
+            ),
+            SHARE_UPDATE_EXCLUSIVE if concurrently else SHARE,
+            INDEX_BUILD
+        )
+        for index_definition in get_rebuilt_indexes(table_object, schema_diff)
+    ]
+
+
+def estimate_step(step, table_stats):
+    """Adds the rows and bytes the step reads or writes, estimated from the catalog statistics."""
+    rows_estimate, bytes_estimate = 0, 0
+    if step['effect'] == REWRITE:
+        rows_estimate, bytes_estimate = (
+            table_stats['row_count_estimate'], table_stats['total_size_bytes']
+        )
+    elif step['effect'] in (SCAN, BACKFILL, INDEX_BUILD):
+        rows_estimate, bytes_estimate = (
+            table_stats['row_count_estimate'], table_stats['table_size_bytes']
+        )
+
+    step = dict(step, rows_estimate=rows_estimate, bytes_estimate=bytes_estimate)
+    if step['effect'] == BACKFILL:
+        step['batches_estimate'] = math.ceil(
+            rows_estimate / getattr(settings, 'TABLE_ROWS_BATCH_SIZE', 1000)
+        )
+
+    return step
+
+
+def plan_table_schema_change(table_object, model, old_table_fields, new_table_fields, online=False):
+    """
+    Returns the statements changing the table to `new_table_fields` without running them,
+    with the lock each one takes and whether it touches every row of the table.
+    Without `online` every step runs in one transaction which keeps the strongest lock
+    until the end.
+    """
+    new_table_fields = normalize_table_fields(new_table_fields)
+    schema_diff = diff_table_schema(old_table_fields, new_table_fields)
+
+    steps = []
+    if new_table_fields != normalize_table_fields(old_table_fields):
+        if online:
+            steps = OnlineSchemaChange(
+                table_object, model, old_table_fields, new_table_fields
+            ).get_steps()
+        else:
+            steps = get_schema_change_steps(table_object, model, schema_diff)
+
+        steps += get_index_rebuild_steps(
+            table_object, model, new_table_fields, schema_diff, concurrently=online
+        )
+
+    table_stats = collect_table_stats(model)
+    steps = [estimate_step(step, table_stats) for step in steps]
+
+    return {
+        "online": online,
+        "row_count_estimate": table_stats['row_count_estimate'],
+        "table_size_bytes": table_stats['table_size_bytes'],
+        "total_size_bytes": table_stats['total_size_bytes'],
+        "rewrites_table": any(step['effect'] == REWRITE for step in steps),
+        "strongest_lock": max(
+            (step['lock'] for step in steps), key=LOCK_LEVELS.index, default=None
+        ),
+        "steps": steps,
+    }
@@ -0,0 +1,21 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from table.bulk import ATOMIC_MODE, BULK_MODES
+from table.upsert import ON_CONFLICT_ACTIONS
+
+
+class BulkAddTableRowsSerializer(serializers.Serializer):
+    rows = serializers.ListField(child=serializers.JSONField(), allow_empty=False)
+    mode = serializers.ChoiceField(choices=BULK_MODES, default=ATOMIC_MODE)
+    on_conflict = serializers.ChoiceField(choices=ON_CONFLICT_ACTIONS, required=False)
+    conflict_fields = serializers.ListField(child=serializers.CharField(), required=False)
+
+    def validate_rows(self, rows):
+        max_rows = getattr(settings, 'TABLE_BULK_MAX_ROWS', 10000)
+        if len(rows) > max_rows:
+            raise serializers.ValidationError(
+                "At most {} rows can be added at once.".format(max_rows)
+            )
+
+        return rows
@@ -0,0 +1,32 @@
+import re
+
+from rest_framework import serializers
+
+INDEX_NAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+class CreateTableIndexSerializer(serializers.Serializer):
+    index_name = serializers.CharField(max_length=63, required=False)
+    fields = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False
+    )
+    unique = serializers.BooleanField(default=False)
+    condition = serializers.DictField(required=False)
+    background = serializers.BooleanField(default=False)
+
+    def validate_index_name(self, index_name):
+        if not INDEX_NAME_PATTERN.match(index_name):
+            raise serializers.ValidationError(
+                "Index name may contain only lowercase letters, digits and underscores."
+            )
+
+        return index_name
+
+    def validate_fields(self, fields):
+        if len(set(fields)) != len(fields):
+            raise serializers.ValidationError(
+                "Index fields must be unique."
+            )
+
+        return fields
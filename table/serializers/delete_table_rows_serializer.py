@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class DeleteTableRowsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    where = serializers.DictField(required=False)
+
+    def validate_ids(self, ids):
+        max_rows = getattr(settings, 'TABLE_BULK_MAX_ROWS', 10000)
+        if len(ids) > max_rows:
+            raise serializers.ValidationError(
+                "At most {} ids can be given at once, use where to select more rows.".format(max_rows)
+            )
+
+        return ids
+
+    def validate(self, attrs):
+        if not attrs.get('ids') and not attrs.get('where'):
+            raise serializers.ValidationError(
+                "Either ids or where must be provided."
+            )
+
+        return attrs
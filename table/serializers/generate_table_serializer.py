@@ -1,11 +1,13 @@
 from rest_framework import serializers
 
+from table.serializers.partitioning_serializer import PartitioningSerializer
 from table.serializers.table_field_serializer import TableFieldSerializer
 
 
 class GenerateTableSerializer(serializers.Serializer):
     table_name = serializers.CharField(max_length=255, required=True)
     table_fields = TableFieldSerializer(many=True)
+    partitioning = PartitioningSerializer(required=False)
 
     def validate_table_name(self, table_name):
         if not len(table_name) > 2:
@@ -31,3 +33,15 @@ class GenerateTableSerializer(serializers.Serializer):
             )
 
         return table_fields
+
+    def validate(self, data):
+        partitioning = data.get('partitioning')
+        if partitioning and partitioning['field'] != 'id' and not any(
+            field['field_name'] == partitioning['field'] and field['field_type'] == 'NUMBER'
+            for field in data['table_fields']
+        ):
+            raise serializers.ValidationError({
+                'partitioning': ["Partition field must be id or a number field."]
+            })
+
+        return data
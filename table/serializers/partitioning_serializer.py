@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from table.partitions import HASH, PARTITION_METHODS, RANGE
+
+
+class PartitioningSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=PARTITION_METHODS)
+    field = serializers.CharField(max_length=255, default='id')
+    interval = serializers.IntegerField(min_value=1, required=False)
+    partitions = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, data):
+        if data['method'] == RANGE:
+            data.setdefault(
+                'interval', getattr(settings, 'TABLE_PARTITION_RANGE_SIZE', 1000000)
+            )
+            data.pop('partitions', None)
+
+        if data['method'] == HASH:
+            data.setdefault('partitions', getattr(settings, 'TABLE_PARTITION_HASH_COUNT', 8))
+            data.pop('interval', None)
+
+        return data
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+class RetentionSerializer(serializers.Serializer):
+    max_rows = serializers.IntegerField(min_value=1, required=False)
+    max_age_seconds = serializers.IntegerField(min_value=1, required=False)
+    field = serializers.CharField(max_length=255, required=False)
+
+    def validate(self, data):
+        if 'max_rows' not in data and 'max_age_seconds' not in data:
+            raise serializers.ValidationError(
+                "Retention must limit either max_rows or max_age_seconds."
+            )
+
+        if 'max_age_seconds' in data and 'field' not in data:
+            raise serializers.ValidationError(
+                "Retention by max_age_seconds requires the field holding the row timestamp."
+            )
+
+        if 'max_age_seconds' not in data:
+            data.pop('field', None)
+
+        return data
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from table.models import TableJob
+
+
+class TableJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source='pk')
+    table_id = serializers.IntegerField()
+
+    class Meta:
+        model = TableJob
+        fields = [
+            'job_id',
+            'table_id',
+            'kind',
+            'status',
+            'progress',
+            'result',
+            'error',
+            'cancel_requested',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+from table.serializers.delete_table_rows_serializer import DeleteTableRowsSerializer
+
+
+class UpdateTableRowsSerializer(DeleteTableRowsSerializer):
+    values = serializers.DictField(allow_empty=False)
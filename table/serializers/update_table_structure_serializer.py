@@ -5,6 +5,9 @@ from table.serializers.table_field_serializer import TableFieldSerializer
 
 class UpdateTableStructureSerializer(serializers.Serializer):
     new_table_fields = TableFieldSerializer(many=True)
+    online = serializers.BooleanField(default=False)
+    background = serializers.BooleanField(default=False)
+    dry_run = serializers.BooleanField(default=False)
 
     def validate_new_table_fields(self, new_table_fields):
         if not len(new_table_fields) > 0:
@@ -12,4 +15,10 @@ class UpdateTableStructureSerializer(serializers.Serializer):
                 "Table should have at least one field."
             )
 
+        field_names = [field['field_name'] for field in new_table_fields]
+        if len(set(field_names)) != len(field_names):
+            raise serializers.ValidationError(
+                "Field names must be unique."
+            )
+
         return new_table_fields
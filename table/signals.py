@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent with `table_id` and `schema_version` arguments once a table schema change is committed
+table_schema_changed = Signal()
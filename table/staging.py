@@ -0,0 +1,129 @@
+from django.db import connection, transaction
+from django.db.backends.utils import truncate_name
+from rest_framework import serializers
+
+from table.indexes import get_create_index_sql
+from table.models import TableName
+from table.schema import bump_data_version
+
+
+def get_staging_name(name):
+    return truncate_name("{}_staging".format(name), connection.ops.max_name_length())
+
+
+def get_primary_key_name(cursor, db_table):
+    cursor.execute("""
+        SELECT
+            conname
+        FROM
+            pg_constraint
+        WHERE
+            conrelid = %s::regclass
+        AND
+            contype = 'p';
+    """, [connection.ops.quote_name(db_table)])
+    return cursor.fetchone()[0]
+
+
+def get_id_sequence_name(cursor, db_table):
+    cursor.execute("""
+        SELECT
+            relname
+        FROM
+            pg_class
+        WHERE
+            oid = pg_get_serial_sequence(%s, 'id')::regclass;
+    """, [connection.ops.quote_name(db_table)])
+    return cursor.fetchone()[0]
+
+
+def create_staging_table(model):
+    """
+    Creates an empty copy of the table columns, without indexes, to be loaded in bulk.
+    Its ids continue the id sequence of the table, so they never go back after the swap.
+    """
+    quote_name = connection.ops.quote_name
+    db_table = model._meta.db_table
+    staging_table = get_staging_name(db_table)
+
+    with connection.cursor() as cursor:
+        # A staging table left behind by an interrupted import is stale
+        cursor.execute("DROP TABLE IF EXISTS {}".format(quote_name(staging_table)))
+        cursor.execute(
+            "CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS INCLUDING IDENTITY)".format(
+                staging=quote_name(staging_table),
+                table=quote_name(db_table)
+            )
+        )
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [quote_name(db_table)]
+        )
+        cursor.execute(
+            "ALTER TABLE {} ALTER COLUMN {} RESTART WITH %s".format(
+                quote_name(staging_table), quote_name('id')
+            ),
+            [cursor.fetchone()[0]]
+        )
+
+    return staging_table
+
+
+def drop_staging_table(staging_table):
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS {}".format(connection.ops.quote_name(staging_table)))
+
+
+def swap_staging_table(table_object, model, table_fields, staging_table):
+    """
+    Indexes the loaded staging table like the table and puts it in place of the table.
+    Indexes are built before the swap, so the table is locked only to drop and rename.
+    Rows written to the table while the staging table was loaded are replaced too.
+    """
+    quote_name = connection.ops.quote_name
+    db_table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        primary_key_name = get_primary_key_name(cursor, db_table)
+        cursor.execute("ALTER TABLE {} ADD CONSTRAINT {} PRIMARY KEY ({})".format(
+            quote_name(staging_table),
+            quote_name(get_staging_name(primary_key_name)),
+            quote_name('id')
+        ))
+        for index_definition in table_object.indexes:
+            cursor.execute(get_create_index_sql(
+                model,
+                table_fields,
+                index_definition,
+                db_table=staging_table,
+                index_name=get_staging_name(index_definition['index_name'])
+            ))
+        cursor.execute("ANALYZE {}".format(quote_name(staging_table)))
+
+    with transaction.atomic():
+        locked_table_object = TableName.objects.select_for_update().get(pk=table_object.pk)
+        if locked_table_object.schema_version != table_object.schema_version:
+            raise serializers.ValidationError("Table schema was changed during the import.")
+
+        with connection.cursor() as cursor:
+            sequence_name = get_id_sequence_name(cursor, db_table)
+
+            cursor.execute("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE".format(quote_name(db_table)))
+            cursor.execute("DROP TABLE {}".format(quote_name(db_table)))
+            cursor.execute("ALTER TABLE {} RENAME TO {}".format(
+                quote_name(staging_table), quote_name(db_table)
+            ))
+            cursor.execute("ALTER TABLE {} RENAME CONSTRAINT {} TO {}".format(
+                quote_name(db_table),
+                quote_name(get_staging_name(primary_key_name)),
+                quote_name(primary_key_name)
+            ))
+            cursor.execute("ALTER SEQUENCE {} RENAME TO {}".format(
+                quote_name(get_id_sequence_name(cursor, db_table)), quote_name(sequence_name)
+            ))
+            for index_definition in table_object.indexes:
+                cursor.execute("ALTER INDEX {} RENAME TO {}".format(
+                    quote_name(get_staging_name(index_definition['index_name'])),
+                    quote_name(index_definition['index_name'])
+                ))
+
+        bump_data_version(locked_table_object)
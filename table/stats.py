@@ -0,0 +1,64 @@
+from django.db import connection
+
+
+def collect_table_stats(model, exact=False):
+    """
+    Returns row count estimate and storage statistics of the dynamic table from the catalog.
+    Statistics of a partitioned table are summed over its partitions.
+    The exact row count requires a full scan, so it is only computed on request.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT
+                sum(CASE WHEN c.reltuples >= 0 THEN c.reltuples ELSE coalesce(s.n_live_tup, 0) END),
+                sum(s.n_live_tup),
+                sum(s.n_dead_tup),
+                sum(pg_table_size(c.oid)),
+                sum(pg_indexes_size(c.oid)),
+                sum(pg_total_relation_size(c.oid)),
+                max(GREATEST(s.last_vacuum, s.last_autovacuum)),
+                max(GREATEST(s.last_analyze, s.last_autoanalyze))
+            FROM
+                pg_class c
+            LEFT JOIN
+                pg_stat_user_tables s ON s.relid = c.oid
+            WHERE
+                c.relkind = 'r'
+            AND (
+                c.oid = to_regclass(%(table)s)
+                OR c.oid IN (SELECT relid FROM pg_partition_tree(to_regclass(%(table)s)))
+            )
+            HAVING
+                count(*) > 0;
+        """, {'table': connection.ops.quote_name(model._meta.db_table)})
+        result = cursor.fetchone()
+
+    if result is None:
+        return None
+
+    (
+        row_count_estimate, live_tuples, dead_tuples, table_size, index_size,
+        total_size, last_vacuum, last_analyze
+    ) = result
+    live_tuples, dead_tuples = int(live_tuples or 0), int(dead_tuples or 0)
+
+    stats = {
+        # reltuples is -1 until the table is vacuumed or analyzed for the first time
+        "row_count_estimate": int(row_count_estimate),
+        "table_size_bytes": int(table_size),
+        "index_size_bytes": int(index_size),
+        "total_size_bytes": int(total_size),
+        "live_tuples": live_tuples,
+        "dead_tuples": dead_tuples,
+        "dead_tuple_ratio": (
+            round(dead_tuples / (live_tuples + dead_tuples), 4)
+            if live_tuples + dead_tuples else 0.0
+        ),
+        "last_vacuum": last_vacuum,
+        "last_analyze": last_analyze,
+    }
+
+    if exact:
+        stats["row_count"] = model.objects.count()
+
+    return stats
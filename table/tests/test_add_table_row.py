@@ -86,3 +86,38 @@ class AddTableRowTestCase(APITestCase):
         )
         self.assertTrue(add_table_row_response_content['table_row_id'] > 0)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_add_table_row_returns_field_errors_in_case_of_invalid_row(self):
+        # Arrange
+        generate_table_data = {
+            'table_name': "invalid_rows",
+            'table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'second',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), generate_table_data)
+        table_id = ujson.decode(response.content)['table_id']
+
+        add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': table_id,
+        })
+
+        # Act
+        response = self.client.post(add_table_row_reversed_url, {
+            'first': 'abc'
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content, {
+            'first': ['A valid integer is required.'],
+            'second': ['This field is required.']
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
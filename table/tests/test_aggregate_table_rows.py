@@ -0,0 +1,113 @@
+import ujson
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class AggregateTableRowsTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "aggregated_table",
+            'table_fields': [
+                {
+                    'field_name': 'category',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'active',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+
+        add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': self.table_id,
+        })
+        for category, amount, active in (
+            ('fruit', 10, True),
+            ('fruit', 20, False),
+            ('vegetable', 5, True),
+        ):
+            self.client.post(add_table_row_reversed_url, {
+                'category': category,
+                'amount': amount,
+                'active': active
+            })
+
+        self.reversed_url = reverse('aggregate-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+    def test_aggregate_table_rows_returns_error_in_case_of_table_not_found(self):
+        # Arrange
+        reversed_url = reverse('aggregate-table-rows', kwargs={
+            'table_id': self.table_id + 1
+        })
+
+        # Act
+        response = self.client.get(reversed_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_aggregate_table_rows_returns_row_count_by_default(self):
+        # Act
+        response = self.client.get(self.reversed_url)
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content), {
+            'results': [{'count': 3}],
+            'truncated': False
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_aggregate_table_rows_returns_filtered_aggregates(self):
+        # Act
+        response = self.client.get(self.reversed_url, {
+            'aggregates': 'count,sum:amount,avg:amount,min:amount,max:amount',
+            'active__eq': 'true'
+        })
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content)['results'], [{
+            'count': 2,
+            'sum_amount': 15,
+            'avg_amount': 7.5,
+            'min_amount': 5,
+            'max_amount': 10
+        }])
+
+    def test_aggregate_table_rows_returns_groups(self):
+        # Act
+        response = self.client.get(self.reversed_url, {
+            'aggregates': 'count,sum:amount',
+            'group_by': 'category'
+        })
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content)['results'], [
+            {'category': 'fruit', 'count': 2, 'sum_amount': 30},
+            {'category': 'vegetable', 'count': 1, 'sum_amount': 5},
+        ])
+
+    def test_aggregate_table_rows_returns_error_in_case_of_invalid_aggregates(self):
+        # Act
+        response = self.client.get(self.reversed_url, {
+            'aggregates': 'sum:category,median:amount,max',
+            'group_by': 'amount'
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['aggregates'], [
+            'Aggregate function sum is not supported by STRING fields.',
+            'Unknown aggregate function median.',
+            'Aggregate function max requires a field.',
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
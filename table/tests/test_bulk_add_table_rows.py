@@ -0,0 +1,166 @@
+import ujson
+from django.db import transaction
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from table.models import TableName
+from table.registry import get_table_model
+from table.schema import bump_data_version, get_table_etag
+
+
+class BulkAddTableRowsTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "bulk_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.reversed_url = reverse('bulk-add-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+    def get_table_rows(self):
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return list(model.objects.order_by('id').values_list('id', 'title', 'amount'))
+
+    def test_bulk_add_table_rows_returns_error_in_case_of_table_not_found(self):
+        # Arrange
+        reversed_url = reverse('bulk-add-table-rows', kwargs={
+            'table_id': self.table_id + 1
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {'rows': [{'title': 'a', 'amount': 1}]})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_add_table_rows_returns_table_row_ids_in_case_of_success(self):
+        # Arrange
+        rows = [{'title': 'row {}'.format(index), 'amount': index} for index in range(5)]
+
+        # Act
+        response = self.client.post(self.reversed_url, {'rows': rows})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['inserted'], 5)
+        self.assertEqual(response_content['errors'], [])
+        self.assertEqual(
+            self.get_table_rows(),
+            [
+                (table_row_id, row['title'], row['amount'])
+                for table_row_id, row in zip(response_content['table_row_ids'], rows)
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_add_table_rows_rejects_whole_batch_in_atomic_mode(self):
+        # Arrange
+        rows = [
+            {'title': 'valid', 'amount': 1},
+            {'title': 'invalid', 'amount': 'abc'},
+        ]
+
+        # Act
+        response = self.client.post(self.reversed_url, {'rows': rows})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['inserted'], 0)
+        self.assertEqual(response_content['errors'], [{
+            'index': 1,
+            'errors': {'amount': ['A valid integer is required.']}
+        }])
+        self.assertEqual(self.get_table_rows(), [])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_add_table_rows_inserts_valid_rows_in_best_effort_mode(self):
+        # Arrange
+        rows = [
+            {'title': 'first', 'amount': 1},
+            {'amount': 2},
+            {'title': 'overflow', 'amount': 2 ** 40},
+            {'title': 'last', 'amount': 4},
+        ]
+
+        # Act
+        response = self.client.post(self.reversed_url, {
+            'rows': rows,
+            'mode': 'best_effort'
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['inserted'], 2)
+        self.assertEqual(response_content['table_row_ids'][1:3], [None, None])
+        self.assertEqual(
+            [error['index'] for error in response_content['errors']], [1, 2]
+        )
+        self.assertEqual(
+            [title for _, title, _ in self.get_table_rows()], ['first', 'last']
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(TABLE_BULK_INSERT_BATCH_SIZE=1)
+    def test_bulk_add_table_rows_bumps_data_version_once(self):
+        # Arrange
+        data_version = TableName.objects.get(pk=self.table_id).data_version
+
+        # Act
+        self.client.post(self.reversed_url, {
+            'rows': [{'title': str(amount), 'amount': amount} for amount in range(3)]
+        })
+
+        # Assert
+        self.assertEqual(TableName.objects.get(pk=self.table_id).data_version, data_version + 1)
+
+    def test_bump_data_version_bumps_again_after_rolled_back_savepoint(self):
+        # Arrange
+        tableObj = TableName.objects.get(pk=self.table_id)
+
+        # Act
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    bump_data_version(tableObj)
+                    raise ValueError
+            except ValueError:
+                pass
+
+            bump_data_version(tableObj)
+            bump_data_version(tableObj)
+
+        # Assert
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).data_version, tableObj.data_version + 1
+        )
+
+    def test_bump_data_version_bumps_again_after_etag_was_read(self):
+        # Arrange
+        tableObj = TableName.objects.get(pk=self.table_id)
+
+        # Act
+        with transaction.atomic():
+            bump_data_version(tableObj)
+            get_table_etag(tableObj)
+            bump_data_version(tableObj)
+            bump_data_version(tableObj)
+
+        # Assert
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).data_version, tableObj.data_version + 2
+        )
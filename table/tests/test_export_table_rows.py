@@ -0,0 +1,84 @@
+import ujson
+from django.test import TestCase, override_settings
+from django.urls.base import reverse
+from rest_framework import status
+
+
+class ExportTableRowsTestCase(TestCase):
+    def setUp(self):
+        data = {
+            'table_name': "exported_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            data,
+            content_type="application/json"
+        )
+        self.table_id = ujson.decode(response.content)['table_id']
+
+        add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': self.table_id,
+        })
+        for amount in range(5):
+            self.client.post(
+                add_table_row_reversed_url,
+                {'title': 'row {}'.format(amount), 'amount': amount},
+                content_type="application/json"
+            )
+
+        self.reversed_url = reverse('export-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+    def test_export_table_rows_returns_error_in_case_of_table_not_found(self):
+        # Arrange
+        reversed_url = reverse('export-table-rows', kwargs={
+            'table_id': self.table_id + 1
+        })
+
+        # Act
+        response = self.client.get(reversed_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(TABLE_EXPORT_CHUNK_SIZE=2)
+    def test_export_table_rows_streams_ndjson_in_case_of_success(self):
+        # Act
+        response = self.client.get(self.reversed_url)
+        content = b''.join(response.streaming_content)
+
+        # Assert
+        rows = [ujson.decode(line) for line in content.splitlines()]
+        self.assertEqual([row['amount'] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEqual(rows[0]['title'], 'row 0')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TABLE_EXPORT_CHUNK_SIZE=2)
+    def test_export_table_rows_streams_json_array_in_case_of_json_output(self):
+        # Act
+        response = self.client.get(self.reversed_url, {'output': 'json'})
+        content = b''.join(response.streaming_content)
+
+        # Assert
+        rows = ujson.decode(content)
+        self.assertEqual([row['amount'] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_export_table_rows_returns_error_in_case_of_unknown_output(self):
+        # Act
+        response = self.client.get(self.reversed_url, {'output': 'xml'})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
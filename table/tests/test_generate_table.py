@@ -3,6 +3,8 @@ from django.urls.base import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from table.models import TableName
+
 
 class GenerateTableTestCase(APITestCase):
     def setUp(self):
@@ -163,4 +165,33 @@ class GenerateTableTestCase(APITestCase):
 
         # Assert
         self.assertTrue(response_content['table_id'] > 0)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_generate_table_stores_table_schema_in_case_of_success(self):
+        # Arrange
+        data = {
+            'table_name': "schema_table",
+            'table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'second',
+                    'field_type': 'string'
+                }
+            ]
+        }
+
+        # Act
+        response = self.client.post(self.reversed_url, data)
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        tableObj = TableName.objects.get(pk=response_content['table_id'])
+        self.assertEqual(tableObj.table_fields, [
+            {'field_name': 'first', 'field_type': 'NUMBER'},
+            {'field_name': 'second', 'field_type': 'STRING'},
+        ])
+        self.assertEqual(tableObj.schema_version, 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -1,6 +1,7 @@
 import ujson
 from django.db import connection
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls.base import reverse
 from rest_framework import status
 
@@ -9,6 +10,35 @@ from table.utils import create_model
 
 
 class GetTableRowsTestCase(TestCase):
+    def create_table_with_rows(self, table_name, rows, table_fields=None):
+        data = {
+            'table_name': table_name,
+            'table_fields': table_fields or [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            data,
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+
+        add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': table_id,
+        })
+        for row in rows:
+            self.client.post(
+                add_table_row_reversed_url,
+                row,
+                content_type="application/json"
+            )
+
+        return table_id
+
     def test_get_table_rows_returns_error_in_case_of_table_not_found(self):
         # Arrange
         reversed_url = reverse('get-table-rows', kwargs={
@@ -85,4 +115,220 @@ class GetTableRowsTestCase(TestCase):
         self.assertEqual(len(resp_json), 1)
         self.assertEqual(resp_json[0]['id'], 1)
         self.assertEqual(resp_json[0]['first'], add_table_row_data['first'])
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_table_rows_does_not_query_catalog_in_case_of_stored_schema(self):
+        # Arrange
+        table_id = self.create_table_with_rows("catalog_free", [])
+
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reversed_url)
+
+        # Assert
+        self.assertFalse(any(
+            'information_schema' in query['sql'] for query in queries.captured_queries
+        ))
+        self.assertEqual(ujson.decode(response.content), [])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_table_rows_returns_pages_in_case_of_limit_provided(self):
+        # Arrange
+        table_id = self.create_table_with_rows(
+            "paged_table", [{'first': 1}, {'first': 2}, {'first': 3}]
+        )
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        first_page = self.client.get(reversed_url, {'limit': 2})
+        second_page = self.client.get(reversed_url, {
+            'limit': 2,
+            'after': first_page['X-Next-Cursor']
+        })
+
+        # Assert
+        self.assertEqual(
+            [row['first'] for row in ujson.decode(first_page.content)], [1, 2]
+        )
+        self.assertIn('rel="next"', first_page['Link'])
+        self.assertEqual(
+            [row['first'] for row in ujson.decode(second_page.content)], [3]
+        )
+        self.assertFalse(second_page.has_header('X-Next-Cursor'))
+        self.assertEqual(second_page.status_code, status.HTTP_200_OK)
+
+    @override_settings(TABLE_ROWS_MAX_PAGE_SIZE=2)
+    def test_get_table_rows_limits_page_size_to_server_maximum(self):
+        # Arrange
+        table_id = self.create_table_with_rows(
+            "capped_table", [{'first': 1}, {'first': 2}, {'first': 3}]
+        )
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.get(reversed_url, {'limit': 100})
+
+        # Assert
+        self.assertEqual(len(ujson.decode(response.content)), 2)
+        self.assertTrue(response.has_header('X-Next-Cursor'))
+
+    def test_get_table_rows_returns_error_in_case_of_invalid_cursor(self):
+        # Arrange
+        table_id = self.create_table_with_rows("cursor_table", [])
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.get(reversed_url, {'after': '!!'})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['after'], ['Invalid cursor.'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def create_filtered_table(self):
+        return self.create_table_with_rows(
+            "filtered_table",
+            [
+                {'title': 'apple', 'amount': 5, 'active': True},
+                {'title': 'apricot', 'amount': 15, 'active': False},
+                {'title': 'banana', 'amount': 25, 'active': True},
+            ],
+            [
+                {'field_name': 'title', 'field_type': 'string'},
+                {'field_name': 'amount', 'field_type': 'number'},
+                {'field_name': 'active', 'field_type': 'boolean'},
+            ]
+        )
+
+    def test_get_table_rows_returns_only_requested_fields(self):
+        # Arrange
+        table_id = self.create_filtered_table()
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.get(reversed_url, {'fields': 'amount'})
+        resp_json = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(resp_json, [
+            {'id': 1, 'amount': 5},
+            {'id': 2, 'amount': 15},
+            {'id': 3, 'amount': 25},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_table_rows_returns_only_rows_matching_filters(self):
+        # Arrange
+        table_id = self.create_filtered_table()
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        prefix_response = self.client.get(reversed_url, {
+            'title__prefix': 'ap',
+            'amount__gt': 10
+        })
+        boolean_response = self.client.get(reversed_url, {
+            'active__eq': 'true',
+            'amount__ne': 5
+        })
+        in_response = self.client.get(reversed_url, {'amount__in': '5,25'})
+
+        # Assert
+        self.assertEqual(
+            [row['title'] for row in ujson.decode(prefix_response.content)], ['apricot']
+        )
+        self.assertEqual(
+            [row['title'] for row in ujson.decode(boolean_response.content)], ['banana']
+        )
+        self.assertEqual(
+            [row['amount'] for row in ujson.decode(in_response.content)], [5, 25]
+        )
+
+    def test_get_table_rows_returns_error_in_case_of_invalid_filters(self):
+        # Arrange
+        table_id = self.create_filtered_table()
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.get(reversed_url, {
+            'missing__eq': 1,
+            'amount__gt': 'abc',
+            'active__prefix': 't',
+            'fields': 'title,unknown'
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['fields'], ["Unknown fields: ['unknown']."])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reversed_url, {
+            'missing__eq': 1,
+            'amount__gt': 'abc',
+            'active__prefix': 't'
+        })
+        response_content = ujson.decode(response.content)
+
+        self.assertEqual(response_content, {
+            'missing__eq': ['Unknown field missing.'],
+            'amount__gt': ['Invalid value abc for NUMBER field.'],
+            'active__prefix': ['Operator prefix is not supported by BOOLEAN fields.'],
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_table_rows_returns_not_modified_in_case_of_matching_etag(self):
+        # Arrange
+        table_id = self.create_table_with_rows("etag_table", [{'first': 1}])
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+        etag = self.client.get(reversed_url)['ETag']
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reversed_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(any(
+            'table_etag_table' in query['sql'] for query in queries.captured_queries
+        ))
+
+    def test_get_table_rows_returns_rows_in_case_of_table_changed_since_etag(self):
+        # Arrange
+        table_id = self.create_table_with_rows("etag_table", [{'first': 1}])
+        reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': table_id
+        })
+        etag = self.client.get(reversed_url)['ETag']
+
+        self.client.post(
+            reverse('add-table-row', kwargs={'table_id': table_id}),
+            {'first': 2},
+            content_type="application/json"
+        )
+
+        # Act
+        response = self.client.get(reversed_url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(len(ujson.decode(response.content)), 2)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
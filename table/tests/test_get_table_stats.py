@@ -0,0 +1,71 @@
+import ujson
+from django.db import connection
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+
+class GetTableStatsTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "measured_table",
+            'table_fields': [
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+
+        add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': self.table_id,
+        })
+        for amount in range(3):
+            self.client.post(add_table_row_reversed_url, {'amount': amount})
+
+        self.reversed_url = reverse('get-table-stats', kwargs={
+            'table_id': self.table_id
+        })
+
+    def test_get_table_stats_returns_error_in_case_of_table_not_found(self):
+        # Arrange
+        reversed_url = reverse('get-table-stats', kwargs={
+            'table_id': self.table_id + 1
+        })
+
+        # Act
+        response = self.client.get(reversed_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_table_stats_returns_estimates_without_exact_count(self):
+        # Arrange
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE table_measured_table;')
+
+        # Act
+        response = self.client.get(self.reversed_url)
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['table_name'], 'measured_table')
+        self.assertEqual(response_content['row_count_estimate'], 3)
+        self.assertNotIn('row_count', response_content)
+        self.assertTrue(response_content['table_size_bytes'] > 0)
+        self.assertTrue(response_content['index_size_bytes'] > 0)
+        self.assertTrue(
+            response_content['total_size_bytes'] >= response_content['table_size_bytes']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_table_stats_returns_exact_count_in_case_of_exact_requested(self):
+        # Act
+        response = self.client.get(self.reversed_url, {'exact': 'true'})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['row_count'], 3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
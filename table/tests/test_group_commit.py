@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import ujson
+from django.db import DataError, connection
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from table.group_commit import insert_table_row
+from table.models import TableName
+from table.registry import get_table_model
+
+
+@override_settings(
+    TABLE_GROUP_COMMIT=True,
+    TABLE_GROUP_COMMIT_MAX_ROWS=4,
+    TABLE_GROUP_COMMIT_MAX_WAIT_MS=5000
+)
+class GroupCommitTestCase(APITransactionTestCase):
+    def setUp(self):
+        data = {
+            'table_name': "group_committed",
+            'table_fields': [
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.tableObj = TableName.objects.get(pk=self.table_id)
+        self.model = get_table_model(
+            self.tableObj, self.tableObj.table_fields, self.tableObj.schema_version
+        )
+
+    def tearDown(self):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE table_group_committed;')
+
+    def run_concurrently(self, function, arguments):
+        def run(argument):
+            try:
+                return function(argument)
+            except Exception as exc:
+                return exc
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(arguments)) as executor:
+            return list(executor.map(run, arguments))
+
+    def test_add_table_row_commits_concurrent_rows_together(self):
+        # Arrange
+        reversed_url = reverse('add-table-row', kwargs={
+            'table_id': self.table_id
+        })
+
+        def add_row(amount):
+            return APIClient().post(reversed_url, {'amount': amount}, format='json')
+
+        # Act
+        responses = self.run_concurrently(add_row, [1, 2, 3, 4])
+
+        # Assert
+        self.assertEqual(
+            [response.status_code for response in responses], [status.HTTP_201_CREATED] * 4
+        )
+        table_row_ids = [ujson.decode(response.content)['table_row_id'] for response in responses]
+        self.assertEqual(
+            dict(self.model.objects.values_list('id', 'amount')),
+            dict(zip(table_row_ids, [1, 2, 3, 4]))
+        )
+        # A single commit bumps the data version once
+        self.tableObj.refresh_from_db()
+        self.assertEqual(self.tableObj.data_version, 2)
+
+    def test_insert_table_row_fails_only_rows_rejected_by_database(self):
+        # Arrange
+        def insert_row(amount):
+            return insert_table_row(
+                self.tableObj, self.model, self.tableObj.table_fields, {'amount': amount}
+            )
+
+        # Act
+        results = self.run_concurrently(insert_row, [1, 2 ** 40, 3, 4])
+
+        # Assert
+        self.assertIsInstance(results[1], DataError)
+        self.assertEqual(
+            sorted(self.model.objects.values_list('id', flat=True)),
+            sorted([results[0], results[2], results[3]])
+        )
@@ -0,0 +1,132 @@
+import io
+import tempfile
+
+import ujson
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.urls.base import reverse
+from rest_framework.test import APITransactionTestCase
+
+from table.models import TableName
+from table.parallel_ingest import import_table_file, split_input_file
+from table.registry import get_table_model
+
+
+class SplitInputFileTestCase(SimpleTestCase):
+    def test_split_input_file_ends_byte_ranges_on_line_boundaries(self):
+        # Arrange
+        content = b'first line\nsecond\nthird line here\nlast'
+
+        with tempfile.TemporaryFile() as input_file:
+            input_file.write(content)
+            input_file.flush()
+
+            # Act
+            byte_ranges = split_input_file(input_file, 8)
+
+        # Assert
+        self.assertEqual(
+            [content[start:end] for start, end in byte_ranges],
+            [b'first line\n', b'second\nthird line here\n', b'last']
+        )
+
+
+class ImportTableRowsTestCase(APITransactionTestCase):
+    def setUp(self):
+        data = {
+            'table_name': "imported_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+
+        self.input_file = tempfile.NamedTemporaryFile('w', suffix='.csv')
+        self.input_file.write('title,amount\n')
+        for number in range(1, 41):
+            self.input_file.write('row {},{}\n'.format(number, 'abc' if number == 25 else number))
+        self.input_file.flush()
+
+    def tearDown(self):
+        self.input_file.close()
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE IF EXISTS table_imported_table;')
+
+    def get_table_model(self):
+        tableObj = TableName.objects.get(pk=self.table_id)
+        return tableObj, get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+
+    def test_import_table_rows_loads_file_parts_in_worker_processes(self):
+        # Arrange
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        # Act
+        call_command(
+            'import_table_rows',
+            self.table_id,
+            self.input_file.name,
+            workers=2,
+            chunk_size=100,
+            stdout=stdout,
+            stderr=stderr
+        )
+
+        # Assert
+        _, model = self.get_table_model()
+        self.assertIn('Loaded 39 rows, rejected 1 rows', stdout.getvalue())
+        self.assertIn('line 26:', stderr.getvalue())
+        self.assertEqual(model.objects.count(), 39)
+        self.assertEqual(
+            sorted(model.objects.values_list('amount', flat=True)),
+            [number for number in range(1, 41) if number != 25]
+        )
+
+    def test_import_table_rows_swaps_staging_table_in_place_of_table(self):
+        # Arrange
+        tableObj, model = self.get_table_model()
+        old_row = model.objects.create(title='old row', amount=0)
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['amount'], 'index_name': 'imported_amounts'}
+        )
+        tableObj.refresh_from_db()
+
+        # Act
+        report = import_table_file(
+            tableObj,
+            model,
+            tableObj.table_fields,
+            self.input_file.name,
+            'csv',
+            workers=1,
+            chunk_size=100,
+            staging=True
+        )
+
+        # Assert
+        self.assertEqual(report['rows_loaded'], 39)
+        self.assertEqual(report['errors'][0]['line'], 26)
+        self.assertFalse(model.objects.filter(title='old row').exists())
+        self.assertGreater(model.objects.order_by('id').first().id, old_row.id)
+        self.assertGreater(TableName.objects.get(pk=self.table_id).data_version, tableObj.data_version)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'table_imported_table' ORDER BY 1;"
+            )
+            self.assertEqual(
+                [row[0] for row in cursor.fetchall()],
+                ['imported_amounts', 'table_imported_table_pkey']
+            )
+
+        # Rows inserted after the swap continue the id sequence
+        new_row = model.objects.create(title='new row', amount=41)
+        self.assertGreater(new_row.id, model.objects.exclude(pk=new_row.pk).order_by('-id').first().id)
@@ -0,0 +1,93 @@
+from django.apps import apps
+from django.test import TestCase
+
+from table.models import TableName
+from table.registry import (
+    ModelRegistry,
+    get_table_model,
+    model_registry,
+    unregister_dynamic_model
+)
+from table.utils import create_model
+
+
+class ModelRegistryTestCase(TestCase):
+    def setUp(self):
+        model_registry.clear()
+        self.table_fields = [
+            {
+                'field_name': 'first',
+                'field_type': 'NUMBER'
+            }
+        ]
+
+    def test_get_table_model_returns_same_class_while_schema_is_unchanged(self):
+        # Arrange
+        tableObj = TableName.objects.create(table_name="registry_table")
+
+        # Act
+        first_model = get_table_model(tableObj, self.table_fields)
+        second_model = get_table_model(tableObj, list(self.table_fields))
+
+        # Assert
+        self.assertIs(first_model, second_model)
+        self.assertEqual(first_model._meta.db_table, 'table_registry_table')
+
+    def test_get_table_model_rebuilds_class_when_schema_changes(self):
+        # Arrange
+        tableObj = TableName.objects.create(table_name="registry_table")
+        old_model = get_table_model(tableObj, self.table_fields)
+
+        # Act
+        new_model = get_table_model(tableObj, self.table_fields + [{
+            'field_name': 'second',
+            'field_type': 'STRING'
+        }])
+
+        # Assert
+        self.assertIsNot(old_model, new_model)
+        self.assertEqual(
+            [field.name for field in new_model._meta.fields],
+            ['id', 'first', 'second']
+        )
+        self.assertIs(apps.get_model('table', 'registry_table'), new_model)
+
+    def test_registry_evicts_least_recently_used_models(self):
+        # Arrange
+        registry = ModelRegistry(max_size=2)
+        build = lambda name: lambda: create_model(
+            name,
+            fields=self.table_fields,
+            app_label='table',
+            module='table.models'
+        )
+
+        registry.get(1, 'v1', build('lru_first'))
+        registry.get(2, 'v1', build('lru_second'))
+        registry.get(1, 'v1', build('lru_first'))
+
+        # Act
+        registry.get(3, 'v1', build('lru_third'))
+
+        # Assert
+        self.assertIn(1, registry)
+        self.assertNotIn(2, registry)
+        self.assertIn(3, registry)
+        self.assertNotIn('lru_second', apps.all_models['table'])
+        self.assertIn('tablename', apps.all_models['table'])
+
+    def test_unregister_dynamic_model_keeps_cached_options_of_other_models(self):
+        # Arrange
+        model = create_model(
+            'unregistered', fields=self.table_fields, app_label='table', module='table.models'
+        )
+        self.assertIn(model, apps.get_models())
+        # Reading the fields caches them on the options of the model
+        self.assertTrue(TableName._meta.fields)
+
+        # Act
+        unregister_dynamic_model('unregistered', model=model)
+
+        # Assert
+        self.assertNotIn(model, apps.get_models())
+        self.assertIn('fields', TableName._meta.__dict__)
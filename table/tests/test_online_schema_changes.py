@@ -0,0 +1,179 @@
+import ujson
+from django.db import DatabaseError, connection, connections
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from table.models import TableName
+from table.online_schema_changes import apply_table_schema_change_online
+from table.registry import get_table_model
+
+
+class OnlineSchemaChangeTestCase(APITransactionTestCase):
+    def setUp(self):
+        data = {
+            'table_name': "migrated_table",
+            'table_fields': [
+                {
+                    'field_name': 'code',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'note',
+                    'field_type': 'string'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['code'], 'index_name': 'migrated_codes'}
+        )
+        self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': self.table_id}),
+            {'rows': [{'code': code, 'note': 'n'} for code in ['1', '2', 'x', ' 40 ', '5']]}
+        )
+        self.reversed_url = reverse('update-table-structure', kwargs={'table_id': self.table_id})
+
+    def tearDown(self):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE IF EXISTS table_migrated_table;')
+
+    def get_column_names(self):
+        with connection.cursor() as cursor:
+            return [
+                column.name
+                for column in connection.introspection.get_table_description(
+                    cursor, 'table_migrated_table'
+                )
+            ]
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=2)
+    def test_update_table_structure_online_converts_rows_and_rebuilds_indexes(self):
+        # Act
+        response = self.client.put(self.reversed_url, {
+            'new_table_fields': [
+                {'field_name': 'code', 'field_type': 'number'},
+                {'field_name': 'active', 'field_type': 'boolean'}
+            ],
+            'online': True
+        })
+
+        # Assert
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        self.assertEqual(
+            list(model.objects.order_by('id').values_list('code', 'active')),
+            [(1, False), (2, False), (None, False), (40, False), (5, False)]
+        )
+        self.assertEqual(sorted(self.get_column_names()), ['active', 'code', 'id'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'table_migrated_table'"
+            )
+            self.assertIn('migrated_codes', [row[0] for row in cursor.fetchall()])
+            cursor.execute(
+                "SELECT count(*) FROM pg_trigger WHERE tgrelid = 'table_migrated_table'::regclass"
+                " AND NOT tgisinternal"
+            )
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        TABLE_ONLINE_LOCK_TIMEOUT_MS=10,
+        TABLE_ONLINE_LOCK_ATTEMPTS=2,
+        TABLE_ONLINE_LOCK_BACKOFF_MS=1
+    )
+    def test_update_table_structure_online_gives_up_on_busy_table(self):
+        # Arrange
+        reader = connections.create_connection('default')
+        reader_cursor = reader.cursor()
+        reader_cursor.execute('BEGIN')
+        reader_cursor.execute('LOCK TABLE table_migrated_table IN ACCESS SHARE MODE')
+
+        # Act
+        try:
+            response = self.client.put(self.reversed_url, {
+                'new_table_fields': [
+                    {'field_name': 'code', 'field_type': 'number'},
+                    {'field_name': 'note', 'field_type': 'string'}
+                ],
+                'online': True
+            })
+        finally:
+            reader_cursor.execute('ROLLBACK')
+            reader.close()
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content), [
+            'Table migrated_table is busy, its structure was not changed.'
+        ])
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).table_fields[0]['field_type'], 'STRING'
+        )
+        self.assertEqual(sorted(self.get_column_names()), ['code', 'id', 'note'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TABLE_ONLINE_LOCK_ATTEMPTS=1, TABLE_ONLINE_LOCK_TIMEOUT_MS=50)
+    def test_update_table_structure_online_reports_original_error_in_case_of_failed_cleanup(self):
+        # Arrange
+        tableObj = TableName.objects.get(pk=self.table_id)
+        reader = connections.create_connection('default')
+        reader_cursor = reader.cursor()
+
+        def fail_backfill(**progress):
+            # The lock makes removing the shadow columns time out
+            reader_cursor.execute('BEGIN')
+            reader_cursor.execute('LOCK TABLE table_migrated_table IN ACCESS SHARE MODE')
+            raise DatabaseError('backfill failed')
+
+        # Act
+        try:
+            with self.assertRaises(Exception) as context:
+                apply_table_schema_change_online(
+                    tableObj,
+                    [
+                        {'field_name': 'code', 'field_type': 'number'},
+                        {'field_name': 'note', 'field_type': 'string'}
+                    ],
+                    progress=fail_backfill
+                )
+        finally:
+            reader_cursor.execute('ROLLBACK')
+            reader.close()
+
+        # Assert
+        self.assertEqual(
+            context.exception.detail, ['Could not change table structure: backfill failed']
+        )
+        self.assertIsInstance(context.exception.__cause__, DatabaseError)
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).table_fields[0]['field_type'], 'STRING'
+        )
+
+    def test_apply_table_schema_change_online_diffs_against_schema_changed_meanwhile(self):
+        # Arrange
+        stale_table = TableName.objects.get(pk=self.table_id)
+        self.client.put(self.reversed_url, {
+            'new_table_fields': [
+                {'field_name': 'code', 'field_type': 'string'},
+                {'field_name': 'note', 'field_type': 'string'},
+                {'field_name': 'active', 'field_type': 'boolean'}
+            ]
+        })
+
+        # Act
+        apply_table_schema_change_online(stale_table, [
+            {'field_name': 'code', 'field_type': 'string'},
+            {'field_name': 'active', 'field_type': 'boolean'}
+        ])
+
+        # Assert
+        tableObj = TableName.objects.get(pk=self.table_id)
+        self.assertEqual(
+            [field['field_name'] for field in tableObj.table_fields], ['code', 'active']
+        )
+        self.assertEqual(tableObj.schema_version, 3)
+        self.assertEqual(sorted(self.get_column_names()), ['active', 'code', 'id'])
@@ -0,0 +1,258 @@
+import io
+
+import ujson
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from table.models import TableName
+from table.partitions import maintain_table_partitions
+from table.registry import get_table_model
+
+
+@override_settings(TABLE_PARTITIONS_AHEAD=2)
+class PartitionedTablesTestCase(APITransactionTestCase):
+    def tearDown(self):
+        with connection.schema_editor() as schema_editor:
+            for table_name in ('table_ranged_table', 'table_hashed_table'):
+                schema_editor.execute('DROP TABLE IF EXISTS {};'.format(table_name))
+
+    def create_table(self, table_name, partitioning):
+        response = self.client.post(reverse('generate-table'), {
+            'table_name': table_name,
+            'table_fields': [
+                {'field_name': 'title', 'field_type': 'string'},
+                {'field_name': 'amount', 'field_type': 'number'}
+            ],
+            'partitioning': partitioning
+        })
+        return ujson.decode(response.content)['table_id']
+
+    def add_rows(self, table_id, rows):
+        return self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': table_id}), {'rows': rows}
+        )
+
+    def get_partitions(self, table_id):
+        response = self.client.get(reverse('table-partitions', kwargs={'table_id': table_id}))
+        return ujson.decode(response.content)['partitions']
+
+    def count_rows(self, table_id):
+        tableObj = TableName.objects.get(pk=table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return model.objects.count()
+
+    def test_generate_table_partitioned_by_id_creates_partitions_ahead_of_last_id(self):
+        # Arrange
+        table_id = self.create_table('ranged_table', {'method': 'range', 'interval': 10})
+        self.add_rows(table_id, [{'title': 'row', 'amount': amount} for amount in range(25)])
+
+        # Act
+        stdout = io.StringIO()
+        call_command('manage_table_partitions', stdout=stdout)
+        response = self.client.get(reverse('get-table-rows', kwargs={'table_id': table_id}))
+
+        # Assert
+        self.assertIn('Created 2 partitions.', stdout.getvalue())
+        self.assertEqual(
+            [
+                (partition['partition_name'], partition['lower_bound'])
+                for partition in self.get_partitions(table_id)
+            ],
+            [
+                ('table_ranged_table_p0', 0),
+                ('table_ranged_table_p1', 10),
+                ('table_ranged_table_p2', 20),
+                ('table_ranged_table_p3', 30),
+                ('table_ranged_table_p4', 40),
+                ('table_ranged_table_default', None),
+            ]
+        )
+        self.assertEqual(len(ujson.decode(response.content)), 25)
+        response = self.client.put(
+            reverse('update-table-structure', kwargs={'table_id': table_id}),
+            {
+                'new_table_fields': [
+                    {'field_name': 'title', 'field_type': 'string'},
+                    {'field_name': 'amount', 'field_type': 'number'},
+                    {'field_name': 'active', 'field_type': 'boolean'}
+                ]
+            }
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            TableName.objects.get(pk=table_id).partitioning,
+            {'method': 'range', 'field': 'id', 'interval': 10}
+        )
+
+    def test_manage_table_partitions_moves_rows_out_of_default_partition(self):
+        # Arrange
+        table_id = self.create_table(
+            'ranged_table', {'method': 'range', 'field': 'amount', 'interval': 100}
+        )
+        self.add_rows(table_id, [
+            {'title': 'first', 'amount': 5},
+            {'title': 'second', 'amount': 150},
+            {'title': 'third', 'amount': -3}
+        ])
+
+        # Act
+        call_command('manage_table_partitions', stdout=io.StringIO())
+
+        # Assert
+        partitions = {
+            partition['partition_name']: partition for partition in self.get_partitions(table_id)
+        }
+        self.assertEqual(sorted(partitions), [
+            'table_ranged_table_default',
+            'table_ranged_table_m1',
+            'table_ranged_table_p0',
+            'table_ranged_table_p1',
+        ])
+        self.assertEqual(
+            (partitions['table_ranged_table_m1']['lower_bound'],
+             partitions['table_ranged_table_m1']['upper_bound']),
+            (-100, 0)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM table_ranged_table_default')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(self.count_rows(table_id), 3)
+
+    def test_update_table_structure_rejects_retyping_partition_field(self):
+        # Arrange
+        table_id = self.create_table(
+            'ranged_table', {'method': 'range', 'field': 'amount', 'interval': 100}
+        )
+
+        # Act
+        response = self.client.put(
+            reverse('update-table-structure', kwargs={'table_id': table_id}),
+            {
+                'new_table_fields': [
+                    {'field_name': 'title', 'field_type': 'string'},
+                    {'field_name': 'amount', 'field_type': 'string'}
+                ]
+            }
+        )
+
+        # Assert
+        self.assertEqual(
+            ujson.decode(response.content),
+            ['Partition field amount can not be removed or retyped.']
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_generate_table_rejects_partition_field_which_is_not_number(self):
+        # Act
+        response = self.client.post(reverse('generate-table'), {
+            'table_name': 'ranged_table',
+            'table_fields': [{'field_name': 'title', 'field_type': 'string'}],
+            'partitioning': {'method': 'range', 'field': 'title'}
+        })
+
+        # Assert
+        self.assertEqual(
+            ujson.decode(response.content),
+            {'partitioning': ['Partition field must be id or a number field.']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_table_index_builds_index_on_every_hash_partition(self):
+        # Arrange
+        table_id = self.create_table('hashed_table', {'method': 'hash', 'partitions': 4})
+        self.add_rows(table_id, [{'title': str(amount), 'amount': amount} for amount in range(20)])
+        reversed_url = reverse('table-indexes', kwargs={'table_id': table_id})
+
+        # Act
+        response = self.client.post(reversed_url, {
+            'fields': ['amount'], 'index_name': 'hashed_amounts'
+        })
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.get_partitions(table_id)), 4)
+        self.assertTrue(ujson.decode(self.client.get(reversed_url).content)[0]['is_valid'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_partition_tree('hashed_amounts') WHERE isleaf"
+            )
+            self.assertEqual(cursor.fetchone()[0], 4)
+
+        self.client.delete(reverse(
+            'delete-table-index', kwargs={'table_id': table_id, 'index_name': 'hashed_amounts'}
+        ))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_indexes WHERE indexname LIKE '%%hashed_amounts'"
+            )
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_delete_table_partition_drops_its_rows(self):
+        # Arrange
+        table_id = self.create_table('ranged_table', {'method': 'range', 'interval': 10})
+        self.add_rows(table_id, [{'title': 'row', 'amount': amount} for amount in range(15)])
+
+        # Act
+        response = self.client.delete(reverse('delete-table-partition', kwargs={
+            'table_id': table_id, 'partition_name': 'table_ranged_table_p0'
+        }))
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.count_rows(table_id), 6)
+        response = self.client.delete(reverse('delete-table-partition', kwargs={
+            'table_id': table_id, 'partition_name': 'table_ranged_table_default'
+        }))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.delete(reverse('delete-table-partition', kwargs={
+            'table_id': table_id, 'partition_name': 'table_ranged_table_p0'
+        }))
+        self.assertEqual(
+            ujson.decode(response.content), {'detail': 'Partition not found.'}
+        )
+
+    def test_maintain_table_partitions_skips_table_whose_schema_is_being_changed(self):
+        # Arrange
+        table_id = self.create_table('ranged_table', {'method': 'range', 'interval': 10})
+        self.add_rows(table_id, [{'title': 'row', 'amount': amount} for amount in range(25)])
+        schema_changer = connections.create_connection('default')
+
+        # Act
+        try:
+            with schema_changer.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(7301, %s)", [table_id])
+            skipped_partitions = maintain_table_partitions()
+        finally:
+            schema_changer.close()
+        created_partitions = maintain_table_partitions()
+
+        # Assert
+        self.assertEqual(skipped_partitions, {})
+        self.assertEqual(
+            created_partitions, {'ranged_table': ['table_ranged_table_p3', 'table_ranged_table_p4']}
+        )
+
+    def test_add_table_row_rejects_upsert_into_table_partitioned_by_id(self):
+        # Arrange
+        table_id = self.create_table('ranged_table', {'method': 'range', 'interval': 10})
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': table_id}),
+            {'fields': ['id', 'title'], 'unique': True, 'index_name': 'ranged_titles'}
+        )
+
+        # Act
+        response = self.client.post(
+            reverse('add-table-row', kwargs={'table_id': table_id})
+            + '?on_conflict=ignore&conflict_fields=id,title',
+            {'title': 'row', 'amount': 1}
+        )
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content), {
+            'conflict_fields': ["Conflict fields can not contain id, it is generated on insert."]
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,73 @@
+import io
+from decimal import Decimal
+
+import ujson
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from table.models import TableName
+from table.rows import build_row_converter, encode_table_rows, get_row_field_names
+
+TABLE_FIELDS = [
+    {'field_name': 'title', 'field_type': 'STRING'},
+    {'field_name': 'amount', 'field_type': 'NUMBER'},
+    {'field_name': 'active', 'field_type': 'BOOLEAN'},
+]
+
+
+class RowEncodingTestCase(SimpleTestCase):
+    def test_get_row_field_names_puts_id_before_schema_fields(self):
+        # Act
+        field_names = get_row_field_names(TABLE_FIELDS)
+
+        # Assert
+        self.assertEqual(field_names, ['id', 'title', 'amount', 'active'])
+
+    def test_build_row_converter_keeps_column_order_and_converts_numbers(self):
+        # Arrange
+        convert = build_row_converter(TABLE_FIELDS)
+
+        # Act
+        rows = [
+            convert((1, 'first', Decimal('7'), True)),
+            convert((2, None, None, False)),
+        ]
+
+        # Assert
+        self.assertEqual(
+            [list(row.items()) for row in rows],
+            [
+                [('id', 1), ('title', 'first'), ('amount', 7), ('active', True)],
+                [('id', 2), ('title', None), ('amount', None), ('active', False)],
+            ]
+        )
+        self.assertIs(type(rows[0]['amount']), int)
+
+    def test_encode_table_rows_returns_json_bytes(self):
+        # Act
+        content = encode_table_rows(TABLE_FIELDS, [(1, 'ünï/code', 3, False)])
+
+        # Assert
+        self.assertEqual(
+            content,
+            '[{"id":1,"title":"ünï/code","amount":3,"active":false}]'.encode()
+        )
+        self.assertEqual(
+            ujson.decode(content),
+            [{'id': 1, 'title': 'ünï/code', 'amount': 3, 'active': False}]
+        )
+
+
+class BenchmarkTableRowsTestCase(TestCase):
+    def test_benchmark_table_rows_reports_both_read_paths(self):
+        # Arrange
+        stdout = io.StringIO()
+
+        # Act
+        call_command('benchmark_table_rows', rows=10, repeat=1, stdout=stdout)
+
+        # Assert
+        output = stdout.getvalue()
+        self.assertIn('serializer', output)
+        self.assertIn('values_list', output)
+        self.assertFalse(TableName.objects.filter(table_name='benchmark_rows').exists())
@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from table.utils import create_serializer_model
+from table.validators import compile_row_validator
+
+
+class RowValidatorTestCase(SimpleTestCase):
+    table_fields = [
+        {
+            'field_name': 'title',
+            'field_type': 'STRING'
+        },
+        {
+            'field_name': 'amount',
+            'field_type': 'NUMBER'
+        },
+        {
+            'field_name': 'active',
+            'field_type': 'BOOLEAN'
+        }
+    ]
+
+    rows = [
+        {'title': ' first ', 'amount': 1, 'active': True},
+        {'title': 12, 'amount': '13', 'active': 'false'},
+        {'title': 1.5, 'amount': 2.0, 'active': 1},
+        {'title': 'x' * 256, 'amount': 1.5, 'active': 'maybe'},
+        {'title': '   ', 'amount': True, 'active': None},
+        {'title': False, 'amount': '1' * 1001, 'active': []},
+        {'title': 'null\x00char', 'amount': None},
+        {'title': ['list'], 'amount': {}, 'active': 'on', 'unknown': 1},
+        {},
+        [],
+        'row',
+    ]
+
+    def test_row_validator_matches_serializer_validation(self):
+        # Arrange
+        serializer_model = create_serializer_model(
+            "validated_table_serializer",
+            fields=self.table_fields,
+            app_label='table',
+            module='table.models'
+        )
+        row_validator = compile_row_validator(self.table_fields)
+
+        for row in self.rows:
+            with self.subTest(row=row):
+                serializer = serializer_model(data=row)
+
+                # Act
+                validated_data, errors = row_validator(row)
+
+                # Assert
+                if serializer.is_valid():
+                    self.assertIsNone(errors)
+                    self.assertEqual(validated_data, serializer.data)
+                else:
+                    self.assertIsNone(validated_data)
+                    self.assertEqual(errors, serializer.errors)
+                    for field_name, field_errors in errors.items():
+                        self.assertEqual(
+                            [error.code for error in field_errors],
+                            [error.code for error in serializer.errors[field_name]]
+                        )
@@ -0,0 +1,106 @@
+import ujson
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework import status
+
+from table.cache import MemoryRowsCache
+
+
+class MemoryRowsCacheTestCase(SimpleTestCase):
+    def test_memory_rows_cache_evicts_least_recently_used_pages(self):
+        # Arrange
+        rows_cache = MemoryRowsCache(max_bytes=80)
+        rows_cache.set(1, 'first', (b'x' * 10, None))
+        rows_cache.set(1, 'second', (b'x' * 10, None))
+        rows_cache.get(1, 'first')
+
+        # Act
+        for index in range(7):
+            rows_cache.set(2, 'other {}'.format(index), (b'x' * 10, None))
+
+        # Assert
+        self.assertIsNotNone(rows_cache.get(1, 'first'))
+        self.assertIsNone(rows_cache.get(1, 'second'))
+        self.assertTrue(rows_cache.size <= 80)
+
+    def test_memory_rows_cache_invalidates_pages_of_table(self):
+        # Arrange
+        rows_cache = MemoryRowsCache(max_bytes=1024)
+        rows_cache.set(1, 'first', (b'[]', None))
+        rows_cache.set(2, 'second', (b'[]', None))
+
+        # Act
+        rows_cache.invalidate_table(1)
+
+        # Assert
+        self.assertIsNone(rows_cache.get(1, 'first'))
+        self.assertIsNotNone(rows_cache.get(2, 'second'))
+        self.assertEqual(rows_cache.size, 2)
+
+
+class CachedTableRowsTestCase(TestCase):
+    def setUp(self):
+        data = {
+            'table_name': "cached_table",
+            'table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            data,
+            content_type="application/json"
+        )
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.add_table_row_reversed_url = reverse('add-table-row', kwargs={
+            'table_id': self.table_id,
+        })
+        self.reversed_url = reverse('get-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        self.client.post(
+            self.add_table_row_reversed_url,
+            {'first': 1},
+            content_type="application/json"
+        )
+
+    def assert_served_from_cache(self, expected_rows):
+        self.client.get(self.reversed_url, {'limit': 10})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.reversed_url, {'limit': 10})
+
+        self.assertEqual(
+            [row['first'] for row in ujson.decode(response.content)], expected_rows
+        )
+        self.assertFalse(any(
+            'table_cached_table' in query['sql'] for query in queries.captured_queries
+        ))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TABLE_ROWS_CACHE={'BACKEND': 'memory'})
+    def test_get_table_rows_serves_pages_from_memory_cache_until_rows_are_added(self):
+        # Act & Assert
+        self.assert_served_from_cache([1])
+
+        self.client.post(
+            self.add_table_row_reversed_url,
+            {'first': 2},
+            content_type="application/json"
+        )
+
+        self.assert_served_from_cache([1, 2])
+
+    @override_settings(
+        TABLE_ROWS_CACHE={'BACKEND': 'django', 'CACHE_ALIAS': 'default'},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    )
+    def test_get_table_rows_serves_pages_from_django_cache(self):
+        # Act & Assert
+        self.assert_served_from_cache([1])
@@ -0,0 +1,78 @@
+import threading
+
+from django.test import TestCase, TransactionTestCase
+
+from table.models import TableName
+from table.notifications import SchemaChangeListener, publish_schema_change
+from table.registry import get_table_model, model_registry
+from table.signals import table_schema_changed
+
+
+class SchemaChangeListenerTestCase(TransactionTestCase):
+    def setUp(self):
+        self.received = []
+        self.delivered = threading.Event()
+
+        self.listener = SchemaChangeListener(poll_timeout=0.1)
+        self.listener.start()
+        self.assertTrue(self.listener.listening.wait(5))
+
+        table_schema_changed.connect(self.on_schema_changed)
+
+    def tearDown(self):
+        table_schema_changed.disconnect(self.on_schema_changed)
+        self.listener.stop()
+        self.listener.join(5)
+
+    def on_schema_changed(self, sender, table_id, schema_version, **kwargs):
+        if sender is SchemaChangeListener:
+            self.received.append((table_id, schema_version))
+            self.delivered.set()
+
+    def test_listener_receives_published_schema_change(self):
+        # Act
+        publish_schema_change(7, 3)
+
+        # Assert
+        self.assertTrue(self.delivered.wait(5))
+        self.assertEqual(self.received, [(7, 3)])
+
+
+class SchemaChangeInvalidationTestCase(TestCase):
+    def setUp(self):
+        model_registry.clear()
+        self.table_fields = [
+            {
+                'field_name': 'first',
+                'field_type': 'NUMBER'
+            }
+        ]
+
+    def test_schema_change_invalidates_only_outdated_table_models(self):
+        # Arrange
+        tableObj = TableName.objects.create(table_name="notified_table")
+        otherTableObj = TableName.objects.create(table_name="other_table")
+        get_table_model(tableObj, self.table_fields, 1)
+        get_table_model(otherTableObj, self.table_fields, 1)
+
+        # Act
+        table_schema_changed.send(
+            sender=SchemaChangeListener, table_id=tableObj.pk, schema_version=2
+        )
+
+        # Assert
+        self.assertNotIn(tableObj.pk, model_registry)
+        self.assertIn(otherTableObj.pk, model_registry)
+
+    def test_schema_change_keeps_models_built_for_same_version(self):
+        # Arrange
+        tableObj = TableName.objects.create(table_name="notified_table")
+        get_table_model(tableObj, self.table_fields, 2)
+
+        # Act
+        table_schema_changed.send(
+            sender=SchemaChangeListener, table_id=tableObj.pk, schema_version=2
+        )
+
+        # Assert
+        self.assertIn(tableObj.pk, model_registry)
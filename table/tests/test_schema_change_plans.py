@@ -0,0 +1,126 @@
+import ujson
+from django.db import connection
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from table.models import TableName
+
+
+class SchemaChangePlanTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "planned_table",
+            'table_fields': [
+                {
+                    'field_name': 'code',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'note',
+                    'field_type': 'string'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['code'], 'index_name': 'planned_codes'}
+        )
+        self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': self.table_id}),
+            {'rows': [{'code': str(code), 'note': 'n'} for code in range(5)]}
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE table_planned_table')
+
+        self.reversed_url = reverse('update-table-structure', kwargs={'table_id': self.table_id})
+
+    def test_update_table_structure_dry_run_returns_rewrite_plan_without_changing_table(self):
+        # Act
+        response = self.client.put(self.reversed_url, {
+            'new_table_fields': [
+                {'field_name': 'code', 'field_type': 'number'},
+                {'field_name': 'note', 'field_type': 'string'},
+                {'field_name': 'active', 'field_type': 'boolean'}
+            ],
+            'dry_run': True
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertTrue(response_content['rewrites_table'])
+        self.assertEqual(response_content['strongest_lock'], 'ACCESS EXCLUSIVE')
+        self.assertEqual(response_content['row_count_estimate'], 5)
+        self.assertEqual(
+            [(step['lock'], step['effect']) for step in response_content['steps']],
+            [
+                ('ACCESS EXCLUSIVE', 'metadata'),
+                ('ACCESS EXCLUSIVE', 'rewrite'),
+                ('ACCESS EXCLUSIVE', 'metadata'),
+                ('SHARE', 'index_build'),
+            ]
+        )
+        self.assertEqual(
+            response_content['steps'][0]['sql'], 'DROP INDEX IF EXISTS "planned_codes"'
+        )
+        self.assertEqual(response_content['steps'][1]['rows_estimate'], 5)
+        self.assertEqual(
+            response_content['steps'][1]['bytes_estimate'], response_content['total_size_bytes']
+        )
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).table_fields[0]['field_type'], 'STRING'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=2)
+    def test_update_table_structure_dry_run_returns_online_plan(self):
+        # Act
+        response = self.client.put(self.reversed_url, {
+            'new_table_fields': [
+                {'field_name': 'code', 'field_type': 'number'}
+            ],
+            'online': True,
+            'dry_run': True
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertFalse(response_content['rewrites_table'])
+        backfill_step = [
+            step for step in response_content['steps'] if step['effect'] == 'backfill'
+        ][0]
+        self.assertEqual(backfill_step['lock'], 'ROW EXCLUSIVE')
+        self.assertEqual(backfill_step['batches_estimate'], 3)
+        self.assertEqual(
+            response_content['steps'][-1]['sql'],
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS "planned_codes" '
+            'ON "table_planned_table" ("code")'
+        )
+        self.assertEqual(response_content['steps'][-1]['lock'], 'SHARE UPDATE EXCLUSIVE')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_structure_dry_run_of_added_field_touches_no_rows(self):
+        # Act
+        response = self.client.put(self.reversed_url, {
+            'new_table_fields': [
+                {'field_name': 'code', 'field_type': 'string'},
+                {'field_name': 'amount', 'field_type': 'number'}
+            ],
+            'dry_run': True
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['steps'], [{
+            'sql': 'ALTER TABLE "table_planned_table" DROP COLUMN "note", '
+                   'ADD COLUMN "amount" integer NULL',
+            'lock': 'ACCESS EXCLUSIVE',
+            'effect': 'metadata',
+            'rows_estimate': 0,
+            'bytes_estimate': 0,
+        }])
+        self.assertFalse(response_content['rewrites_table'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
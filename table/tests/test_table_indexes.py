@@ -0,0 +1,207 @@
+import ujson
+from django.db import connection
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from table.models import TableName
+
+
+def get_index_definition(index_name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE indexname = %s;", [index_name]
+        )
+        result = cursor.fetchone()
+
+    return result[0] if result else None
+
+
+class TableIndexesTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "indexed_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'active',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.reversed_url = reverse('table-indexes', kwargs={
+            'table_id': self.table_id
+        })
+
+    def test_table_indexes_returns_error_in_case_of_table_not_found(self):
+        # Arrange
+        reversed_url = reverse('table-indexes', kwargs={
+            'table_id': self.table_id + 1
+        })
+
+        # Act
+        response = self.client.get(reversed_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_table_indexes_creates_single_column_index_in_case_of_success(self):
+        # Act
+        response = self.client.post(self.reversed_url, {'fields': ['amount']})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['index_name'], 'table_indexed_table_amount_idx')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(self.reversed_url)
+        indexes = ujson.decode(response.content)
+        self.assertTrue(indexes[0].pop('size_bytes') > 0)
+        self.assertEqual(indexes, [{
+            'index_name': 'table_indexed_table_amount_idx',
+            'fields': ['amount'],
+            'unique': False,
+            'condition': {},
+            'is_valid': True,
+        }])
+
+    def test_table_indexes_creates_composite_partial_unique_index(self):
+        # Arrange
+        data = {
+            'index_name': 'active_titles',
+            'fields': ['title', 'amount'],
+            'unique': True,
+            'condition': {'active__eq': True}
+        }
+
+        # Act
+        response = self.client.post(self.reversed_url, data)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            get_index_definition('active_titles'),
+            'CREATE UNIQUE INDEX active_titles ON public.table_indexed_table '
+            'USING btree (title, amount) WHERE active'
+        )
+
+    def test_table_indexes_returns_error_in_case_of_unknown_fields(self):
+        # Act
+        response = self.client.post(self.reversed_url, {
+            'fields': ['missing'],
+            'condition': {'amount__prefix': '1'}
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['fields'], ["Unknown fields: ['missing']."])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_table_index_drops_index_in_case_of_success(self):
+        # Arrange
+        self.client.post(self.reversed_url, {'fields': ['amount'], 'index_name': 'amounts'})
+        reversed_url = reverse('delete-table-index', kwargs={
+            'table_id': self.table_id,
+            'index_name': 'amounts'
+        })
+
+        # Act
+        response = self.client.delete(reversed_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(get_index_definition('amounts'))
+        self.assertEqual(TableName.objects.get(pk=self.table_id).indexes, [])
+
+        response = self.client.delete(reversed_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_table_structure_forgets_indexes_of_removed_fields(self):
+        # Arrange
+        self.client.post(self.reversed_url, {'fields': ['amount'], 'index_name': 'amounts'})
+        reversed_url = reverse('update-table-structure', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.put(reversed_url, {
+            'new_table_fields': [
+                {
+                    'field_name': 'qqq',
+                    'field_type': 'number'
+                }
+            ]
+        })
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(TableName.objects.get(pk=self.table_id).indexes, [])
+        self.assertIsNone(get_index_definition('amounts'))
+
+
+class ConcurrentTableIndexesTestCase(APITransactionTestCase):
+    def test_table_indexes_builds_index_concurrently_outside_of_transaction(self):
+        # Arrange
+        data = {
+            'table_name': "concurrently_indexed",
+            'table_fields': [
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        table_id = ujson.decode(response.content)['table_id']
+        reversed_url = reverse('table-indexes', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {'fields': ['amount'], 'index_name': 'amounts'})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNotNone(get_index_definition('amounts'))
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE table_concurrently_indexed;')
+
+    def test_table_indexes_rejects_index_name_used_by_other_table(self):
+        # Arrange
+        table_ids = []
+        for table_name in ('first_indexed', 'second_indexed'):
+            response = self.client.post(reverse('generate-table'), {
+                'table_name': table_name,
+                'table_fields': [{'field_name': 'amount', 'field_type': 'number'}]
+            })
+            table_ids.append(ujson.decode(response.content)['table_id'])
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': table_ids[0]}),
+            {'fields': ['amount'], 'index_name': 'shared_idx'}
+        )
+
+        # Act
+        response = self.client.post(
+            reverse('table-indexes', kwargs={'table_id': table_ids[1]}),
+            {'fields': ['amount'], 'index_name': 'shared_idx'}
+        )
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content), ['Index name shared_idx is already used.'])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('table_first_indexed', get_index_definition('shared_idx'))
+        self.assertEqual(TableName.objects.get(pk=table_ids[1]).indexes, [])
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE table_first_indexed;')
+            schema_editor.execute('DROP TABLE table_second_indexed;')
@@ -0,0 +1,202 @@
+import io
+import os
+
+import ujson
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from table.jobs import fail_abandoned_table_jobs, run_table_job
+from table.models import TableJob, TableName
+from table.registry import get_table_model
+
+
+class TableJobsTestCase(APITransactionTestCase):
+    def setUp(self):
+        data = {
+            'table_name': "queued_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'string'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+
+    def tearDown(self):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE IF EXISTS table_queued_table;')
+
+    def run_workers(self):
+        stdout = io.StringIO()
+        call_command('run_table_jobs', once=True, stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def get_job(self, job_id):
+        response = self.client.get(reverse('get-table-job', kwargs={'job_id': job_id}))
+        return ujson.decode(response.content)
+
+    def test_update_table_structure_in_background_runs_schema_change_in_worker(self):
+        # Arrange
+        response = self.client.put(
+            reverse('update-table-structure', kwargs={'table_id': self.table_id}),
+            {
+                'new_table_fields': [
+                    {'field_name': 'title', 'field_type': 'string'},
+                    {'field_name': 'amount', 'field_type': 'number'}
+                ],
+                'online': True,
+                'background': True
+            }
+        )
+        response_content = ujson.decode(response.content)
+
+        # Act
+        output = self.run_workers()
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response_content['status'], 'queued')
+        self.assertTrue(response['Location'].endswith(
+            reverse('get-table-job', kwargs={'job_id': response_content['job_id']})
+        ))
+        self.assertIn(
+            'Job {} (schema_change) succeeded.'.format(response_content['job_id']), output
+        )
+        job = self.get_job(response_content['job_id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['result']['table_fields'][1]['field_type'], 'NUMBER')
+        self.assertEqual(
+            TableName.objects.get(pk=self.table_id).table_fields[1]['field_type'], 'NUMBER'
+        )
+
+    @override_settings(TABLE_JOB_FILES_DIR='/tmp/table_job_files_test')
+    def test_upload_table_rows_in_background_imports_saved_file(self):
+        # Arrange
+        response = self.client.post(
+            reverse('upload-table-rows', kwargs={'table_id': self.table_id}) + '?background=true',
+            'title,amount\nfirst,1\nsecond,2\n',
+            content_type='text/csv'
+        )
+        job_id = ujson.decode(response.content)['job_id']
+
+        # Act
+        self.run_workers()
+
+        # Assert
+        job = self.get_job(job_id)
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['result']['rows_loaded'], 2)
+        self.assertEqual(job['progress'], {'done': 1, 'total': 1})
+        self.assertEqual(os.listdir('/tmp/table_job_files_test'), [])
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        self.assertEqual(model.objects.count(), 2)
+
+    def test_cancel_table_job_cancels_queued_job(self):
+        # Arrange
+        response = self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['title'], 'background': True}
+        )
+        job_id = ujson.decode(response.content)['job_id']
+
+        # Act
+        response = self.client.post(reverse('cancel-table-job', kwargs={'job_id': job_id}))
+        self.run_workers()
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content)['status'], 'cancelled')
+        self.assertEqual(self.get_job(job_id)['status'], 'cancelled')
+        self.assertEqual(TableName.objects.get(pk=self.table_id).indexes, [])
+        response = self.client.post(reverse('cancel-table-job', kwargs={'job_id': job_id}))
+        self.assertEqual(
+            ujson.decode(response.content), ['Job {} is already finished.'.format(job_id)]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TABLE_JOB_FILES_DIR='/tmp/table_job_files_test')
+    def test_cancel_table_job_removes_file_of_queued_upload(self):
+        # Arrange
+        response = self.client.post(
+            reverse('upload-table-rows', kwargs={'table_id': self.table_id}) + '?background=true',
+            'title,amount\nfirst,1\n',
+            content_type='text/csv'
+        )
+        job_id = ujson.decode(response.content)['job_id']
+        path = TableJob.objects.get(pk=job_id).params['path']
+
+        # Act
+        response = self.client.post(reverse('cancel-table-job', kwargs={'job_id': job_id}))
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content)['status'], 'cancelled')
+        self.assertFalse(os.path.exists(path))
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=1)
+    def test_cancelled_online_schema_change_removes_shadow_columns(self):
+        # Arrange
+        self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': self.table_id}),
+            {'rows': [{'title': 'row', 'amount': str(amount)} for amount in range(3)]}
+        )
+        job = TableJob.objects.create(
+            table_id=self.table_id,
+            kind=TableJob.SCHEMA_CHANGE,
+            params={
+                'new_table_fields': [
+                    {'field_name': 'title', 'field_type': 'string'},
+                    {'field_name': 'amount', 'field_type': 'number'}
+                ],
+                'online': True
+            },
+            status=TableJob.RUNNING,
+            cancel_requested=True
+        )
+
+        # Act
+        run_table_job(job)
+
+        # Assert
+        job.refresh_from_db()
+        self.assertEqual(job.status, TableJob.CANCELLED)
+        self.assertEqual(job.progress, {'done': 1, 'total': 3})
+        with connection.cursor() as cursor:
+            columns = connection.introspection.get_table_description(cursor, 'table_queued_table')
+        self.assertEqual(sorted(column.name for column in columns), ['amount', 'id', 'title'])
+
+    def test_fail_abandoned_table_jobs_fails_only_jobs_of_stopped_workers(self):
+        # Arrange
+        abandoned_job, running_job = [
+            TableJob.objects.create(
+                table_id=self.table_id, kind=TableJob.CREATE_INDEX, status=TableJob.RUNNING
+            )
+            for _ in range(2)
+        ]
+        worker_connection = connections.create_connection('default')
+        lock_connection = connections.create_connection('default')
+
+        # Act
+        try:
+            with worker_connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(7302, %s)", [running_job.pk])
+            abandoned_job_ids = fail_abandoned_table_jobs(lock_connection)
+        finally:
+            worker_connection.close()
+            lock_connection.close()
+
+        # Assert
+        self.assertEqual(abandoned_job_ids, [abandoned_job.pk])
+        abandoned_job.refresh_from_db()
+        running_job.refresh_from_db()
+        self.assertEqual(abandoned_job.status, TableJob.FAILED)
+        self.assertEqual(running_job.status, TableJob.RUNNING)
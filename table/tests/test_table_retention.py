@@ -0,0 +1,129 @@
+import io
+import time
+
+import ujson
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from table.models import TableName
+from table.registry import get_table_model
+
+
+class TableRetentionTestCase(APITransactionTestCase):
+    def tearDown(self):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.execute('DROP TABLE IF EXISTS table_retained_table;')
+
+    def create_table(self, partitioning=None):
+        data = {
+            'table_name': 'retained_table',
+            'table_fields': [
+                {'field_name': 'title', 'field_type': 'string'},
+                {'field_name': 'created', 'field_type': 'number'}
+            ]
+        }
+        if partitioning:
+            data['partitioning'] = partitioning
+        response = self.client.post(reverse('generate-table'), data)
+        return ujson.decode(response.content)['table_id']
+
+    def add_rows(self, table_id, rows):
+        self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': table_id}), {'rows': rows}
+        )
+
+    def set_retention(self, table_id, retention):
+        return self.client.put(
+            reverse('table-retention', kwargs={'table_id': table_id}), retention
+        )
+
+    def get_row_ids(self, table_id):
+        tableObj = TableName.objects.get(pk=table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=2)
+    def test_purge_table_rows_keeps_newest_rows_in_case_of_max_rows(self):
+        # Arrange
+        table_id = self.create_table()
+        self.add_rows(table_id, [{'title': 'row', 'created': 0} for _ in range(10)])
+        response = self.set_retention(table_id, {'max_rows': 3})
+
+        # Act
+        stdout = io.StringIO()
+        call_command('purge_table_rows', stdout=stdout)
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content)['retention'], {'max_rows': 3})
+        self.assertIn('Purged 7 rows and 0 partitions of retained_table.', stdout.getvalue())
+        self.assertEqual(self.get_row_ids(table_id), [8, 9, 10])
+
+    def test_purge_table_rows_job_deletes_rows_older_than_max_age(self):
+        # Arrange
+        table_id = self.create_table()
+        now = int(time.time())
+        self.add_rows(table_id, [
+            {'title': 'old', 'created': now - 7200},
+            {'title': 'new', 'created': now},
+            {'title': 'older', 'created': now - 9000}
+        ])
+        self.set_retention(table_id, {'max_age_seconds': 3600, 'field': 'created'})
+
+        # Act
+        response = self.client.post(reverse('purge-table-rows', kwargs={'table_id': table_id}))
+        call_command('run_table_jobs', once=True, stdout=io.StringIO(), stderr=io.StringIO())
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = ujson.decode(self.client.get(reverse(
+            'get-table-job', kwargs={'job_id': ujson.decode(response.content)['job_id']}
+        )).content)
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['result'], {'rows_deleted': 2, 'partitions_dropped': []})
+        self.assertEqual(self.get_row_ids(table_id), [2])
+
+    @override_settings(TABLE_PARTITIONS_AHEAD=0)
+    def test_purge_table_rows_drops_expired_partitions_of_partitioned_table(self):
+        # Arrange
+        table_id = self.create_table({'method': 'range', 'interval': 10})
+        self.add_rows(table_id, [{'title': 'row', 'created': 0} for _ in range(25)])
+        call_command('manage_table_partitions', stdout=io.StringIO())
+        self.set_retention(table_id, {'max_rows': 5})
+
+        # Act
+        stdout = io.StringIO()
+        call_command('purge_table_rows', stdout=stdout)
+
+        # Assert
+        self.assertIn('Purged 0 rows and 2 partitions of retained_table.', stdout.getvalue())
+        self.assertEqual(self.get_row_ids(table_id), list(range(20, 26)))
+        response = self.client.get(reverse('table-partitions', kwargs={'table_id': table_id}))
+        self.assertEqual(
+            [
+                partition['partition_name']
+                for partition in ujson.decode(response.content)['partitions']
+            ],
+            ['table_retained_table_p2', 'table_retained_table_default']
+        )
+
+    def test_table_retention_rejects_max_age_on_field_which_is_not_number(self):
+        # Arrange
+        table_id = self.create_table()
+
+        # Act
+        response = self.set_retention(table_id, {'max_age_seconds': 60, 'field': 'title'})
+
+        # Assert
+        self.assertEqual(
+            ujson.decode(response.content), ['Retention field title must be a number field.']
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(TableName.objects.get(pk=table_id).retention, {})
+        response = self.client.post(reverse('purge-table-rows', kwargs={'table_id': table_id}))
+        self.assertEqual(
+            ujson.decode(response.content), ['Table retained_table has no retention rules.']
+        )
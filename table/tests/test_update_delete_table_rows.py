@@ -0,0 +1,135 @@
+import ujson
+from django.test import override_settings
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from table.models import TableName
+from table.registry import get_table_model
+
+
+class UpdateDeleteTableRowsTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "changed_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+
+        response = self.client.post(
+            reverse('bulk-add-table-rows', kwargs={'table_id': self.table_id}),
+            {'rows': [{'title': 'row {}'.format(amount), 'amount': amount} for amount in range(1, 8)]}
+        )
+        self.table_row_ids = ujson.decode(response.content)['table_row_ids']
+
+    def get_table_rows(self):
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return list(model.objects.order_by('id').values_list('title', 'amount'))
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=2)
+    def test_update_table_rows_updates_filtered_rows_in_batches(self):
+        # Arrange
+        reversed_url = reverse('update-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {
+            'where': {'amount__gt': 2, 'amount__ne': 5},
+            'values': {'title': 'big'}
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['updated'], 4)
+        self.assertEqual(response_content['batches'], 2)
+        self.assertEqual([title for title, _ in self.get_table_rows()], [
+            'row 1', 'row 2', 'big', 'big', 'row 5', 'big', 'big'
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_rows_returns_error_in_case_of_invalid_values(self):
+        # Arrange
+        reversed_url = reverse('update-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {
+            'ids': self.table_row_ids[:1],
+            'values': {'amount': 'abc', 'unknown': 1}
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content, {
+            'values': {
+                'amount': ['A valid integer is required.'],
+                'unknown': ['Unknown field.']
+            }
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TABLE_ROWS_BATCH_SIZE=2)
+    def test_delete_table_rows_deletes_selected_rows_in_batches(self):
+        # Arrange
+        reversed_url = reverse('delete-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {
+            'ids': self.table_row_ids[:5],
+            'where': {'amount__gt': 1}
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['deleted'], 4)
+        self.assertEqual(response_content['batches'], 2)
+        self.assertEqual([amount for _, amount in self.get_table_rows()], [1, 6, 7])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete_table_rows_returns_error_in_case_of_filter_without_operator(self):
+        # Arrange
+        reversed_url = reverse('delete-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {'where': {'amount': 1}})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content, {
+            'where': {'amount': ['Filter operator is missing.']}
+        })
+        self.assertEqual(len(self.get_table_rows()), 7)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_table_rows_returns_error_in_case_of_empty_selection(self):
+        # Arrange
+        reversed_url = reverse('delete-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+        # Act
+        response = self.client.post(reversed_url, {})
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content, {
+            'non_field_errors': ['Either ids or where must be provided.']
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,11 +1,12 @@
 import ujson
-from django.db import connection
+from django.db import connection, connections
 from django.test import TestCase
 from django.urls.base import reverse
 from rest_framework import status
 
 from table.models import TableName
 from table.utils import create_model
+from table.validators import RowValidator
 
 
 class UpdateTableStructureTestCase(TestCase):
@@ -169,4 +170,262 @@ class UpdateTableStructureTestCase(TestCase):
             response_content['table_fields'][0]['field_type'], 
             update_data['new_table_fields'][0]['field_type'].upper()
         )
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_structure_stores_new_table_schema_in_case_of_success(self):
+        # Arrange
+        generate_table_data = {
+            'table_name': "eee",
+            'table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            generate_table_data,
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+
+        reversed_url = reverse('update-table-structure', kwargs={
+            'table_id': table_id
+        })
+
+        update_data = {
+            'new_table_fields': [
+                {
+                    'field_name': 'qqq',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+
+        # Act
+        response = self.client.put(
+            reversed_url,
+            update_data,
+            content_type="application/json"
+        )
+
+        # Assert
+        tableObj = TableName.objects.get(pk=table_id)
+        self.assertEqual(tableObj.table_fields, [
+            {'field_name': 'qqq', 'field_type': 'BOOLEAN'}
+        ])
+        self.assertEqual(tableObj.schema_version, 2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_structure_keeps_existing_fields_and_converts_retyped_ones(self):
+        # Arrange
+        generate_table_data = {
+            'table_name': "diffed",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'code',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'gone',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            generate_table_data,
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+        for row in [
+            {'title': 'first', 'code': ' 12 ', 'gone': 1},
+            {'title': 'second', 'code': 'abc', 'gone': 2},
+        ]:
+            self.client.post(
+                reverse('add-table-row', kwargs={'table_id': table_id}),
+                row,
+                content_type="application/json"
+            )
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': table_id}),
+            {'fields': ['title'], 'index_name': 'diffed_title'},
+            content_type="application/json"
+        )
+
+        reversed_url = reverse('update-table-structure', kwargs={
+            'table_id': table_id
+        })
+        update_data = {
+            'new_table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'code',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'active',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+
+        # Act
+        response = self.client.put(
+            reversed_url,
+            update_data,
+            content_type="application/json"
+        )
+
+        # Assert
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT title, code, active FROM table_diffed ORDER BY id;')
+            self.assertEqual(cursor.fetchall(), [('first', 12, False), ('second', None, False)])
+
+        tableObj = TableName.objects.get(pk=table_id)
+        self.assertEqual([index['index_name'] for index in tableObj.indexes], ['diffed_title'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_structure_does_not_change_table_with_same_fields(self):
+        # Arrange
+        generate_table_data = {
+            'table_name': "unchanged",
+            'table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            generate_table_data,
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+
+        reversed_url = reverse('update-table-structure', kwargs={
+            'table_id': table_id
+        })
+
+        # Act
+        response = self.client.put(
+            reversed_url,
+            {'new_table_fields': generate_table_data['table_fields']},
+            content_type="application/json"
+        )
+
+        # Assert
+        self.assertEqual(TableName.objects.get(pk=table_id).schema_version, 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_table_structure_returns_error_in_case_of_duplicate_field_names(self):
+        # Arrange
+        tableObj = TableName.objects.create(table_name="duplicated")
+        reversed_url = reverse('update-table-structure', kwargs={
+            'table_id': tableObj.pk
+        })
+        update_data = {
+            'new_table_fields': [
+                {
+                    'field_name': 'first',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'first',
+                    'field_type': 'string'
+                }
+            ]
+        }
+
+        # Act
+        response = self.client.put(
+            reversed_url,
+            update_data,
+            content_type="application/json"
+        )
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['new_table_fields'][0], 'Field names must be unique.')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_table_structure_returns_error_in_case_of_schema_being_changed(self):
+        # Arrange
+        response = self.client.post(
+            reverse('generate-table'),
+            {
+                'table_name': "locked",
+                'table_fields': [{'field_name': 'first', 'field_type': 'number'}]
+            },
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+        schema_changer = connections.create_connection('default')
+
+        # Act
+        try:
+            with schema_changer.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(7301, %s)", [table_id])
+            response = self.client.put(
+                reverse('update-table-structure', kwargs={'table_id': table_id}),
+                {'new_table_fields': [{'field_name': 'second', 'field_type': 'string'}]},
+                content_type="application/json"
+            )
+        finally:
+            schema_changer.close()
+
+        # Assert
+        self.assertEqual(
+            ujson.decode(response.content), ['Schema of table locked is already being changed.']
+        )
+        self.assertEqual(TableName.objects.get(pk=table_id).schema_version, 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_table_structure_converts_missing_numbers_to_valid_strings(self):
+        # Arrange
+        response = self.client.post(
+            reverse('generate-table'),
+            {
+                'table_name': "renumbered",
+                'table_fields': [{'field_name': 'code', 'field_type': 'string'}]
+            },
+            content_type="application/json"
+        )
+        table_id = ujson.decode(response.content)['table_id']
+        for code in ['12', 'abc']:
+            self.client.post(
+                reverse('add-table-row', kwargs={'table_id': table_id}),
+                {'code': code},
+                content_type="application/json"
+            )
+        reversed_url = reverse('update-table-structure', kwargs={'table_id': table_id})
+        self.client.put(
+            reversed_url,
+            {'new_table_fields': [{'field_name': 'code', 'field_type': 'number'}]},
+            content_type="application/json"
+        )
+
+        # Act
+        response = self.client.put(
+            reversed_url,
+            {'new_table_fields': [{'field_name': 'code', 'field_type': 'string'}]},
+            content_type="application/json"
+        )
+
+        # Assert
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT code FROM table_renumbered ORDER BY id;')
+            codes = [code for code, in cursor.fetchall()]
+        self.assertEqual(codes, ['12', 'null'])
+        row_validator = RowValidator(TableName.objects.get(pk=table_id).table_fields)
+        self.assertEqual([row_validator({'code': code})[1] for code in codes], [None, None])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,149 @@
+import io
+import tempfile
+
+import ujson
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls.base import reverse
+from rest_framework import status
+
+from table.models import TableName
+from table.registry import get_table_model
+
+
+class UploadTableRowsTestCase(TestCase):
+    def setUp(self):
+        data = {
+            'table_name': "uploaded_table",
+            'table_fields': [
+                {
+                    'field_name': 'title',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                },
+                {
+                    'field_name': 'active',
+                    'field_type': 'boolean'
+                }
+            ]
+        }
+        response = self.client.post(
+            reverse('generate-table'),
+            data,
+            content_type="application/json"
+        )
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.reversed_url = reverse('upload-table-rows', kwargs={
+            'table_id': self.table_id
+        })
+
+    def get_table_rows(self):
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return list(model.objects.order_by('id').values_list('title', 'amount', 'active'))
+
+    def test_upload_table_rows_returns_error_in_case_of_unknown_input(self):
+        # Act
+        response = self.client.post(self.reversed_url, 'title', content_type='text/plain')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TABLE_COPY_CHUNK_SIZE=2)
+    def test_upload_table_rows_copies_valid_csv_rows(self):
+        # Arrange
+        content = (
+            'title,amount,active,ignored\n'
+            'first,1,true,x\n'
+            '"with, comma",2,false,x\n'
+            'bad,abc,true,x\n'
+            'overflow,1099511627776,true,x\n'
+            'last,4,1,x\n'
+        )
+
+        # Act
+        response = self.client.post(self.reversed_url, content, content_type='text/csv')
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['rows_loaded'], 3)
+        self.assertEqual(response_content['rows_rejected'], 2)
+        self.assertEqual(
+            [error['line'] for error in response_content['errors']], [4, 5]
+        )
+        self.assertEqual(response_content['errors'][0]['errors'], {
+            'amount': ['A valid integer is required.']
+        })
+        self.assertEqual(self.get_table_rows(), [
+            ('first', 1, True),
+            ('with, comma', 2, False),
+            ('last', 4, True),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(TABLE_COPY_CHUNK_SIZE=10, TABLE_BULK_INSERT_BATCH_SIZE=2)
+    def test_upload_table_rows_inserts_rejected_chunk_in_batches(self):
+        # Arrange
+        content = 'title,amount,active\n' + ''.join(
+            '{},{},true\n'.format(title, amount)
+            for title, amount in [('a', 1), ('b', 2), ('c', 1099511627776), ('d', 4), ('e', 5)]
+        )
+
+        # Act
+        response = self.client.post(self.reversed_url, content, content_type='text/csv')
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['rows_loaded'], 4)
+        self.assertEqual([error['line'] for error in response_content['errors']], [4])
+        self.assertEqual(
+            [title for title, _, _ in self.get_table_rows()], ['a', 'b', 'd', 'e']
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_upload_table_rows_copies_valid_ndjson_rows(self):
+        # Arrange
+        content = (
+            '{"title": "first", "amount": 1, "active": true}\n'
+            '\n'
+            '{"title": "broken"\n'
+            '{"title": "second", "amount": null, "active": false}\n'
+            '{"title": "third", "amount": 3, "active": false}\n'
+        )
+
+        # Act
+        response = self.client.post(
+            self.reversed_url + '?input=ndjson', content, content_type='application/octet-stream'
+        )
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content['rows_loaded'], 2)
+        self.assertEqual(
+            [error['line'] for error in response_content['errors']], [3, 4]
+        )
+        self.assertEqual(self.get_table_rows(), [
+            ('first', 1, True),
+            ('third', 3, False),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_load_table_rows_command_copies_file_rows(self):
+        # Arrange
+        stdout = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as input_file:
+            input_file.write('title,amount,active\nfirst,1,true\nsecond,2,false\n')
+            input_file.flush()
+
+            # Act
+            call_command('load_table_rows', self.table_id, input_file.name, stdout=stdout)
+
+        # Assert
+        self.assertIn('Loaded 2 rows, rejected 0 rows', stdout.getvalue())
+        self.assertEqual(self.get_table_rows(), [
+            ('first', 1, True),
+            ('second', 2, False),
+        ])
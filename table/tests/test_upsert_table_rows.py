@@ -0,0 +1,222 @@
+import ujson
+from django.urls.base import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from table.models import TableName
+from table.registry import get_table_model
+
+
+class UpsertTableRowsTestCase(APITestCase):
+    def setUp(self):
+        data = {
+            'table_name': "upserted_table",
+            'table_fields': [
+                {
+                    'field_name': 'sku',
+                    'field_type': 'string'
+                },
+                {
+                    'field_name': 'amount',
+                    'field_type': 'number'
+                }
+            ]
+        }
+        response = self.client.post(reverse('generate-table'), data)
+        self.table_id = ujson.decode(response.content)['table_id']
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['sku'], 'unique': True, 'index_name': 'upserted_sku'}
+        )
+        self.row_url = reverse('add-table-row', kwargs={'table_id': self.table_id})
+        self.bulk_url = reverse('bulk-add-table-rows', kwargs={'table_id': self.table_id})
+
+    def get_table_rows(self):
+        tableObj = TableName.objects.get(pk=self.table_id)
+        model = get_table_model(tableObj, tableObj.table_fields, tableObj.schema_version)
+        return list(model.objects.order_by('id').values_list('id', 'sku', 'amount'))
+
+    def test_add_table_row_replays_request_with_same_idempotency_key(self):
+        # Arrange
+        first_response = self.client.post(
+            self.row_url, {'sku': 'a', 'amount': 1}, HTTP_IDEMPOTENCY_KEY='request-1'
+        )
+
+        # Act
+        response = self.client.post(
+            self.row_url, {'sku': 'a', 'amount': 1}, HTTP_IDEMPOTENCY_KEY='request-1'
+        )
+
+        # Assert
+        self.assertEqual(response.content, first_response.content)
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(self.get_table_rows()), 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_add_table_row_returns_error_in_case_of_idempotency_key_reused_for_other_row(self):
+        # Arrange
+        self.client.post(self.row_url, {'sku': 'a', 'amount': 1}, HTTP_IDEMPOTENCY_KEY='request-1')
+
+        # Act
+        response = self.client.post(
+            self.row_url, {'sku': 'b', 'amount': 2}, HTTP_IDEMPOTENCY_KEY='request-1'
+        )
+
+        # Assert
+        self.assertEqual(len(self.get_table_rows()), 1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_add_table_row_updates_conflicting_row(self):
+        # Arrange
+        first_response = self.client.post(self.row_url + '?on_conflict=update&conflict_fields=sku', {
+            'sku': 'a', 'amount': 1
+        })
+        table_row_id = ujson.decode(first_response.content)['table_row_id']
+
+        # Act
+        response = self.client.post(self.row_url + '?on_conflict=update&conflict_fields=sku', {
+            'sku': 'a', 'amount': 2
+        })
+
+        # Assert
+        self.assertEqual(first_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ujson.decode(response.content)['table_row_id'], table_row_id)
+        self.assertEqual(self.get_table_rows(), [(table_row_id, 'a', 2)])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_add_table_row_returns_error_in_case_of_undeclared_unique_fields(self):
+        # Act
+        response = self.client.post(self.row_url + '?on_conflict=ignore&conflict_fields=amount', {
+            'sku': 'a', 'amount': 1
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual(response_content, {
+            'conflict_fields': ["No unique index on fields ['amount']."]
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_add_table_rows_ignores_conflicting_rows(self):
+        # Arrange
+        response = self.client.post(self.row_url, {'sku': 'a', 'amount': 1})
+        table_row_id = ujson.decode(response.content)['table_row_id']
+
+        # Act
+        response = self.client.post(self.bulk_url, {
+            'rows': [
+                {'sku': 'a', 'amount': 10},
+                {'sku': 'b', 'amount': 2},
+                {'sku': 'b', 'amount': 20},
+            ],
+            'on_conflict': 'ignore',
+            'conflict_fields': ['sku']
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        rows = self.get_table_rows()
+        self.assertEqual([row[1:] for row in rows], [('a', 1), ('b', 2)])
+        self.assertEqual(
+            response_content['table_row_ids'], [table_row_id, rows[1][0], rows[1][0]]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_add_table_rows_updates_conflicting_rows(self):
+        # Arrange
+        self.client.post(self.row_url, {'sku': 'a', 'amount': 1})
+        self.client.post(self.row_url, {'sku': 'b', 'amount': 2})
+
+        # Act
+        response = self.client.post(self.bulk_url, {
+            'rows': [
+                {'sku': 'a', 'amount': 10},
+                {'sku': 'b', 'amount': 2},
+                {'sku': 'c', 'amount': 3},
+            ],
+            'on_conflict': 'update',
+            'conflict_fields': ['sku']
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        self.assertEqual((response_content['inserted'], response_content['updated']), (1, 1))
+        self.assertEqual(
+            [row[1:] for row in self.get_table_rows()], [('a', 10), ('b', 2), ('c', 3)]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_add_table_rows_inserts_rows_outside_of_partial_unique_index(self):
+        # Arrange
+        self.client.delete(reverse(
+            'delete-table-index', kwargs={'table_id': self.table_id, 'index_name': 'upserted_sku'}
+        ))
+        self.client.post(reverse('table-indexes', kwargs={'table_id': self.table_id}), {
+            'fields': ['amount'],
+            'unique': True,
+            'condition': {'sku__eq': 'live'},
+            'index_name': 'upserted_live_amount'
+        })
+
+        # Act
+        response = self.client.post(self.bulk_url, {
+            'rows': [
+                {'sku': 'old', 'amount': 1},
+                {'sku': 'old', 'amount': 1},
+                {'sku': 'live', 'amount': 1},
+                {'sku': 'live', 'amount': 1},
+            ],
+            'on_conflict': 'ignore',
+            'conflict_fields': ['amount']
+        })
+        response_content = ujson.decode(response.content)
+
+        # Assert
+        rows = self.get_table_rows()
+        self.assertEqual([row[1:] for row in rows], [('old', 1), ('old', 1), ('live', 1)])
+        self.assertEqual(
+            response_content['table_row_ids'], [rows[0][0], rows[1][0], rows[2][0], rows[2][0]]
+        )
+        self.assertEqual(response_content['inserted'], 3)
+        self.assertEqual(response_content['updated'], 0)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_add_table_row_returns_error_in_case_of_duplicate_unique_value(self):
+        # Arrange
+        self.client.post(self.row_url, {'sku': 'a', 'amount': 1})
+
+        # Act
+        response = self.client.post(self.row_url, {'sku': 'a', 'amount': 2})
+        keyed_response = self.client.post(
+            self.row_url, {'sku': 'a', 'amount': 3}, HTTP_IDEMPOTENCY_KEY='request-1'
+        )
+
+        # Assert
+        for duplicate_response in (response, keyed_response):
+            self.assertEqual(
+                ujson.decode(duplicate_response.content),
+                ['Row violates unique index upserted_sku.']
+            )
+            self.assertEqual(duplicate_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([row[1:] for row in self.get_table_rows()], [('a', 1)])
+
+    def test_bulk_add_table_rows_rejects_conflict_index_containing_id(self):
+        # Arrange
+        self.client.post(
+            reverse('table-indexes', kwargs={'table_id': self.table_id}),
+            {'fields': ['id', 'sku'], 'unique': True, 'index_name': 'upserted_id_sku'}
+        )
+
+        # Act
+        response = self.client.post(self.bulk_url, {
+            'rows': [{'sku': 'a', 'amount': 1}],
+            'on_conflict': 'update',
+            'conflict_fields': ['id', 'sku']
+        })
+
+        # Assert
+        self.assertEqual(ujson.decode(response.content), {
+            'conflict_fields': ["Conflict fields can not contain id, it is generated on insert."]
+        })
+        self.assertEqual(self.get_table_rows(), [])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
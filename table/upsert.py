@@ -0,0 +1,219 @@
+from django.db import connection
+from rest_framework import serializers
+
+from table.indexes import get_index_condition_sql, validate_index_definition
+from table.rows import insert_table_rows
+
+ON_CONFLICT_IGNORE = 'ignore'
+ON_CONFLICT_UPDATE = 'update'
+ON_CONFLICT_ACTIONS = (ON_CONFLICT_IGNORE, ON_CONFLICT_UPDATE)
+
+
+def get_conflict_index(table_object, conflict_fields):
+    """
+    Returns the declared unique index on exactly `conflict_fields`.
+    Ids of inserted rows are generated, so they can not be part of the conflict key. Tables
+    partitioned by id include it in every unique index and can not be upserted into.
+    """
+    if 'id' in conflict_fields:
+        raise serializers.ValidationError({
+            'conflict_fields': ["Conflict fields can not contain id, it is generated on insert."]
+        })
+
+    for index_definition in table_object.indexes:
+        if index_definition['unique'] and sorted(index_definition['fields']) == sorted(conflict_fields):
+            return index_definition
+
+    raise serializers.ValidationError({
+        'conflict_fields': ["No unique index on fields {}.".format(list(conflict_fields))]
+    })
+
+
+class TableUpsert:
+    """
+    Inserts rows with `INSERT ... ON CONFLICT` against a declared unique index and returns
+    ids in the order of `rows_values`, like `insert_table_rows` does. Conflicting rows are
+    left as they are (`ignore`) or get the new values (`update`); either way their id is
+    returned. Rows whose values do not change are not written again. Rows the index does
+    not cover are inserted as they are.
+    """
+
+    def __init__(self, model, table_fields, conflict_index, action):
+        self.model = model
+        self.conflict_fields = list(conflict_index['fields'])
+        self.action = action
+
+        row_filter = validate_index_definition(table_fields, conflict_index)
+        self.conflict_condition = get_index_condition_sql(model, row_filter) if row_filter else None
+
+        # Ids of rows written by the upsert, either inserted or updated
+        self.changed_ids = set()
+        self.inserted_ids = set()
+
+    def get_action_sql(self, db_table, field_names):
+        quote_name = connection.ops.quote_name
+        update_fields = [
+            field_name for field_name in field_names if field_name not in self.conflict_fields
+        ]
+        if self.action == ON_CONFLICT_IGNORE or not update_fields:
+            return "DO NOTHING"
+
+        excluded = ', '.join(
+            'EXCLUDED.{}'.format(quote_name(field_name)) for field_name in update_fields
+        )
+        return (
+            "DO UPDATE SET ({columns}) = ROW({excluded}) "
+            "WHERE ROW({current}) IS DISTINCT FROM ROW({excluded})"
+        ).format(
+            columns=', '.join(quote_name(field_name) for field_name in update_fields),
+            excluded=excluded,
+            current=', '.join(
+                '{}.{}'.format(quote_name(db_table), quote_name(field_name))
+                for field_name in update_fields
+            )
+        )
+
+    def get_conflicting_positions(self, field_names, rows_values):
+        """
+        Returns positions of the rows the unique index covers. Rows outside of its partial
+        condition or with a NULL key never conflict, not even with each other.
+        """
+        key_positions = [list(field_names).index(field_name) for field_name in self.conflict_fields]
+        positions = [
+            position for position, row_values in enumerate(rows_values)
+            if all(row_values[key_position] is not None for key_position in key_positions)
+        ]
+        if not self.conflict_condition or not positions:
+            return set(positions)
+
+        quote_name = connection.ops.quote_name
+        row_placeholder = '(%s, {})'.format(', '.join(
+            '%s::{}'.format(self.model._meta.get_field(field_name).db_type(connection))
+            for field_name in field_names
+        ))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT position FROM (VALUES {values}) AS rows (position, {columns}) "
+                "WHERE {condition}".format(
+                    values=', '.join([row_placeholder] * len(positions)),
+                    columns=', '.join(quote_name(field_name) for field_name in field_names),
+                    condition=self.conflict_condition
+                ),
+                [
+                    value
+                    for position in positions
+                    for value in [position] + list(rows_values[position])
+                ]
+            )
+            return set(row[0] for row in cursor.fetchall())
+
+    def __call__(self, db_table, field_names, rows_values):
+        quote_name = connection.ops.quote_name
+        key_positions = [list(field_names).index(field_name) for field_name in self.conflict_fields]
+
+        def get_row_key(row_values):
+            return tuple(row_values[position] for position in key_positions)
+
+        conflicting_positions = self.get_conflicting_positions(field_names, rows_values)
+        table_row_ids = [None] * len(rows_values)
+
+        # Rows which can not conflict are inserted as they are
+        inserted_positions = [
+            position for position in range(len(rows_values))
+            if position not in conflicting_positions
+        ]
+        if inserted_positions:
+            inserted_ids = insert_table_rows(
+                db_table, field_names, [rows_values[position] for position in inserted_positions]
+            )
+            for position, table_row_id in zip(inserted_positions, inserted_ids):
+                table_row_ids[position] = table_row_id
+                self.changed_ids.add(table_row_id)
+                self.inserted_ids.add(table_row_id)
+
+        if not conflicting_positions:
+            return table_row_ids
+
+        # One statement cannot write the same row twice, the last values of a key win
+        unique_rows = {}
+        for position in sorted(conflicting_positions):
+            row_key = get_row_key(rows_values[position])
+            if self.action == ON_CONFLICT_UPDATE or row_key not in unique_rows:
+                unique_rows[row_key] = rows_values[position]
+
+        key_columns = ', '.join(quote_name(field_name) for field_name in self.conflict_fields)
+        row_placeholder = '({})'.format(', '.join(['%s'] * len(field_names)))
+        sql = (
+            "INSERT INTO {table} ({columns}) VALUES {values} "
+            "ON CONFLICT ({key_columns}){condition} {action} "
+            "RETURNING {pk}, xmax = 0, {key_columns}"
+        ).format(
+            table=quote_name(db_table),
+            columns=', '.join(quote_name(field_name) for field_name in field_names),
+            values=', '.join([row_placeholder] * len(unique_rows)),
+            key_columns=key_columns,
+            condition=' WHERE {}'.format(self.conflict_condition) if self.conflict_condition else '',
+            action=self.get_action_sql(db_table, field_names),
+            pk=quote_name('id')
+        )
+
+        condition = self.conflict_condition
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [value for row_values in unique_rows.values() for value in row_values])
+            ids_by_key = {}
+            for table_row_id, inserted, *row_key in cursor.fetchall():
+                ids_by_key[tuple(row_key)] = table_row_id
+                self.changed_ids.add(table_row_id)
+                if inserted:
+                    self.inserted_ids.add(table_row_id)
+
+            # Conflicting rows which were not written are not returned by the insert
+            unchanged_keys = [row_key for row_key in unique_rows if row_key not in ids_by_key]
+            if unchanged_keys:
+                key_placeholder = '({})'.format(', '.join(['%s'] * len(key_positions)))
+                cursor.execute(
+                    "SELECT {pk}, {key_columns} FROM {table} "
+                    "WHERE ({key_columns}) IN ({keys}){condition}".format(
+                        pk=quote_name('id'),
+                        key_columns=key_columns,
+                        table=quote_name(db_table),
+                        keys=', '.join([key_placeholder] * len(unchanged_keys)),
+                        condition=' AND {}'.format(condition) if condition else ''
+                    ),
+                    [value for row_key in unchanged_keys for value in row_key]
+                )
+                ids_by_key.update((tuple(row[1:]), row[0]) for row in cursor.fetchall())
+
+        for position in conflicting_positions:
+            table_row_ids[position] = ids_by_key.get(get_row_key(rows_values[position]))
+
+        return table_row_ids
+
+
+def get_table_upsert(table_object, model, table_fields, on_conflict, conflict_fields):
+    """Returns the `TableUpsert` requested by `on_conflict` and `conflict_fields`, if any."""
+    if not on_conflict:
+        return None
+
+    if on_conflict not in ON_CONFLICT_ACTIONS:
+        raise serializers.ValidationError({
+            'on_conflict': ['"{}" is not a valid choice.'.format(on_conflict)]
+        })
+
+    if not conflict_fields:
+        raise serializers.ValidationError({'conflict_fields': ["This field is required."]})
+
+    return TableUpsert(
+        model, table_fields, get_conflict_index(table_object, conflict_fields), on_conflict
+    )
+
+
+def parse_upsert_params(query_params):
+    """Returns `on_conflict` and `conflict_fields` of `?on_conflict=update&conflict_fields=a,b`."""
+    conflict_fields = [
+        field_name.strip()
+        for value in query_params.getlist('conflict_fields')
+        for field_name in value.split(',')
+        if field_name.strip()
+    ]
+    return query_params.get('on_conflict'), conflict_fields
@@ -23,4 +23,79 @@ urlpatterns = [
         views.get_table_rows,
         name='get-table-rows'
     ),
+    path(
+        r'table/<int:table_id>/rows/bulk',
+        views.bulk_add_table_rows,
+        name='bulk-add-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/rows/update',
+        views.update_table_rows,
+        name='update-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/rows/delete',
+        views.delete_table_rows,
+        name='delete-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/rows/upload',
+        views.upload_table_rows,
+        name='upload-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/rows/export',
+        views.export_table_rows,
+        name='export-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/aggregate',
+        views.aggregate_table_rows,
+        name='aggregate-table-rows'
+    ),
+    path(
+        r'table/<int:table_id>/stats',
+        views.get_table_stats,
+        name='get-table-stats'
+    ),
+    path(
+        r'table/<int:table_id>/indexes',
+        views.table_indexes,
+        name='table-indexes'
+    ),
+    path(
+        r'table/<int:table_id>/indexes/<str:index_name>',
+        views.delete_table_index,
+        name='delete-table-index'
+    ),
+    path(
+        r'table/<int:table_id>/partitions',
+        views.table_partitions,
+        name='table-partitions'
+    ),
+    path(
+        r'table/<int:table_id>/partitions/<str:partition_name>',
+        views.delete_table_partition,
+        name='delete-table-partition'
+    ),
+    path(
+        r'table/<int:table_id>/retention',
+        views.table_retention,
+        name='table-retention'
+    ),
+    path(
+        r'table/<int:table_id>/retention/purge',
+        views.purge_table_rows,
+        name='purge-table-rows'
+    ),
+    path(
+        r'table/jobs/<int:job_id>',
+        views.get_table_job,
+        name='get-table-job'
+    ),
+    path(
+        r'table/jobs/<int:job_id>/cancel',
+        views.cancel_table_job,
+        name='cancel-table-job'
+    ),
 ]
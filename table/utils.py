@@ -80,7 +80,9 @@ def get_table_fields(table_name):
             WHERE
                 table_schema = 'public'
             AND
-                table_name = %s;
+                table_name = %s
+            ORDER BY
+                ordinal_position;
         """, [table_name])
         result = cursor.fetchall()
 
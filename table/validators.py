@@ -0,0 +1,229 @@
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.http import QueryDict
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.settings import api_settings
+
+from table.enums import AllowedFieldTypes
+from table.registry import VersionedRegistry
+from table.signals import table_schema_changed
+from table.utils import create_serializer_model
+
+MAX_STRING_FIELD_LENGTH = 255
+
+REQUIRED_ERROR = str(serializers.Field.default_error_messages['required'])
+NULL_ERROR = str(serializers.Field.default_error_messages['null'])
+STRING_ERRORS = {
+    'invalid': str(serializers.CharField.default_error_messages['invalid']),
+    'blank': str(serializers.CharField.default_error_messages['blank']),
+    'max_length': str(serializers.CharField.default_error_messages['max_length']).format(
+        max_length=MAX_STRING_FIELD_LENGTH
+    ),
+    'null_characters_not_allowed': 'Null characters are not allowed.',
+    'surrogate_characters_not_allowed': 'Surrogate characters are not allowed: U+{code_point:X}.',
+}
+NUMBER_ERRORS = {
+    'invalid': str(serializers.IntegerField.default_error_messages['invalid']),
+    'max_string_length': str(serializers.IntegerField.default_error_messages['max_string_length']),
+}
+BOOLEAN_ERRORS = {
+    'invalid': str(serializers.BooleanField.default_error_messages['invalid']),
+}
+UNKNOWN_FIELD_ERROR = 'Unknown field.'
+NON_FIELD_ERRORS = {
+    'invalid': str(serializers.Serializer.default_error_messages['invalid']),
+}
+
+
+def _string_checker(value):
+    """Mirrors `serializers.CharField(max_length=255)` validation."""
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None, [ErrorDetail(STRING_ERRORS['blank'], code='blank')]
+    elif isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None, [ErrorDetail(STRING_ERRORS['invalid'], code='invalid')]
+    else:
+        value = str(value)
+
+    errors = None
+    if len(value) > MAX_STRING_FIELD_LENGTH:
+        errors = [ErrorDetail(STRING_ERRORS['max_length'], code='max_length')]
+
+    if '\x00' in value:
+        errors = (errors or []) + [ErrorDetail(
+            STRING_ERRORS['null_characters_not_allowed'], code='null_characters_not_allowed'
+        )]
+
+    if not value.isascii():
+        for char in value:
+            code_point = ord(char)
+            if 0xD800 <= code_point <= 0xDFFF:
+                errors = (errors or []) + [ErrorDetail(
+                    STRING_ERRORS['surrogate_characters_not_allowed'].format(code_point=code_point),
+                    code='surrogate_characters_not_allowed'
+                )]
+                break
+
+    return value, errors
+
+
+def _number_checker(value, re_decimal=serializers.IntegerField.re_decimal):
+    """Mirrors `serializers.IntegerField()` validation."""
+    if type(value) is int:
+        return value, None
+
+    if isinstance(value, str) and len(value) > serializers.IntegerField.MAX_STRING_LENGTH:
+        return None, [ErrorDetail(NUMBER_ERRORS['max_string_length'], code='max_string_length')]
+
+    try:
+        return int(re_decimal.sub('', str(value))), None
+    except (ValueError, TypeError):
+        return None, [ErrorDetail(NUMBER_ERRORS['invalid'], code='invalid')]
+
+
+def _boolean_checker(
+    value,
+    true_values=serializers.BooleanField.TRUE_VALUES,
+    false_values=serializers.BooleanField.FALSE_VALUES
+):
+    """Mirrors `serializers.BooleanField()` validation."""
+    try:
+        if value in true_values:
+            return True, None
+        if value in false_values:
+            return False, None
+    except TypeError:
+        pass
+
+    return None, [ErrorDetail(BOOLEAN_ERRORS['invalid'], code='invalid')]
+
+
+FIELD_CHECKERS = {
+    AllowedFieldTypes.STRING.name: _string_checker,
+    AllowedFieldTypes.NUMBER.name: _number_checker,
+    AllowedFieldTypes.BOOLEAN.name: _boolean_checker,
+}
+
+
+class RowValidator:
+    """
+    Validates table rows against a fixed table schema.
+    Returns the same values and error details as the generated DRF serializer does.
+    """
+
+    __slots__ = ('checkers', 'field_names')
+
+    def __init__(self, table_fields):
+        self.checkers = tuple(
+            (field['field_name'], FIELD_CHECKERS[field['field_type']])
+            for field in table_fields
+        )
+        self.field_names = tuple(field_name for field_name, _ in self.checkers)
+
+    def __call__(self, data):
+        if not isinstance(data, Mapping):
+            return None, {
+                api_settings.NON_FIELD_ERRORS_KEY: [ErrorDetail(
+                    NON_FIELD_ERRORS['invalid'].format(datatype=type(data).__name__),
+                    code='invalid'
+                )]
+            }
+
+        validated_data, errors = {}, None
+        for field_name, checker in self.checkers:
+            if field_name not in data:
+                value, field_errors = None, [ErrorDetail(REQUIRED_ERROR, code='required')]
+            else:
+                value = data[field_name]
+                if value is None:
+                    field_errors = [ErrorDetail(NULL_ERROR, code='null')]
+                else:
+                    value, field_errors = checker(value)
+
+            if field_errors:
+                if errors is None:
+                    errors = {}
+                errors[field_name] = field_errors
+            else:
+                validated_data[field_name] = value
+
+        if errors:
+            return None, errors
+
+        return validated_data, None
+
+    def validate_partial(self, data):
+        """Validates only the given fields, as for updates. Fields outside of the schema are errors."""
+        checkers = dict(self.checkers)
+
+        validated_data, errors = {}, None
+        for field_name, value in data.items():
+            checker = checkers.get(field_name)
+            if checker is None:
+                value, field_errors = None, [ErrorDetail(UNKNOWN_FIELD_ERROR, code='unknown')]
+            elif value is None:
+                field_errors = [ErrorDetail(NULL_ERROR, code='null')]
+            else:
+                value, field_errors = checker(value)
+
+            if field_errors:
+                if errors is None:
+                    errors = {}
+                errors[field_name] = field_errors
+            else:
+                validated_data[field_name] = value
+
+        if errors:
+            return None, errors
+
+        return validated_data, None
+
+
+def compile_row_validator(table_fields):
+    return RowValidator(table_fields)
+
+
+validator_registry = VersionedRegistry(
+    getattr(settings, 'TABLE_MODEL_REGISTRY_SIZE', 1024)
+)
+
+
+def get_row_validator(table_object, table_fields):
+    return validator_registry.get(
+        table_object.pk,
+        table_object.schema_version,
+        lambda: compile_row_validator(table_fields)
+    )
+
+
+def validate_table_row(table_object, table_fields, data):
+    """
+    Returns validated row data or raises `ValidationError`.
+    Form encoded data has its own parsing rules, so it is still validated by a DRF serializer.
+    """
+    if isinstance(data, QueryDict):
+        serializer_model = create_serializer_model(
+            "{}_serializer".format(table_object.table_name),
+            fields=table_fields,
+            app_label='table',
+            module='table.models'
+        )
+
+        serializer = serializer_model(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.data
+
+    validated_data, errors = get_row_validator(table_object, table_fields)(data)
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    return validated_data
+
+
+@receiver(table_schema_changed, dispatch_uid='validator_registry_invalidation')
+def invalidate_row_validator(sender, table_id, schema_version, **kwargs):
+    validator_registry.invalidate(table_id, schema_version)
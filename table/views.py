@@ -1,20 +1,75 @@
 from django.db import connection
 from django.db.utils import IntegrityError, ProgrammingError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from rest_framework import exceptions, serializers, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from table.models import TableName
+from table.aggregates import parse_aggregates, parse_group_by, run_table_aggregation
+from table.bulk import (
+    BulkInsertError,
+    add_table_rows,
+    delete_rows_in_batches,
+    update_rows_in_batches,
+)
+from table.cache import get_rows_cache, get_rows_cache_key
+from table.export import EXPORT_OUTPUTS, stream_table_export
+from table.filters import parse_field_projection, parse_row_filters, parse_rows_selection
+from table.group_commit import insert_table_row
+from table.idempotency import insert_table_row_once
+from table.indexes import (
+    create_table_index,
+    drop_table_index,
+    get_table_indexes,
+    validate_index_definition,
+)
+from table.ingest import INPUT_CONTENT_TYPES, ingest_table_rows
+from table.jobs import (
+    cancel_job,
+    enqueue_table_job,
+    parse_background_param,
+    save_job_input,
+)
+from table.models import TableJob, TableName
+from table.online_schema_changes import apply_table_schema_change_online
+from table.pagination import get_page_headers, get_page_params
+from table.partitions import (
+    create_partitioned_table,
+    drop_table_partition,
+    ensure_table_partitions,
+    get_table_partitions,
+)
+from table.registry import get_table_model
+from table.retention import validate_retention_rule
+from table.rows import (
+    encode_table_rows,
+    fetch_table_rows,
+    get_row_field_names,
+    insert_table_rows,
+)
+from table.schema import (
+    etag_matches,
+    get_table_etag,
+    get_table_schema,
+    save_table_schema,
+)
+from table.schema_changes import apply_table_schema_change
+from table.schema_plans import plan_table_schema_change
+from table.serializers.bulk_add_table_rows_serializer import BulkAddTableRowsSerializer
+from table.serializers.create_table_index_serializer import CreateTableIndexSerializer
+from table.serializers.delete_table_rows_serializer import DeleteTableRowsSerializer
 from table.serializers.generate_table_serializer import GenerateTableSerializer
+from table.serializers.retention_serializer import RetentionSerializer
+from table.serializers.table_job_serializer import TableJobSerializer
+from table.serializers.update_table_rows_serializer import UpdateTableRowsSerializer
 from table.serializers.update_table_structure_serializer import (
     UpdateTableStructureSerializer,
 )
-from table.utils import (
-    create_field,
-    create_model,
-    create_serializer_model,
-    get_table_fields,
-)
+from table.stats import collect_table_stats
+from table.upsert import get_table_upsert, parse_upsert_params
+from table.utils import create_model
+from table.validators import get_row_validator, validate_table_row
 
 
 @api_view(['POST'])
@@ -26,6 +81,7 @@ def generate_table(request):
 
     table_name = serializer.data['table_name']
     table_fields = serializer.data['table_fields']
+    partitioning = dict(serializer.validated_data.get('partitioning') or {})
 
     new_model = create_model(
         table_name,
@@ -35,21 +91,29 @@ def generate_table(request):
     )
 
     try:
-        with connection.schema_editor() as schema_editor:
-            schema_editor.create_model(new_model)
+        if partitioning:
+            create_partitioned_table(new_model, partitioning)
+        else:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.create_model(new_model)
     except ProgrammingError:
         raise serializers.ValidationError(
             "Table {} is already exists.".format(table_name)
         )
 
     try:
-        tableObject = TableName.objects.create(table_name=table_name)
+        tableObject = TableName.objects.create(table_name=table_name, partitioning=partitioning)
     except IntegrityError:
         tableObject = TableName.objects.get(table_name=table_name)
+        tableObject.partitioning = partitioning
+        tableObject.save(update_fields=['partitioning'])
 
     if not tableObject:
         raise exceptions.NotFound
 
+    save_table_schema(tableObject, table_fields)
+    ensure_table_partitions(tableObject, new_model)
+
     return Response({
         "table_id": tableObject.pk
     }, status=status.HTTP_201_CREATED)
@@ -63,75 +127,45 @@ def update_table_structure(request, table_id: int):
         return
 
     new_table_fields = serializer.data['new_table_fields']
-    new_table_field_names = set(map(
-        lambda field: field['field_name'], new_table_fields
-    ))
 
     try:
         tableObject = TableName.objects.get(pk=table_id)
     except TableName.DoesNotExist:
         raise exceptions.NotFound(detail='Table name not found.')
 
-    result = get_table_fields(tableObject.table_name)
-    if not result:
+    old_table_fields = get_table_schema(tableObject)
+    if not old_table_fields:
         raise exceptions.NotFound(detail='Table not found.')
 
-    old_table_fields, old_table_field_names = [], set()
-    for field_name, field_type in result:
-        if field_name == 'id':
-            continue
-
-        old_table_fields.append({
-            "field_name": field_name,
-            "field_type": field_type
-        })
-        old_table_field_names.add(field_name)
-
-    old_model = create_model(
-        tableObject.table_name,
-        fields=old_table_fields,
-        app_label='table',
-        module='table.models'
+    old_model = get_table_model(
+        tableObject, old_table_fields, tableObject.schema_version
     )
 
-    # Lets exclude fields that are not presented in new_table_field_names
-    fields_to_remove = old_table_field_names.difference(new_table_field_names)
-
-    for old_table_field in old_table_fields:
-        if old_table_field['field_name'] not in fields_to_remove:
-            continue
-
-        field = create_field(
-            old_table_field['field_name'],
-            old_table_field['field_type']
-        )
-        try:
-            with connection.schema_editor() as schema_editor:
-                schema_editor.remove_field(
-                    old_model,
-                    field
-                )
-        except ProgrammingError:
-            raise serializers.ValidationError(
-                "Could not remove field {}.".format(old_table_field['field_name'])
+    if serializer.data['dry_run']:
+        return Response(dict(
+            table_id=tableObject.pk,
+            table_name=tableObject.table_name,
+            **plan_table_schema_change(
+                tableObject,
+                old_model,
+                old_table_fields,
+                new_table_fields,
+                online=serializer.data['online']
             )
+        ), status=status.HTTP_200_OK)
 
-    for new_table_field in new_table_fields:
-        field = create_field(
-            new_table_field['field_name'],
-            new_table_field['field_type']
-        )
+    if serializer.data['background']:
+        job = enqueue_table_job(tableObject, TableJob.SCHEMA_CHANGE, {
+            "new_table_fields": new_table_fields,
+            "online": serializer.data['online']
+        })
+        return build_job_response(request, job)
 
-        try:
-            with connection.schema_editor() as schema_editor:
-                schema_editor.add_field(
-                    old_model,
-                    field
-                )
-        except ProgrammingError:
-            raise serializers.ValidationError(
-                "Field {} is already exists".format(new_table_field['field_name'])
-            )
+    if serializer.data['online']:
+        apply_table_schema_change_online(tableObject, new_table_fields)
+    else:
+        # Only the difference is applied, in one transaction together with the schema metadata
+        apply_table_schema_change(tableObject, new_table_fields)
 
     return Response({
         "table_name": tableObject.table_name,
@@ -139,95 +173,615 @@ def update_table_structure(request, table_id: int):
     }, status=status.HTTP_200_OK)
 
 
+def get_integrity_error_message(exc):
+    constraint_name = getattr(getattr(exc.__cause__, 'diag', None), 'constraint_name', None)
+    if constraint_name:
+        return "Row violates unique index {}.".format(constraint_name)
+
+    return str(exc).strip()
+
+
 @api_view(['POST'])
 def add_table_row(request, table_id: int):
-    """Allows the user to add rows to the dynamically generated model while respecting the model schema."""
+    """
+    Allows the user to add rows to the dynamically generated model while respecting the model schema.
+    A repeated request with the same `Idempotency-Key` header returns the row added by the first one.
+    `?on_conflict=ignore|update&conflict_fields=a,b` upserts on a declared unique index.
+    """
     try:
         tableObject = TableName.objects.get(pk=table_id)
     except TableName.DoesNotExist:
         raise exceptions.NotFound
 
-    result = get_table_fields(tableObject.table_name)
-    if not result:
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
         raise exceptions.NotFound
 
-    table_fields = []
-    for field_name, field_type in result:
-        if field_name == "id":
-            continue
+    validated_data = validate_table_row(tableObject, table_fields, request.data)
 
-        table_fields.append({
-            "field_name": field_name,
-            "field_type": field_type
-        })
+    model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+    on_conflict, conflict_fields = parse_upsert_params(request.query_params)
+    table_upsert = get_table_upsert(tableObject, model, table_fields, on_conflict, conflict_fields)
 
-    # Generate custom serializer based on table fields list
-    serializer_model = create_serializer_model(
-        "{}_serializer".format(tableObject.table_name),
-        fields=table_fields,
-        app_label='table',
-        module='table.models'
+    headers = {}
+    idempotency_key = request.headers.get('Idempotency-Key')
+    try:
+        if idempotency_key:
+            table_row_id, replayed = insert_table_row_once(
+                tableObject, model, table_fields, validated_data, idempotency_key, table_upsert
+            )
+            if replayed:
+                headers['Idempotent-Replayed'] = 'true'
+        else:
+            table_row_id = insert_table_row(
+                tableObject, model, table_fields, validated_data, table_upsert
+            )
+    except IntegrityError as exc:
+        raise serializers.ValidationError(get_integrity_error_message(exc))
+
+    if table_upsert is not None and table_row_id not in table_upsert.inserted_ids:
+        response_status = status.HTTP_200_OK
+    else:
+        response_status = status.HTTP_201_CREATED
+
+    return Response({
+        'table_id': table_id,
+        'table_name': tableObject.table_name,
+        'table_row_id': table_row_id
+    }, status=response_status, headers=headers)
+
+
+@api_view(['POST'])
+def bulk_add_table_rows(request, table_id: int):
+    """
+    Adds a batch of rows to the dynamically generated model in one transaction.
+    In `atomic` mode any invalid row rejects the batch, `best_effort` mode inserts the valid rows.
+    With `on_conflict` and `conflict_fields` rows are upserted on a declared unique index.
+    """
+    serializer = BulkAddTableRowsSerializer(data=request.data)
+    if not serializer.is_valid(raise_exception=True):
+        return
+
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+    table_upsert = get_table_upsert(
+        tableObject,
+        model,
+        table_fields,
+        serializer.validated_data.get('on_conflict'),
+        serializer.validated_data.get('conflict_fields')
+    )
+
+    try:
+        table_row_ids, errors = add_table_rows(
+            tableObject,
+            model,
+            table_fields,
+            serializer.validated_data['rows'],
+            serializer.validated_data['mode'],
+            table_upsert or insert_table_rows
+        )
+    except BulkInsertError as exc:
+        return Response({
+            'table_id': table_id,
+            'table_name': tableObject.table_name,
+            'inserted': 0,
+            'errors': exc.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    stored_ids = set(table_row_id for table_row_id in table_row_ids if table_row_id is not None)
+    response_content = {
+        'table_id': table_id,
+        'table_name': tableObject.table_name,
+        'inserted': len(stored_ids),
+        'table_row_ids': table_row_ids,
+        'errors': errors
+    }
+    if table_upsert is not None:
+        # Rows of one key share the id of the row they were written to
+        response_content['inserted'] = len(stored_ids & table_upsert.inserted_ids)
+        response_content['updated'] = len(
+            (stored_ids & table_upsert.changed_ids) - table_upsert.inserted_ids
+        )
+
+    return Response(
+        response_content,
+        status=status.HTTP_201_CREATED if stored_ids else status.HTTP_400_BAD_REQUEST
     )
 
-    serializer = serializer_model(data=request.data)
+
+@api_view(['POST'])
+def update_table_rows(request, table_id: int):
+    """
+    Sets `values` on the rows selected by `ids` and/or `where` filters.
+    Rows are updated in id ordered batches, each batch in its own transaction.
+    """
+    serializer = UpdateTableRowsSerializer(data=request.data)
     if not serializer.is_valid(raise_exception=True):
         return
 
-    model = create_model(
-        tableObject.table_name,
-        fields=table_fields,
-        app_label='table',
-        module='table.models'
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    values, errors = get_row_validator(tableObject, table_fields).validate_partial(
+        serializer.validated_data['values']
     )
+    if errors:
+        raise serializers.ValidationError({'values': errors})
 
-    added_table_row = model.objects.create(**serializer.data)
+    row_filter = parse_rows_selection(
+        table_fields,
+        serializer.validated_data.get('ids'),
+        serializer.validated_data.get('where')
+    )
+    model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    updated, batches = update_rows_in_batches(tableObject, model, row_filter, values)
 
     return Response({
         'table_id': table_id,
         'table_name': tableObject.table_name,
-        'table_row_id': added_table_row.pk
-    }, status=status.HTTP_201_CREATED)
+        'updated': updated,
+        'batches': batches
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def delete_table_rows(request, table_id: int):
+    """
+    Deletes the rows selected by `ids` and/or `where` filters.
+    Rows are deleted in id ordered batches, each batch in its own transaction.
+    """
+    serializer = DeleteTableRowsSerializer(data=request.data)
+    if not serializer.is_valid(raise_exception=True):
+        return
+
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    row_filter = parse_rows_selection(
+        table_fields,
+        serializer.validated_data.get('ids'),
+        serializer.validated_data.get('where')
+    )
+    model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    deleted, batches = delete_rows_in_batches(tableObject, model, row_filter)
+
+    return Response({
+        'table_id': table_id,
+        'table_name': tableObject.table_name,
+        'deleted': deleted,
+        'batches': batches
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def upload_table_rows(request, table_id: int):
+    """
+    Streams a CSV (with header line) or NDJSON request body into the dynamically generated model
+    with COPY. The input is taken from the `?input=` parameter or the request content type.
+    """
+    input_format = request.query_params.get(
+        'input', INPUT_CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+    )
+    if input_format not in set(INPUT_CONTENT_TYPES.values()):
+        raise serializers.ValidationError({
+            'input': ["Input must be one of the following: {}.".format(
+                sorted(set(INPUT_CONTENT_TYPES.values()))
+            )]
+        })
+
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    if parse_background_param(request.query_params):
+        job = enqueue_table_job(tableObject, TableJob.IMPORT_ROWS, {
+            "path": save_job_input(request.stream, input_format),
+            "input_format": input_format,
+            "remove_input": True
+        })
+        return build_job_response(request, job)
+
+    model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    report = ingest_table_rows(
+        tableObject, model, table_fields, request.stream or [], input_format
+    )
+
+    return Response(dict(
+        table_id=table_id,
+        table_name=tableObject.table_name,
+        **report
+    ), status=(
+        status.HTTP_400_BAD_REQUEST
+        if report['rows_rejected'] and not report['rows_loaded']
+        else status.HTTP_201_CREATED
+    ))
 
 
 @api_view(['GET'])
 def get_table_rows(request, table_id: int):
-    """Gets all the rows in the dynamically generated model."""
+    """
+    Gets a page of rows in the dynamically generated model, ordered by row id.
+    Supports `?fields=` projection and `<field>__<operator>=<value>` filters.
+    """
     try:
         tableObject = TableName.objects.get(pk=table_id)
     except TableName.DoesNotExist:
         raise exceptions.NotFound
 
-    result = get_table_fields(tableObject.table_name)
-    if not result:
+    # Unchanged tables are answered from the metadata without reading the dynamic table
+    etag = get_table_etag(tableObject)
+    if etag_matches(request, etag):
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    # Pages are cached per schema and data version, so writes never serve stale bytes
+    rows_cache = get_rows_cache()
+    cache_key = get_rows_cache_key(tableObject, request.query_params)
+    cached_page = rows_cache.get(tableObject.pk, cache_key) if rows_cache is not None else None
+    if cached_page is not None:
+        return build_rows_response(request, *cached_page, etag)
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
         raise exceptions.NotFound
 
-    table_fields = []
-    for field_name, field_type in result:
-        if field_name == 'id':
-            continue
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    after, limit = get_page_params(request.query_params)
+    selected_fields = parse_field_projection(request.query_params, table_fields)
+    row_filter = parse_row_filters(request.query_params, table_fields)
+
+    # One extra row tells whether there is a next page
+    table_rows = fetch_table_rows(
+        created_model,
+        get_row_field_names(selected_fields),
+        after,
+        limit + 1,
+        row_filter
+    )
+
+    next_row_id = None
+    if len(table_rows) > limit:
+        table_rows = table_rows[:limit]
+        next_row_id = table_rows[-1][0]
+
+    content = encode_table_rows(selected_fields, table_rows)
+    if rows_cache is not None:
+        rows_cache.set(tableObject.pk, cache_key, (content, next_row_id))
+
+    return build_rows_response(request, content, next_row_id, etag)
+
+
+def build_rows_response(request, content, next_row_id, etag):
+    return HttpResponse(
+        content,
+        content_type='application/json',
+        status=status.HTTP_200_OK,
+        headers=dict(get_page_headers(request, next_row_id), ETag=etag)
+    )
+
 
-        table_fields.append({
-            "field_name": field_name,
-            "field_type": field_type
+@api_view(['GET'])
+def export_table_rows(request, table_id: int):
+    """Streams all the rows in the dynamically generated model as NDJSON or as a JSON array."""
+    output = request.query_params.get('output', 'ndjson')
+    if output not in EXPORT_OUTPUTS:
+        raise serializers.ValidationError({
+            'output': ["Output must be one of the following: {}.".format(list(EXPORT_OUTPUTS))]
         })
 
-    created_model = create_model(
-        tableObject.table_name,
-        fields=table_fields,
-        app_label='table',
-        module='table.models'
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    selected_fields = parse_field_projection(request.query_params, table_fields)
+    row_filter = parse_row_filters(request.query_params, table_fields)
+
+    response = StreamingHttpResponse(
+        stream_table_export(created_model, selected_fields, output, row_filter),
+        content_type=EXPORT_OUTPUTS[output]
+    )
+    response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(
+        tableObject.table_name, output
+    )
+    return response
+
+
+@api_view(['GET'])
+def aggregate_table_rows(request, table_id: int):
+    """
+    Aggregates rows of the dynamically generated model in the database.
+    Supports `?aggregates=count,sum:<field>`, `?group_by=<field>` and row filters.
+    """
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    aggregates = parse_aggregates(request.query_params, table_fields)
+    group_by = parse_group_by(request.query_params, table_fields, aggregates)
+    row_filter = parse_row_filters(request.query_params, table_fields)
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    results, truncated = run_table_aggregation(created_model, aggregates, group_by, row_filter)
+
+    return Response({
+        "results": results,
+        "truncated": truncated
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def get_table_stats(request, table_id: int):
+    """
+    Returns estimated row count and storage statistics of the dynamically generated model.
+    `?exact=true` adds the exact row count.
+    """
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    exact = request.query_params.get('exact', '').lower() in ('1', 'true', 'yes')
+
+    table_stats = collect_table_stats(created_model, exact=exact)
+    if table_stats is None:
+        raise exceptions.NotFound(detail='Table not found.')
+
+    return Response(dict(
+        table_id=tableObject.pk,
+        table_name=tableObject.table_name,
+        **table_stats
+    ), status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'POST'])
+def table_indexes(request, table_id: int):
+    """Lists or creates indexes on the fields of the dynamically generated model."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    if request.method == 'GET':
+        return Response(get_table_indexes(tableObject), status=status.HTTP_200_OK)
+
+    serializer = CreateTableIndexSerializer(data=request.data)
+    if not serializer.is_valid(raise_exception=True):
+        return
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    index_definition = {
+        key: value for key, value in serializer.validated_data.items() if key != 'background'
+    }
+    if serializer.validated_data['background']:
+        validate_index_definition(table_fields, index_definition)
+        job = enqueue_table_job(tableObject, TableJob.CREATE_INDEX, index_definition)
+        return build_job_response(request, job)
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    index_definition = create_table_index(
+        tableObject, created_model, table_fields, index_definition
+    )
+
+    return Response(index_definition, status=status.HTTP_201_CREATED)
+
+
+@api_view(['DELETE'])
+def delete_table_index(request, table_id: int, index_name: str):
+    """Drops the index of the dynamically generated model."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    if not any(index['index_name'] == index_name for index in tableObject.indexes):
+        raise exceptions.NotFound(detail='Index not found.')
+
+    drop_table_index(tableObject, index_name)
+
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['GET'])
+def table_partitions(request, table_id: int):
+    """Lists partitions of the dynamically generated model with their bounds and size."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
+    )
+
+    return Response(dict(
+        table_id=tableObject.pk,
+        table_name=tableObject.table_name,
+        partitioning=tableObject.partitioning,
+        partitions=get_table_partitions(created_model)
+    ), status=status.HTTP_200_OK)
+
+
+@api_view(['DELETE'])
+def delete_table_partition(request, table_id: int, partition_name: str):
+    """Drops a range partition of the dynamically generated model together with its rows."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    table_fields = get_table_schema(tableObject)
+    if not table_fields:
+        raise exceptions.NotFound
+
+    created_model = get_table_model(
+        tableObject, table_fields, tableObject.schema_version
     )
 
-    table_rows = created_model.objects.all()
+    partition = next((
+        partition for partition in get_table_partitions(created_model)
+        if partition['partition_name'] == partition_name
+    ), None)
+    if partition is None:
+        raise exceptions.NotFound(detail='Partition not found.')
+
+    drop_table_partition(tableObject, partition)
+
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
 
-    class ModelSerializer(serializers.ModelSerializer):
-        class Meta:
-            model = created_model
-            fields = '__all__'
+@api_view(['GET', 'PUT', 'DELETE'])
+def table_retention(request, table_id: int):
+    """Returns, sets or removes the retention rules of the dynamically generated model."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    if request.method == 'PUT':
+        serializer = RetentionSerializer(data=request.data)
+        if not serializer.is_valid(raise_exception=True):
+            return
+
+        table_fields = get_table_schema(tableObject)
+        if not table_fields:
+            raise exceptions.NotFound
+
+        validate_retention_rule(table_fields, serializer.validated_data)
+        tableObject.retention = dict(serializer.validated_data)
+        tableObject.save(update_fields=['retention'])
+
+    if request.method == 'DELETE':
+        tableObject.retention = {}
+        tableObject.save(update_fields=['retention'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response(dict(
+        table_id=tableObject.pk,
+        table_name=tableObject.table_name,
+        retention=tableObject.retention
+    ), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def purge_table_rows(request, table_id: int):
+    """Queues a background job removing rows expired by the retention rules of the table."""
+    try:
+        tableObject = TableName.objects.get(pk=table_id)
+    except TableName.DoesNotExist:
+        raise exceptions.NotFound
+
+    if not tableObject.retention:
+        raise serializers.ValidationError(
+            "Table {} has no retention rules.".format(tableObject.table_name)
+        )
+
+    job = enqueue_table_job(tableObject, TableJob.PURGE_ROWS, {})
+    return build_job_response(request, job)
+
+
+def build_job_response(request, job):
+    return Response(TableJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={
+        'Location': request.build_absolute_uri(
+            reverse('get-table-job', kwargs={'job_id': job.pk})
+        )
+    })
+
+
+@api_view(['GET'])
+def get_table_job(request, job_id: int):
+    """Returns the status, progress and outcome of a background table job."""
+    try:
+        job = TableJob.objects.get(pk=job_id)
+    except TableJob.DoesNotExist:
+        raise exceptions.NotFound(detail='Job not found.')
+
+    return Response(TableJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def cancel_table_job(request, job_id: int):
+    """Cancels a queued job, or asks the worker running it to stop at its next checkpoint."""
+    try:
+        job = TableJob.objects.get(pk=job_id)
+    except TableJob.DoesNotExist:
+        raise exceptions.NotFound(detail='Job not found.')
 
-    serialized_table_rows = []
-    for table_row in table_rows:
-        serialized_table_row = ModelSerializer(table_row)
-        serialized_table_rows.append(serialized_table_row.data)
+    job = cancel_job(job)
 
-    return Response(serialized_table_rows, status=status.HTTP_200_OK)
+    return Response(TableJobSerializer(job).data, status=status.HTTP_200_OK)